@@ -63,6 +63,18 @@ STRUCTURES_NOTIFICATION_SYNC_GRACE_MINUTES = clean_setting(
 # to Discord after an error occurred
 STRUCTURES_NOTIFICATION_WAIT_SEC = clean_setting("STRUCTURES_NOTIFICATION_WAIT_SEC", 5)
 
+# Notification types which are sent to Discord before all other notifications.
+# When not defined, a default set of attack and reinforcement types is used.
+STRUCTURES_NOTIFICATION_HIGH_PRIORITY_TYPES = clean_setting(
+    "STRUCTURES_NOTIFICATION_HIGH_PRIORITY_TYPES", None, required_type=list
+)
+
+# Whether notifications of an owner are fetched, forwarded and turned into timers
+# in one task instead of a chain of tasks
+STRUCTURES_NOTIFICATION_PIPELINE_ENABLED = clean_setting(
+    "STRUCTURES_NOTIFICATION_PIPELINE_ENABLED", False
+)
+
 # Enables archiving of all notifications received from ESI to files
 # notifications will by stored into one continuous file per corporations
 # UNDOCUMENTED SETTING
@@ -109,6 +121,18 @@ STRUCTURES_TIMERS_ARE_CORP_RESTRICTED = clean_setting(
 # whether ESI timeout is enabled
 STRUCTURES_ESI_TIMEOUT_ENABLED = clean_setting("STRUCTURES_ESI_TIMEOUT_ENABLED", True)
 
+# Max number of concurrent requests to ESI when fetching data for an owner
+STRUCTURES_ESI_MAX_WORKERS = clean_setting(
+    "STRUCTURES_ESI_MAX_WORKERS", 10, min_value=1, max_value=50
+)
+
+# Max duration in seconds ETags of ESI responses are remembered,
+# so that unchanged data from ESI is not processed again.
+# Set to 0 to disable conditional requests to ESI.
+STRUCTURES_ESI_ETAG_TIMEOUT = clean_setting(
+    "STRUCTURES_ESI_ETAG_TIMEOUT", 3600 * 24, min_value=0
+)
+
 # Default page size for structure list.
 # Must be an integer value from the current options as seen in the app.
 STRUCTURES_DEFAULT_PAGE_LENGTH = clean_setting("STRUCTURES_DEFAULT_PAGE_LENGTH", 10)
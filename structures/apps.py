@@ -7,3 +7,6 @@ class StructuresConfig(AppConfig):
     name = "structures"
     label = "structures"
     verbose_name = f"Structures v{__version__}"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401 pylint: disable=unused-import
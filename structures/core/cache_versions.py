@@ -0,0 +1,19 @@
+"""Version numbers for invalidating groups of cached values at once."""
+
+from django.core.cache import cache
+
+
+def get_version(key: str) -> int:
+    """Return the current version stored under a cache key."""
+    return cache.get_or_set(key, 1, timeout=None)
+
+
+def increment_version(key: str) -> None:
+    """Increment the version stored under a cache key.
+
+    This invalidates all cached values using the previous version.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
@@ -0,0 +1,35 @@
+"""Cached Discord roles for groups."""
+
+from typing import Optional
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+
+from .cache_versions import get_version, increment_version
+
+ROLES_CACHE_TIMEOUT = 3600
+MISSING_ROLE_CACHE_TIMEOUT = 60
+_VERSION_CACHE_KEY = "structures:discord-roles:version"
+
+
+def invalidate_discord_roles() -> None:
+    """Invalidate the cached Discord roles of all groups."""
+    increment_version(_VERSION_CACHE_KEY)
+
+
+def discord_role_id(discord_user_model, group: Group) -> Optional[int]:
+    """Return ID of the Discord role matching a group or None if there is none.
+
+    Role IDs are cached, so the Discord service is only asked again
+    after the cache timed out or was invalidated.
+    Missing roles are only cached briefly, so new roles are picked up quickly.
+    Raises HTTPError when the role could not be fetched.
+    """
+    key = f"structures:discord-role:{get_version(_VERSION_CACHE_KEY)}:{group.pk}"
+    role_id = cache.get(key)
+    if role_id is None:
+        role = discord_user_model.objects.group_to_role(group)
+        role_id = role["id"] if role else 0  # 0 means there is no role
+        timeout = ROLES_CACHE_TIMEOUT if role_id else MISSING_ROLE_CACHE_TIMEOUT
+        cache.set(key, role_id, timeout=timeout)
+    return role_id or None
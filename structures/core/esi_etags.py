@@ -0,0 +1,176 @@
+"""Conditional requests to ESI with ETags."""
+
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from bravado.exception import HTTPNotModified
+
+from django.core.cache import cache
+
+from allianceauth.services.hooks import get_extension_logger
+from app_utils.logging import LoggerAddTag
+
+from structures import __title__
+from structures.app_settings import STRUCTURES_ESI_ETAG_TIMEOUT
+
+logger = LoggerAddTag(get_extension_logger(__name__), __title__)
+
+
+class EsiEtagRequest:
+    """A conditional request to an ESI endpoint.
+
+    The ETags of all pages of an endpoint are remembered in the cache
+    and sent with the next request, so that unchanged data can be detected.
+
+    New ETags are only remembered after calling :meth:`save_etags`,
+    which should be done once the fetched data has been processed successfully.
+
+    Args:
+        name: Name of the endpoint
+        key_parts: Additional parts for the cache key, e.g. a corporation ID
+        paginated: Whether the endpoint has pages
+    """
+
+    def __init__(self, name: str, *key_parts: Any, paginated: bool = True) -> None:
+        self.paginated = paginated
+        self._key_base = ":".join(
+            ["structures", "esi-etag", name] + [str(obj) for obj in key_parts]
+        )
+        self._new_etags: Dict[int, dict] = {}
+        self.is_unchanged = False
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(key_base='{self._key_base}')"
+
+    def fetch(self, operation_factory: Callable[..., Any]) -> Optional[list]:
+        """Fetch all pages from ESI.
+
+        Args:
+            operation_factory: Function which creates the ESI operation,
+                e.g. a partial of an ESI client method.
+
+        Returns:
+            Data of all pages or None when the data has not changed
+            since the ETags have been saved the last time.
+        """
+        results = []
+        for data in self.iter_pages(operation_factory):
+            results += data
+        if self.is_unchanged:
+            return None
+        return results
+
+    def iter_pages(self, operation_factory: Callable[..., Any]) -> Iterator[list]:
+        """Fetch pages from ESI one by one and yield the data of each page.
+
+        Yields nothing when the data has not changed
+        since the ETags have been saved the last time,
+        which is reported by :attr:`is_unchanged` once all pages have been fetched.
+        Unchanged pages are fetched again and yielded last,
+        when any of the other pages has changed.
+
+        Args:
+            operation_factory: Function which creates the ESI operation,
+                e.g. a partial of an ESI client method.
+        """
+        self._new_etags = {}
+        self.is_unchanged = False
+        unchanged_pages = []
+        has_changed_pages = False
+        previous_pages_count = None
+        pages_count = 1
+        page = 1
+        while page <= pages_count:
+            cached = self._get_cached(page)
+            if page == 1:
+                previous_pages_count = cached.get("pages")
+            etag = cached.get("etag")
+            data, new_etag, pages = self._fetch_page(operation_factory, page, etag)
+            pages_count = pages or cached.get("pages") or 1
+            self._new_etags[page] = {"etag": new_etag, "pages": pages_count}
+            if data is None or (new_etag and new_etag == etag):
+                unchanged_pages.append(page)
+            else:
+                has_changed_pages = True
+                yield data
+            page += 1
+
+        if not has_changed_pages and pages_count == previous_pages_count:
+            logger.debug("%s: Data has not changed", self)
+            self.is_unchanged = True
+            return
+
+        for page in unchanged_pages:
+            data, _, _ = self._fetch_page(operation_factory, page, None)
+            yield data
+
+    def save_etags(self):
+        """Remember the ETags from the last fetch for the next request."""
+        if not STRUCTURES_ESI_ETAG_TIMEOUT:
+            return
+        for page, value in self._new_etags.items():
+            if value["etag"]:
+                cache.set(
+                    key=self._cache_key(page),
+                    value=value,
+                    timeout=STRUCTURES_ESI_ETAG_TIMEOUT,
+                )
+
+    def clear_etags(self):
+        """Forget the saved ETags, so that the next request fetches all data."""
+        pages_count = self._get_cached(1).get("pages") or 1
+        cache.delete_many([self._cache_key(page) for page in range(1, pages_count + 1)])
+
+    def _cache_key(self, page: int) -> str:
+        return f"{self._key_base}:{page}"
+
+    def _get_cached(self, page: int) -> dict:
+        if not STRUCTURES_ESI_ETAG_TIMEOUT:
+            return {}
+        return cache.get(self._cache_key(page)) or {}
+
+    def _fetch_page(
+        self, operation_factory: Callable[..., Any], page: int, etag: Optional[str]
+    ) -> Tuple[Optional[list], Optional[str], Optional[int]]:
+        """Fetch one page from ESI.
+
+        Returns:
+            data or None if not modified, the ETag and the number of pages
+        """
+        kwargs = {}
+        if self.paginated:
+            kwargs["page"] = page
+        if etag:
+            kwargs["_request_options"] = {"headers": {"If-None-Match": etag}}
+        operation = operation_factory(**kwargs)
+        operation.request_config.also_return_response = True
+        try:
+            result = operation.result()
+        except HTTPNotModified as ex:
+            headers = self._normalize_headers(ex.response)
+            return None, headers.get("etag", etag), self._pages_count(headers)
+
+        if (
+            isinstance(result, (tuple, list))
+            and len(result) == 2
+            and hasattr(result[1], "status_code")
+        ):
+            data, response = result
+        else:
+            # clients not returning the response, e.g. some test stubs
+            data, response = result, None
+
+        headers = self._normalize_headers(response)
+        return data, headers.get("etag"), self._pages_count(headers)
+
+    @staticmethod
+    def _normalize_headers(response) -> dict:
+        headers = getattr(response, "headers", None) or {}
+        return {str(key).lower(): value for key, value in headers.items()}
+
+    def _pages_count(self, headers: dict) -> Optional[int]:
+        if not self.paginated:
+            return 1
+        try:
+            return int(headers["x-pages"])
+        except (KeyError, TypeError, ValueError):
+            return None
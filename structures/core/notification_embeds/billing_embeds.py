@@ -12,7 +12,6 @@ from eveuniverse.models import EveType
 from app_utils.datetime import ldap_time_2_datetime
 
 from structures.constants import EveTypeId
-from structures.helpers import get_or_create_esi_obj
 from structures.models import Notification, Webhook
 
 from .helpers import gen_solar_system_text, target_datetime_formatted
@@ -69,7 +68,7 @@ class NotificationBillingIHubBillAboutToExpire(NotificationBaseEmbed):
             "due_date": target_datetime_formatted(due_date),
         }
         self._color = Webhook.Color.DANGER
-        structure_type = get_or_create_esi_obj(EveType, id=EveTypeId.IHUB)
+        structure_type = self._notification.eve_object(EveType, EveTypeId.IHUB)
         self._thumbnail = dhooks_lite.Thumbnail(
             structure_type.icon_url(size=self.ICON_DEFAULT_SIZE)
         )
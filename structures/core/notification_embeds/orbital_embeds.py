@@ -10,7 +10,6 @@ from eveuniverse.models import EveType
 from app_utils.datetime import ldap_time_2_datetime
 
 from structures.constants import EveTypeId
-from structures.helpers import get_or_create_esi_obj
 from structures.models import Notification, Webhook
 
 from .helpers import (
@@ -27,8 +26,8 @@ class NotificationOrbitalEmbed(NotificationBaseEmbed):
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
         self._planet = self._notification.eve_planet()
-        self._structure_type = get_or_create_esi_obj(
-            EveType, id=EveTypeId.CUSTOMS_OFFICE
+        self._structure_type = self._notification.eve_object(
+            EveType, EveTypeId.CUSTOMS_OFFICE
         )
         self._solar_system_link = gen_solar_system_text(
             self._notification.eve_solar_system()
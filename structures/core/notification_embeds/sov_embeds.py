@@ -11,7 +11,6 @@ from app_utils.datetime import ldap_time_2_datetime
 
 from structures.constants import EveTypeId
 from structures.core import sovereignty
-from structures.helpers import get_or_create_esi_obj
 from structures.models import Notification, Webhook
 
 from .helpers import (
@@ -39,7 +38,7 @@ class NotificationSovEmbed(NotificationBaseEmbed):
             )
         else:
             structure_type_id = EveTypeId.TCU
-        structure_type = get_or_create_esi_obj(EveType, id=structure_type_id)
+        structure_type = self._notification.eve_object(EveType, structure_type_id)
         self._structure_type_name = structure_type.name
         try:
             self._sov_owner_link = gen_alliance_link(notification.sender.name)
@@ -95,8 +94,12 @@ class NotificationSovCommandNodeEventStarted(NotificationSovEmbed):
 class NotificationSovAllClaimAcquiredMsg(NotificationSovEmbed):
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
-        alliance = get_or_create_esi_obj(EveEntity, id=self._parsed_text["allianceID"])
-        corporation = get_or_create_esi_obj(EveEntity, id=self._parsed_text["corpID"])
+        alliance = self._notification.eve_object(
+            EveEntity, self._parsed_text["allianceID"]
+        )
+        corporation = self._notification.eve_object(
+            EveEntity, self._parsed_text["corpID"]
+        )
         self._title = (
             _("DED Sovereignty claim acknowledgment: %s") % self._solar_system.name
         )
@@ -115,8 +118,12 @@ class NotificationSovAllClaimAcquiredMsg(NotificationSovEmbed):
 class NotificationSovAllClaimLostMsg(NotificationSovEmbed):
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
-        alliance = get_or_create_esi_obj(EveEntity, id=self._parsed_text["allianceID"])
-        corporation = get_or_create_esi_obj(EveEntity, id=self._parsed_text["corpID"])
+        alliance = self._notification.eve_object(
+            EveEntity, self._parsed_text["allianceID"]
+        )
+        corporation = self._notification.eve_object(
+            EveEntity, self._parsed_text["corpID"]
+        )
         self._title = _("Lost sovereignty in: %s") % self._solar_system.name
         self._description = _(
             "DED acknowledges that member corporation %(corporation)s has lost its "
@@ -175,13 +182,13 @@ class NotificationSovStructureDestroyed(NotificationSovEmbed):
 class NotificationSovAllAnchoringMsg(NotificationBaseEmbed):
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
-        corporation = get_or_create_esi_obj(
-            EveEntity, id=self._parsed_text.get("corpID")
+        corporation = self._notification.eve_object(
+            EveEntity, self._parsed_text.get("corpID")
         )
         corp_link = gen_eve_entity_link(corporation)
         alliance_id = self._parsed_text.get("allianceID")
         if alliance_id:
-            alliance = get_or_create_esi_obj(EveEntity, id=alliance_id)
+            alliance = self._notification.eve_object(EveEntity, alliance_id)
             structure_owner = f"{corp_link} ({alliance.name})"
         else:
             structure_owner = corp_link
@@ -189,7 +196,7 @@ class NotificationSovAllAnchoringMsg(NotificationBaseEmbed):
         structure_type = self._notification.eve_structure_type("typeID")
         moon_id = self._parsed_text.get("moonID")
         if moon_id:
-            eve_moon = get_or_create_esi_obj(EveMoon, id=moon_id)
+            eve_moon = self._notification.eve_object(EveMoon, moon_id)
             location_text = _(" near **%s**") % eve_moon.name
         else:
             location_text = ""
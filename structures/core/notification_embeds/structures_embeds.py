@@ -11,8 +11,7 @@ from eveuniverse.models import EveEntity, EveType
 
 from app_utils.datetime import ldap_time_2_datetime, ldap_timedelta_2_timedelta
 
-from structures.helpers import get_or_create_esi_obj
-from structures.models import Notification, Structure, Webhook
+from structures.models import Notification, Webhook
 
 from .helpers import (
     gen_alliance_link,
@@ -29,12 +28,10 @@ class NotificationStructureEmbed(NotificationBaseEmbed):
 
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
-        try:
-            structure = Structure.objects.select_related_defaults().get(
-                id=self._parsed_text["structureID"]
-            )
-        except Structure.DoesNotExist:
-            structure = None
+        structure = self._notification.referenced_structure(
+            self._parsed_text["structureID"]
+        )
+        if not structure:
             structure_name = _("(unknown)")
             structure_type = self._notification.eve_structure_type()
             structure_solar_system = self._notification.eve_solar_system(
@@ -229,13 +226,15 @@ class NotificationStructureOwnershipTransferred(NotificationBaseEmbed):
                 self._notification.eve_solar_system()
             ),
         }
-        from_corporation = get_or_create_esi_obj(
-            EveEntity, id=self._parsed_text["oldOwnerCorpID"]
+        from_corporation = self._notification.eve_object(
+            EveEntity, self._parsed_text["oldOwnerCorpID"]
         )
-        to_corporation = get_or_create_esi_obj(
-            EveEntity, id=self._parsed_text["newOwnerCorpID"]
+        to_corporation = self._notification.eve_object(
+            EveEntity, self._parsed_text["newOwnerCorpID"]
+        )
+        character = self._notification.eve_object(
+            EveEntity, self._parsed_text["charID"]
         )
-        character = get_or_create_esi_obj(EveEntity, id=self._parsed_text["charID"])
         self._description += _(
             "has been transferred from %(from_corporation)s "
             "to %(to_corporation)s by %(character)s."
@@ -283,16 +282,13 @@ class NotificationStructureReinforceChange(NotificationBaseEmbed):
         super().__init__(notification)
         all_structure_info = []
         for structure_info in self._parsed_text["allStructureInfo"]:
-            try:
-                structure = Structure.objects.select_related_defaults().get(
-                    id=structure_info[0]
-                )
-            except Structure.DoesNotExist:
+            structure = self._notification.referenced_structure(structure_info[0])
+            if not structure:
                 all_structure_info.append(
                     self.StructureInfo(
                         name=structure_info[1],
-                        eve_type=EveType.objects.get_or_create_esi(
-                            id=structure_info[2]
+                        eve_type=self._notification.eve_object(
+                            EveType, structure_info[2]
                         ),
                         eve_solar_system=None,
                         owner_link=_("(unknown)"),
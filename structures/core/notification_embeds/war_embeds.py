@@ -11,7 +11,6 @@ from eveuniverse.models import EveEntity
 
 from app_utils.datetime import ldap_time_2_datetime
 
-from structures.helpers import get_or_create_esi_obj
 from structures.models import Notification, Webhook
 
 from .helpers import (
@@ -25,11 +24,11 @@ from .main import NotificationBaseEmbed
 class NotificationWarEmbed(NotificationBaseEmbed):
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
-        self._declared_by = get_or_create_esi_obj(
-            EveEntity, id=self._parsed_text["declaredByID"]
+        self._declared_by = self._notification.eve_object(
+            EveEntity, self._parsed_text["declaredByID"]
         )
-        self._against = get_or_create_esi_obj(
-            EveEntity, id=self._parsed_text["againstID"]
+        self._against = self._notification.eve_object(
+            EveEntity, self._parsed_text["againstID"]
         )
         self._thumbnail = dhooks_lite.Thumbnail(
             self._declared_by.icon_url(size=self.ICON_DEFAULT_SIZE)
@@ -54,7 +53,9 @@ class NotificationCorpWarSurrenderMsg(NotificationWarEmbed):
 class NotificationWarAdopted(NotificationWarEmbed):
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
-        alliance = get_or_create_esi_obj(EveEntity, id=self._parsed_text["allianceID"])
+        alliance = self._notification.eve_object(
+            EveEntity, self._parsed_text["allianceID"]
+        )
         self._title = _("War update: %(against)s has left %(alliance)s") % {
             "against": self._against.name,
             "alliance": alliance.name,
@@ -96,9 +97,15 @@ class NotificationWarDeclared(NotificationWarEmbed):
 class NotificationWarInherited(NotificationWarEmbed):
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
-        alliance = get_or_create_esi_obj(EveEntity, id=self._parsed_text["allianceID"])
-        opponent = get_or_create_esi_obj(EveEntity, id=self._parsed_text["opponentID"])
-        quitter = get_or_create_esi_obj(EveEntity, id=self._parsed_text["quitterID"])
+        alliance = self._notification.eve_object(
+            EveEntity, self._parsed_text["allianceID"]
+        )
+        opponent = self._notification.eve_object(
+            EveEntity, self._parsed_text["opponentID"]
+        )
+        quitter = self._notification.eve_object(
+            EveEntity, self._parsed_text["quitterID"]
+        )
         self._title = _("%(alliance)s inherits war against %(opponent)s") % {
             "alliance": alliance.name,
             "opponent": opponent.name,
@@ -170,7 +177,9 @@ class NotificationWarSurrenderOfferMsg(NotificationBaseEmbed):
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
         isk_value = self._parsed_text.get("iskValue", 0)
-        owner_1 = get_or_create_esi_obj(EveEntity, id=self._parsed_text.get("ownerID1"))
+        owner_1 = self._notification.eve_object(
+            EveEntity, self._parsed_text.get("ownerID1")
+        )
         owner_1_link = gen_eve_entity_link(owner_1)
         owner_2_link = gen_eve_entity_link_from_id(self._parsed_text.get("ownerID2"))
         self._title = _("%s has offered a surrender") % (owner_1,)
@@ -186,11 +195,13 @@ class NotificationAllyJoinedWarMsg(NotificationBaseEmbed):
     def __init__(self, notification: Notification) -> None:
         super().__init__(notification)
         self._title = _("Ally Has Joined a War")
-        aggressor = get_or_create_esi_obj(
-            EveEntity, id=self._parsed_text["aggressorID"]
+        aggressor = self._notification.eve_object(
+            EveEntity, self._parsed_text["aggressorID"]
+        )
+        ally = self._notification.eve_object(EveEntity, self._parsed_text["allyID"])
+        defender = self._notification.eve_object(
+            EveEntity, self._parsed_text["defenderID"]
         )
-        ally = get_or_create_esi_obj(EveEntity, id=self._parsed_text["allyID"])
-        defender = get_or_create_esi_obj(EveEntity, id=self._parsed_text["defenderID"])
         start_time = ldap_time_2_datetime(self._parsed_text["startTime"])
         self._description = _(
             "%(ally)s has joined %(defender)s in a war against %(aggressor)s. "
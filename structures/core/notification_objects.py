@@ -0,0 +1,179 @@
+"""Objects referenced by notifications, which can be loaded in bulk."""
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Set
+
+from eveuniverse.models import EveEntity, EveMoon, EvePlanet, EveSolarSystem, EveType
+
+from allianceauth.services.hooks import get_extension_logger
+from app_utils.logging import LoggerAddTag
+
+from structures import __title__
+from structures.helpers import get_or_create_esi_obj
+
+if TYPE_CHECKING:
+    from structures.models import NotificationBase, Structure
+
+logger = LoggerAddTag(get_extension_logger(__name__), __title__)
+
+# Keys in notification texts which contain IDs of objects by model
+ID_KEYS = {
+    EveEntity: (
+        "aggressorAllianceID",
+        "aggressorCorpID",
+        "aggressorID",
+        "againstID",
+        "allianceID",
+        "allyID",
+        "cancelledBy",
+        "charID",
+        "corpID",
+        "declaredByID",
+        "defenderID",
+        "firedBy",
+        "newOwnerCorpID",
+        "oldOwnerCorpID",
+        "opponentID",
+        "ownerID1",
+        "ownerID2",
+        "quitterID",
+        "startedBy",
+    ),
+    EveMoon: ("moonID",),
+    EvePlanet: ("planetID",),
+    EveSolarSystem: ("solarSystemID", "solarsystemID"),
+    EveType: ("structureTypeID", "typeID"),
+}
+
+
+class NotificationObjects:
+    """Eve objects and structures referenced by a batch of notifications.
+
+    Objects are loaded once for the whole batch and can then be looked up
+    without queries while rendering.
+    Objects not found in this cache are fetched one by one and then kept.
+    """
+
+    def __init__(self) -> None:
+        self._objs = defaultdict(dict)
+        self._structures = {}
+
+    def get(self, model: type, obj_id: int):
+        """Return an object of a model by ID."""
+        obj_id = int(obj_id)
+        try:
+            return self._objs[model][obj_id]
+        except KeyError:
+            obj = get_or_create_esi_obj(model, id=obj_id)
+            self._objs[model][obj_id] = obj
+            return obj
+
+    def structure(self, structure_id: int) -> Optional["Structure"]:
+        """Return a structure by ID or None if it does not exist."""
+        from structures.models import Structure
+
+        structure_id = int(structure_id)
+        try:
+            return self._structures[structure_id]
+        except KeyError:
+            structure = (
+                Structure.objects.select_related_defaults()
+                .filter(id=structure_id)
+                .first()
+            )
+            self._structures[structure_id] = structure
+            return structure
+
+    @classmethod
+    def from_notifications(
+        cls, notifications: Iterable["NotificationBase"]
+    ) -> "NotificationObjects":
+        """Create new cache with all objects referenced by given notifications.
+
+        Missing entities are resolved with one call to ESI.
+        """
+        ids = defaultdict(set)
+        structure_ids = set()
+        for notif in notifications:
+            parsed_text = notif.parsed_text()
+            if not isinstance(parsed_text, dict):
+                continue
+            for model, keys in ID_KEYS.items():
+                ids[model] |= _ids_from_keys(parsed_text, keys)
+            ids[EveType] |= _ids_from_values(parsed_text.get("oreVolumeByType"))
+            structure_ids |= _ids_from_values([parsed_text.get("structureID")])
+            for structure_info in parsed_text.get("allStructureInfo") or []:
+                try:
+                    structure_ids |= _ids_from_values(structure_info[:1])
+                    ids[EveType] |= _ids_from_values(structure_info[2:3])
+                except TypeError:
+                    continue
+
+        obj = cls()
+        obj._load_eve_entities(ids.pop(EveEntity, set()))
+        obj._load_objs(
+            EveSolarSystem,
+            ids[EveSolarSystem],
+            EveSolarSystem.objects.select_related("eve_constellation__eve_region"),
+        )
+        obj._load_objs(
+            EveMoon,
+            ids[EveMoon],
+            EveMoon.objects.select_related(
+                "eve_planet__eve_solar_system__eve_constellation__eve_region"
+            ),
+        )
+        obj._load_objs(EvePlanet, ids[EvePlanet])
+        obj._load_objs(
+            EveType, ids[EveType], EveType.objects.select_related("eve_group")
+        )
+        obj._load_structures(structure_ids)
+        return obj
+
+    def _load_eve_entities(self, ids: Set[int]) -> None:
+        if not ids:
+            return
+        entities = EveEntity.objects.in_bulk(ids)
+        missing_ids = ids - set(entities.keys())
+        if missing_ids:
+            logger.info("Resolving %d entities from ESI", len(missing_ids))
+            try:
+                # only creates entities, which could be resolved
+                EveEntity.objects.update_from_esi_by_id(missing_ids)
+            except OSError as ex:
+                # entities which are needed will be resolved one by one instead
+                logger.warning("Failed to resolve entities from ESI: %s", ex)
+            else:
+                entities.update(EveEntity.objects.in_bulk(missing_ids))
+        self._objs[EveEntity].update(entities)
+
+    def _load_objs(self, model: type, ids: Set[int], queryset=None) -> None:
+        if not ids:
+            return
+        if queryset is None:
+            queryset = model.objects.all()
+        self._objs[model].update(queryset.in_bulk(ids))
+
+    def _load_structures(self, ids: Set[int]) -> None:
+        from structures.models import Structure
+
+        if not ids:
+            return
+        structures: Dict[int, Optional[Structure]] = dict.fromkeys(ids)
+        structures.update(Structure.objects.select_related_defaults().in_bulk(ids))
+        self._structures.update(structures)
+
+
+def _ids_from_keys(parsed_text: dict, keys: Iterable[str]) -> Set[int]:
+    return _ids_from_values(parsed_text.get(key) for key in keys)
+
+
+def _ids_from_values(values) -> Set[int]:
+    """Return all valid IDs from values."""
+    if not values:
+        return set()
+    return {
+        value
+        for value in values
+        if isinstance(value, int) and not isinstance(value, bool) and value > 0
+    }
@@ -282,49 +282,47 @@ def _gen_timer_moon_extraction(notif: Notification) -> bool:
             owner=notif.owner,
             is_timer_added=True,
             timestamp__lte=notif.timestamp,
+            ref_type_id=notif.ref_type_id,
         ).order_by("-timestamp"):
             notification: Notification
-            parsed_text_2 = notification.parsed_text()
-            my_structure_type_id = parsed_text_2["structureTypeID"]
-            if my_structure_type_id == parsed_text["structureTypeID"]:
-                eve_time_2 = _extract_eve_time(parsed_text_2)
-
-                if AuthTimer:
-                    timer_query = AuthTimer.objects.filter(
-                        system=solar_system.name,
-                        planet_moon=moon.name,
-                        structure=structure_type_name,
-                        objective=objective,
-                        eve_time=eve_time_2,
-                    )
-                    deleted_count, _ = timer_query.delete()
-                    logger.info(
-                        "%s: removed %d obsolete Auth timers related to notification",
-                        notif.notification_id,
-                        deleted_count,
-                    )
-
-                if Timer:
-                    timer_query = Timer.objects.filter(
-                        eve_solar_system=solar_system,
-                        structure_type=structure_type,
-                        timer_type=Timer.Type.MOONMINING,
-                        location_details=moon.name,
-                        date=eve_time_2,
-                        objective=Timer.Objective.FRIENDLY,
-                        eve_corporation=notif.owner.corporation,
-                        eve_alliance=notif.owner.corporation.alliance,
-                        visibility=_calc_visibility(),
-                        structure_name=parsed_text["structureName"],
-                        owner_name=notif.owner.corporation.corporation_name,
-                    )
-                    deleted_count, _ = timer_query.delete()
-                    logger.info(
-                        "%s: removed %d obsolete structure timers "
-                        "related to notification",
-                        notif.notification_id,
-                        deleted_count,
-                    )
+            eve_time_2 = _extract_eve_time(notification.parsed_text())
+
+            if AuthTimer:
+                timer_query = AuthTimer.objects.filter(
+                    system=solar_system.name,
+                    planet_moon=moon.name,
+                    structure=structure_type_name,
+                    objective=objective,
+                    eve_time=eve_time_2,
+                )
+                deleted_count, _ = timer_query.delete()
+                logger.info(
+                    "%s: removed %d obsolete Auth timers related to notification",
+                    notif.notification_id,
+                    deleted_count,
+                )
+
+            if Timer:
+                timer_query = Timer.objects.filter(
+                    eve_solar_system=solar_system,
+                    structure_type=structure_type,
+                    timer_type=Timer.Type.MOONMINING,
+                    location_details=moon.name,
+                    date=eve_time_2,
+                    objective=Timer.Objective.FRIENDLY,
+                    eve_corporation=notif.owner.corporation,
+                    eve_alliance=notif.owner.corporation.alliance,
+                    visibility=_calc_visibility(),
+                    structure_name=parsed_text["structureName"],
+                    owner_name=notif.owner.corporation.corporation_name,
+                )
+                deleted_count, _ = timer_query.delete()
+                logger.info(
+                    "%s: removed %d obsolete structure timers "
+                    "related to notification",
+                    notif.notification_id,
+                    deleted_count,
+                )
 
     return timer_processed
 
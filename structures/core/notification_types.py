@@ -5,7 +5,10 @@ from typing import List, Set
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from structures.app_settings import STRUCTURES_FEATURE_REFUELED_NOTIFICATIONS
+from structures.app_settings import (
+    STRUCTURES_FEATURE_REFUELED_NOTIFICATIONS,
+    STRUCTURES_NOTIFICATION_HIGH_PRIORITY_TYPES,
+)
 
 
 class NotificationType(models.TextChoices):
@@ -258,6 +261,67 @@ class NotificationType(models.TextChoices):
             cls.TOWER_REINFORCED_EXTRA,
         }
 
+    @classmethod
+    def related_by_structure_id(cls) -> Set["NotificationType"]:
+        """Notification types which reference their structure by ID."""
+        return {
+            cls.STRUCTURE_ONLINE,
+            cls.STRUCTURE_FUEL_ALERT,
+            cls.STRUCTURE_JUMP_FUEL_ALERT,
+            cls.STRUCTURE_REFUELED_EXTRA,
+            cls.STRUCTURE_SERVICES_OFFLINE,
+            cls.STRUCTURE_WENT_LOW_POWER,
+            cls.STRUCTURE_WENT_HIGH_POWER,
+            cls.STRUCTURE_UNANCHORING,
+            cls.STRUCTURE_UNDER_ATTACK,
+            cls.STRUCTURE_LOST_SHIELD,
+            cls.STRUCTURE_LOST_ARMOR,
+            cls.STRUCTURE_DESTROYED,
+            cls.OWNERSHIP_TRANSFERRED,
+            cls.STRUCTURE_ANCHORING,
+            cls.MOONMINING_EXTRACTION_STARTED,
+            cls.MOONMINING_EXTRACTION_FINISHED,
+            cls.MOONMINING_AUTOMATIC_FRACTURE,
+            cls.MOONMINING_EXTRACTION_CANCELLED,
+            cls.MOONMINING_LASER_FIRED,
+        }
+
+    @classmethod
+    def relevant_for_high_priority(cls) -> Set["NotificationType"]:
+        """Notification types that are sent to Discord before all others."""
+        if STRUCTURES_NOTIFICATION_HIGH_PRIORITY_TYPES is not None:
+            return {
+                cls(value)
+                for value in STRUCTURES_NOTIFICATION_HIGH_PRIORITY_TYPES
+                if value in cls.values
+            }
+        return {
+            cls.STRUCTURE_UNDER_ATTACK,
+            cls.STRUCTURE_LOST_SHIELD,
+            cls.STRUCTURE_LOST_ARMOR,
+            cls.ORBITAL_ATTACKED,
+            cls.ORBITAL_REINFORCED,
+            cls.TOWER_ALERT_MSG,
+            cls.TOWER_REINFORCED_EXTRA,
+            cls.SOV_STRUCTURE_REINFORCED,
+            cls.SOV_ENTOSIS_CAPTURE_STARTED,
+            cls.SOV_COMMAND_NODE_EVENT_STARTED,
+        }
+
+    @classmethod
+    def related_by_planet(cls) -> Set["NotificationType"]:
+        """Notification types which reference their structure by planet and type."""
+        return {cls.ORBITAL_ATTACKED, cls.ORBITAL_REINFORCED}
+
+    @classmethod
+    def related_by_moon(cls) -> Set["NotificationType"]:
+        """Notification types which reference their structure by moon and type."""
+        return {
+            cls.TOWER_ALERT_MSG,
+            cls.TOWER_RESOURCE_ALERT_MSG,
+            cls.TOWER_REFUELED_EXTRA,
+        }
+
     @classmethod
     def relevant_for_forwarding(cls) -> Set["NotificationType"]:
         """Notification types that are forwarded to Discord."""
@@ -1,13 +1,17 @@
 """Core logic for starbases in Structures."""
 
 import math
+from collections import defaultdict
 from enum import IntEnum, auto
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from eveuniverse.models import EveType
 
 from structures.constants import EveGroupId
 
+MODULES_MAX_DISTANCE = 100_000
+"""Max distance in meters of a module to its starbase."""
+
 
 class StarbaseSize(IntEnum):
     """A starbase size."""
@@ -68,3 +72,49 @@ def fuel_duration(
         )
     seconds = math.floor(3600 * fuel_quantity / (amount_per_hour * (1 - sov_discount)))
     return seconds
+
+
+class ModulesIndex:
+    """A spatial index for finding starbase modules near a position.
+
+    Modules are bucketed by solar system and cubic grid cells
+    with the max distance as edge length,
+    so that only modules from neighboring cells need to be checked.
+    """
+
+    def __init__(self, cell_size: float = MODULES_MAX_DISTANCE) -> None:
+        self._cell_size = cell_size
+        self._cells: Dict[
+            Tuple[int, int, int, int], List[Tuple[int, Any]]
+        ] = defaultdict(list)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, obj: Any, solar_system_id: int, x: float, y: float, z: float):
+        """Add an object with a position."""
+        key = (solar_system_id, *self._cell(x, y, z))
+        self._cells[key].append((self._count, obj))
+        self._count += 1
+
+    def candidates(self, solar_system_id: int, x: float, y: float, z: float) -> list:
+        """Return objects which might be within the max distance of a position.
+
+        Objects are returned in the order they were added.
+        """
+        cx, cy, cz = self._cell(x, y, z)
+        found = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    key = (solar_system_id, cx + dx, cy + dy, cz + dz)
+                    found += self._cells.get(key, [])
+        return [obj for _, obj in sorted(found, key=lambda o: o[0])]
+
+    def _cell(self, x: float, y: float, z: float) -> Tuple[int, int, int]:
+        return (
+            math.floor(x / self._cell_size),
+            math.floor(y / self._cell_size),
+            math.floor(z / self._cell_size),
+        )
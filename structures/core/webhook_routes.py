@@ -0,0 +1,185 @@
+"""Routing of notifications to webhooks."""
+
+from collections import defaultdict
+from functools import partial
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+from allianceauth.services.hooks import get_extension_logger
+from app_utils.logging import LoggerAddTag
+
+from structures import __title__
+
+from .cache_versions import get_version, increment_version
+from .notification_types import NotificationType
+
+if TYPE_CHECKING:
+    from structures.models import NotificationBase, Owner, Webhook
+
+logger = LoggerAddTag(get_extension_logger(__name__), __title__)
+
+ROUTES_CACHE_TIMEOUT = 3600
+_VERSION_CACHE_KEY = "structures:webhook-routes:version"
+
+
+def invalidate_webhook_routes(owner_id: Optional[int] = None) -> None:
+    """Invalidate the cached webhook routes of an owner or of all owners.
+
+    Routes are invalidated again once the current transaction is committed,
+    so that routes built from not yet committed data are not kept.
+    """
+    if owner_id is None:
+        increment_version(_VERSION_CACHE_KEY)
+        transaction.on_commit(partial(increment_version, _VERSION_CACHE_KEY))
+    else:
+        _delete_owner_routes(owner_id)
+        transaction.on_commit(partial(_delete_owner_routes, owner_id))
+
+
+def _delete_owner_routes(owner_id: int) -> None:
+    cache.delete(
+        _owner_routes_cache_key(owner_id), version=get_version(_VERSION_CACHE_KEY)
+    )
+
+
+def _owner_routes_cache_key(owner_id: int) -> str:
+    return f"structures:webhook-routes:owner:{owner_id}"
+
+
+def _is_in_transaction() -> bool:
+    return transaction.get_connection().in_atomic_block
+
+
+class WebhookRoutes:
+    """Active webhooks of an owner and it's structures by notification type.
+
+    Routes are built once and then cached
+    until webhooks or their relations to owners and structures change.
+    """
+
+    def __init__(
+        self, owner_routes: Dict[str, List[int]], structures: Dict[int, dict]
+    ) -> None:
+        self._owner_routes = owner_routes
+        self._structures = structures
+        self._webhooks: Optional[Dict[int, "Webhook"]] = None
+
+    @classmethod
+    def for_owner(cls, owner: "Owner") -> "WebhookRoutes":
+        """Return the routes for an owner.
+
+        Routes are only cached when built outside of a transaction,
+        because they might include changes which are later rolled back.
+        """
+        if _is_in_transaction():
+            return cls(**cls._build(owner))
+
+        key = _owner_routes_cache_key(owner.pk)
+        version = get_version(_VERSION_CACHE_KEY)
+        data = cache.get(key, version=version)
+        if data is None:
+            data = cls._build(owner)
+            cache.set(key, data, timeout=ROUTES_CACHE_TIMEOUT, version=version)
+            logger.debug("%s: Built webhook routes", owner)
+        return cls(**data)
+
+    @staticmethod
+    def _build(owner: "Owner") -> dict:
+        owner_routes = defaultdict(list)
+        owner_subscriptions = (
+            owner.webhooks.filter(is_active=True, subscriptions__isnull=False)
+            .order_by("pk")
+            .values_list("pk", "subscriptions__notif_type")
+        )
+        for webhook_id, notif_type in owner_subscriptions:
+            owner_routes[notif_type].append(webhook_id)
+
+        structures = {}
+        structures_qs = (
+            owner.structures.filter(webhooks__isnull=False)
+            .distinct()
+            .values_list("id", "eve_moon_id", "eve_planet_id", "eve_type_id")
+        )
+        for structure_id, moon_id, planet_id, type_id in structures_qs:
+            structures[structure_id] = {
+                "moon_id": moon_id,
+                "planet_id": planet_id,
+                "type_id": type_id,
+                "routes": defaultdict(list),
+            }
+        structure_subscriptions = (
+            owner.structures.filter(
+                webhooks__is_active=True, webhooks__subscriptions__isnull=False
+            )
+            .order_by("webhooks__pk")
+            .values_list("id", "webhooks__pk", "webhooks__subscriptions__notif_type")
+        )
+        for structure_id, webhook_id, notif_type in structure_subscriptions:
+            structures[structure_id]["routes"][notif_type].append(webhook_id)
+        for obj in structures.values():
+            obj["routes"] = dict(obj["routes"])
+
+        return {"owner_routes": dict(owner_routes), "structures": structures}
+
+    def structure_ids(self, notif: "NotificationBase") -> List[int]:
+        """Return IDs of structures with webhooks, which a notification is about."""
+        notif_type = notif.notif_type
+        if notif_type in NotificationType.related_by_structure_id():
+            candidate_ids = [notif.ref_structure_id]
+        elif notif_type == NotificationType.STRUCTURE_REINFORCEMENT_CHANGED:
+            candidate_ids = notif.reinforcement_structure_ids()
+        elif notif_type in NotificationType.related_by_planet():
+            candidate_ids = [
+                structure_id
+                for structure_id, obj in self._structures.items()
+                if notif.ref_planet_id
+                and obj["planet_id"] == notif.ref_planet_id
+                and obj["type_id"] == notif.ref_type_id
+            ]
+        elif notif_type in NotificationType.related_by_moon():
+            candidate_ids = [
+                structure_id
+                for structure_id, obj in self._structures.items()
+                if notif.ref_moon_id
+                and obj["moon_id"] == notif.ref_moon_id
+                and obj["type_id"] == notif.ref_type_id
+            ]
+        else:
+            candidate_ids = []
+        return sorted(
+            {obj_id for obj_id in candidate_ids if obj_id in self._structures}
+        )
+
+    def webhook_ids(self, notif: "NotificationBase") -> List[int]:
+        """Return IDs of the active webhooks a notification should be sent to.
+
+        When the notification is about exactly one structure with webhooks,
+        the webhooks of that structure are used instead of the owner's webhooks.
+        """
+        structure_ids = self.structure_ids(notif) if notif.is_structure_related else []
+        if len(structure_ids) == 1:
+            routes = self._structures[structure_ids[0]]["routes"]
+        else:
+            routes = self._owner_routes
+        return list(routes.get(notif.notif_type, []))
+
+    def webhooks(self, notif: "NotificationBase") -> List["Webhook"]:
+        """Return the active webhooks a notification should be sent to."""
+        if self._webhooks is None:
+            from structures.models import Webhook
+
+            webhook_ids = set()
+            for routes in [self._owner_routes] + [
+                obj["routes"] for obj in self._structures.values()
+            ]:
+                for ids in routes.values():
+                    webhook_ids.update(ids)
+            self._webhooks = Webhook.objects.in_bulk(webhook_ids)
+
+        return [
+            self._webhooks[webhook_id]
+            for webhook_id in self.webhook_ids(notif)
+            if webhook_id in self._webhooks
+        ]
@@ -1,6 +1,7 @@
 """Helpers for Structures."""
 
 import datetime as dt
+import math
 from typing import Any, Optional
 from urllib.parse import urlparse
 
@@ -39,3 +40,69 @@ def get_or_create_esi_obj(model_class: type, *args, **kwargs) -> Any:
     """Get or create an object from ESI and return it."""
     obj, _ = model_class.objects.get_or_create_esi(*args, **kwargs)
     return obj
+
+
+_JSON_TAG_INT_KEYS = "__int_keys__"
+_JSON_TAG_DATE = "__date__"
+_JSON_TAG_DATETIME = "__datetime__"
+
+
+def yaml_data_to_json(data: Any) -> Any:
+    """Convert data loaded from YAML into data which can be stored as JSON
+    and converted back without loss.
+
+    Raises TypeError when the data contains values which can not be converted.
+    """
+    if data is None or isinstance(data, (str, bool, int)):
+        return data
+
+    if isinstance(data, float):
+        if not math.isfinite(data):
+            raise TypeError(f"Can not convert float: {data}")
+        return data
+
+    if isinstance(data, list):
+        return [yaml_data_to_json(obj) for obj in data]
+
+    if isinstance(data, dict):
+        if all(isinstance(key, str) for key in data.keys()):
+            return {key: yaml_data_to_json(value) for key, value in data.items()}
+
+        if all(
+            isinstance(key, int) and not isinstance(key, bool) for key in data.keys()
+        ):
+            return {
+                _JSON_TAG_INT_KEYS: {
+                    str(key): yaml_data_to_json(value) for key, value in data.items()
+                }
+            }
+
+        raise TypeError(f"Can not convert dict keys: {list(data.keys())}")
+
+    if isinstance(data, dt.datetime):
+        return {_JSON_TAG_DATETIME: data.isoformat()}
+
+    if isinstance(data, dt.date):
+        return {_JSON_TAG_DATE: data.isoformat()}
+
+    raise TypeError(f"Can not convert type: {type(data)}")
+
+
+def json_to_yaml_data(data: Any) -> Any:
+    """Convert data created with :func:`yaml_data_to_json` back."""
+    if isinstance(data, list):
+        return [json_to_yaml_data(obj) for obj in data]
+
+    if isinstance(data, dict):
+        if len(data) == 1:
+            key, value = next(iter(data.items()))
+            if key == _JSON_TAG_INT_KEYS:
+                return {int(k): json_to_yaml_data(v) for k, v in value.items()}
+            if key == _JSON_TAG_DATETIME:
+                return dt.datetime.fromisoformat(value)
+            if key == _JSON_TAG_DATE:
+                return dt.date.fromisoformat(value)
+
+        return {key: json_to_yaml_data(value) for key, value in data.items()}
+
+    return data
@@ -4,7 +4,9 @@
 
 import datetime as dt
 import itertools
-from typing import Any, Optional, Set, Tuple
+from collections import defaultdict
+from copy import copy
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -21,6 +23,7 @@ from . import __title__
 from .app_settings import STRUCTURES_HOURS_UNTIL_STALE_NOTIFICATION
 from .constants import EveCategoryId, EveTypeId
 from .core.notification_types import NotificationType
+from .core.webhook_routes import invalidate_webhook_routes
 from .providers import esi
 from .webhooks.managers import WebhookBaseManager
 
@@ -118,7 +121,105 @@ class NotificationBaseManagerBase(models.Manager):
 
 
 class NotificationQuerySet(NotificationBaseQuerySet):
-    pass
+    def update_related_structures(
+        self, recheck_before: Optional[dt.datetime] = None
+    ) -> Tuple[int, int]:
+        """Add related structures to notifications which have none yet.
+
+        Candidate structures for all notifications are fetched with one query
+        and the new relations are created in bulk.
+        Notifications without any matching structures are marked as checked
+        and are only checked again when they were checked before ``recheck_before``.
+
+        Returns:
+            count of updated notifications, count of checked notifications
+        """
+        checked_filter = Q(structures_checked_at__isnull=True)
+        if recheck_before:
+            checked_filter |= Q(structures_checked_at__lt=recheck_before)
+        notifications = list(
+            self.filter(
+                checked_filter,
+                notif_type__in=NotificationType.structure_related(),
+                structures__isnull=True,
+            ).only(
+                "id",
+                "notif_type",
+                "text",
+                "text_parsed",
+                "ref_moon_id",
+                "ref_planet_id",
+                "ref_structure_id",
+                "ref_type_id",
+            )
+        )
+        if not notifications:
+            return 0, 0
+
+        reinforcement_structure_ids = {
+            obj.pk: obj.reinforcement_structure_ids()
+            for obj in notifications
+            if obj.notif_type == NotificationType.STRUCTURE_REINFORCEMENT_CHANGED
+        }
+        structure_ids = set(itertools.chain(*reinforcement_structure_ids.values()))
+        structure_ids |= {obj.ref_structure_id for obj in notifications}
+        planet_ids = {obj.ref_planet_id for obj in notifications}
+        moon_ids = {obj.ref_moon_id for obj in notifications}
+        structure_model = self.model.structures.field.related_model
+        structures = structure_model.objects.filter(
+            Q(id__in=structure_ids - {None})
+            | Q(eve_planet_id__in=planet_ids - {None})
+            | Q(eve_moon_id__in=moon_ids - {None})
+        ).values_list("id", "eve_planet_id", "eve_moon_id", "eve_type_id")
+        existing_structure_ids = set()
+        structure_ids_by_planet = defaultdict(list)
+        structure_ids_by_moon = defaultdict(list)
+        for structure_id, planet_id, moon_id, type_id in structures:
+            existing_structure_ids.add(structure_id)
+            if planet_id:
+                structure_ids_by_planet[(planet_id, type_id)].append(structure_id)
+            if moon_id:
+                structure_ids_by_moon[(moon_id, type_id)].append(structure_id)
+
+        relations = []
+        unmatched_pks = []
+        for obj in notifications:
+            if obj.notif_type in NotificationType.related_by_structure_id():
+                related_ids = [obj.ref_structure_id]
+            elif obj.notif_type == NotificationType.STRUCTURE_REINFORCEMENT_CHANGED:
+                related_ids = reinforcement_structure_ids[obj.pk]
+            elif obj.notif_type in NotificationType.related_by_planet():
+                related_ids = structure_ids_by_planet[
+                    (obj.ref_planet_id, obj.ref_type_id)
+                ]
+            elif obj.notif_type in NotificationType.related_by_moon():
+                related_ids = structure_ids_by_moon[(obj.ref_moon_id, obj.ref_type_id)]
+            else:
+                related_ids = []
+            related_ids = {
+                structure_id
+                for structure_id in related_ids
+                if structure_id in existing_structure_ids
+            }
+            if related_ids:
+                relations += [
+                    self.model.structures.through(
+                        notification_id=obj.pk, structure_id=structure_id
+                    )
+                    for structure_id in related_ids
+                ]
+            else:
+                unmatched_pks.append(obj.pk)
+
+        with transaction.atomic():
+            self.model.structures.through.objects.bulk_create(
+                relations, batch_size=500, ignore_conflicts=True
+            )
+            self.model.objects.filter(pk__in=unmatched_pks).update(
+                structures_checked_at=now()
+            )
+
+        return len(notifications) - len(unmatched_pks), len(notifications)
 
 
 class NotificationManagerBase(NotificationBaseManagerBase):
@@ -299,6 +400,9 @@ class StructureQuerySet(models.QuerySet):
 
 
 class StructureManagerBase(models.Manager):
+    # fields used for routing notifications to webhooks of structures
+    _WEBHOOK_ROUTES_FIELDS = {"owner", "eve_moon", "eve_planet", "eve_type"}
+
     def get_or_create_esi(self, *, id: int, token: Token) -> Tuple[Any, bool]:
         """get or create a structure with data from ESI if needed.
 
@@ -353,65 +457,275 @@ class StructureManagerBase(models.Manager):
 
     def update_or_create_from_dict(self, structure: dict, owner) -> Tuple[Any, bool]:
         """update or create structure from given dict"""
+        results = self.update_or_create_from_dicts([structure], owner)
+        if not results:
+            raise OSError(
+                f"Failed to resolve eve objects for structure "
+                f"with ID {structure['structure_id']}"
+            )
+        return results[0]
 
-        eve_type, _ = EveType.objects.get_or_create_esi(id=structure["type_id"])
-        eve_solar_system, _ = EveSolarSystem.objects.get_or_create_esi(
-            id=structure["system_id"]
-        )
-        position_x, position_y, position_z = self._extract_position(structure)
-        eve_planet = self._extract_eve_planet(structure)
-        eve_moon = self._extract_eve_moon(structure)
+    def update_or_create_from_dicts(
+        self, structures: Iterable[dict], owner
+    ) -> List[Tuple[Any, bool]]:
+        """Update or create structures of an owner from given dicts in bulk.
 
-        try:
-            old_obj = self.get(id=structure["structure_id"])
-        except self.model.DoesNotExist:
-            old_obj = None
+        Only fields which have changed are written to the database.
+        Structures with eve objects which can not be resolved are skipped.
 
-        obj, created = self.update_or_create(
-            id=structure["structure_id"],
-            defaults={
-                "owner": owner,
-                "eve_type": eve_type,
-                "name": structure.get("name", ""),
-                "eve_solar_system": eve_solar_system,
-                "eve_planet": eve_planet,
-                "eve_moon": eve_moon,
-                "position_x": position_x,
-                "position_y": position_y,
-                "position_z": position_z,
-                "fuel_expires_at": structure.get("fuel_expires"),
-                "next_reinforce_hour": structure.get("next_reinforce_hour"),
-                "next_reinforce_apply": structure.get("next_reinforce_apply"),
-                "reinforce_hour": structure.get("reinforce_hour"),
-                "state": self.model.State.from_esi_name(structure.get("state", "")),
-                "state_timer_start": structure.get("state_timer_start"),
-                "state_timer_end": structure.get("state_timer_end"),
-                "unanchors_at": structure.get("unanchors_at"),
-                "last_updated_at": now(),
-            },
-        )
+        Returns list of object, created in the same order as the given dicts.
+        """
+        structures = list(structures)
+        if not structures:
+            return []
+
+        eve_objects = self._resolve_eve_objects(structures)
+        structures = [
+            structure
+            for structure in structures
+            if self._has_eve_objects(structure, eve_objects)
+        ]
+        if not structures:
+            return []
+
+        structure_ids = [structure["structure_id"] for structure in structures]
+        old_objs = self.select_related("eve_type__eve_group").in_bulk(structure_ids)
+        updated_at = now()
+        results = []
+        new_objs = []
+        changed_objs = []
+        changed_fields = {"last_updated_at"}
+        fuel_changes = []
+        routes_owner_ids = set()
+        for structure in structures:
+            values = self._structure_values_from_dict(
+                structure, owner, eve_objects, updated_at
+            )
+            old_obj = old_objs.get(structure["structure_id"])
+            if not old_obj:
+                obj = self.model(id=structure["structure_id"], **values)
+                new_objs.append(obj)
+                results.append((obj, True))
+                continue
+
+            if old_obj.is_upwell_structure and not structure.get("moon_id"):
+                # moons of refineries are only known from notifications
+                del values["eve_moon"]
+            obj = copy(old_obj)
+            obj_changed_fields = self._update_fields_from_values(obj, values)
+            if obj_changed_fields & self._WEBHOOK_ROUTES_FIELDS:
+                routes_owner_ids.add(old_obj.owner_id)
+            changed_fields |= obj_changed_fields
+            changed_objs.append(obj)
+            results.append((obj, False))
+            if obj.fuel_expires_at != old_obj.fuel_expires_at:
+                fuel_changes.append((obj, old_obj))
+
+        with transaction.atomic():
+            if new_objs:
+                self.bulk_create(new_objs, batch_size=500)
+            if changed_objs:
+                self.bulk_update(
+                    changed_objs, fields=sorted(changed_fields), batch_size=500
+                )
+            self._update_tags_for_structures(
+                objs=[obj for obj, _ in results], new_objs=new_objs, owner=owner
+            )
 
-        if old_obj:
+        if new_objs or routes_owner_ids:
+            for owner_id in routes_owner_ids | {owner.pk}:
+                invalidate_webhook_routes(owner_id=owner_id)
+
+        for obj, old_obj in fuel_changes:
             obj.handle_fuel_notifications(old_obj)
 
-        # Make sure we have dogmas loaded for this type for fittings
-        EveType.objects.get_or_create_esi(
-            id=structure["type_id"], enabled_sections=[EveType.Section.DOGMAS]
+        if new_objs:
+            owner.invalidate_assets_etag()
+
+        self._update_services_for_structures(
+            {obj.id: structure for structure, (obj, _) in zip(structures, results)}
         )
+        return results
 
-        self._save_related_structure_services(structure, obj)
+    def _resolve_eve_objects(self, structures: List[dict]) -> Dict[str, dict]:
+        """Resolve all eveuniverse objects referenced by given structures
+        and return them as lookup tables by model.
+        """
+        return {
+            # Make sure we have dogmas loaded for types for fittings
+            "eve_types": self._bulk_get_or_create_esi(
+                EveType,
+                {structure["type_id"] for structure in structures},
+                EveType.objects.select_related("eve_group").filter(
+                    enabled_sections=EveType.enabled_sections.dogmas
+                ),
+                enabled_sections=[EveType.Section.DOGMAS],
+            ),
+            "eve_solar_systems": self._bulk_get_or_create_esi(
+                EveSolarSystem,
+                {structure["system_id"] for structure in structures},
+                EveSolarSystem.objects.select_related("eve_constellation"),
+            ),
+            "eve_planets": self._bulk_get_or_create_esi(
+                EvePlanet, {structure.get("planet_id") for structure in structures}
+            ),
+            "eve_moons": self._bulk_get_or_create_esi(
+                EveMoon, {structure.get("moon_id") for structure in structures}
+            ),
+        }
 
-        return obj, created
+    @staticmethod
+    def _has_eve_objects(structure: dict, eve_objects: dict) -> bool:
+        """Return True if all eve objects of a structure have been resolved."""
+        for key, lookup in [
+            ("type_id", "eve_types"),
+            ("system_id", "eve_solar_systems"),
+            ("planet_id", "eve_planets"),
+            ("moon_id", "eve_moons"),
+        ]:
+            obj_id = structure.get(key)
+            if obj_id is not None and int(obj_id) not in eve_objects[lookup]:
+                logger.warning(
+                    "Skipping structure with ID %s: Failed to resolve %s %s",
+                    structure["structure_id"],
+                    key,
+                    obj_id,
+                )
+                return False
+        return True
+
+    @staticmethod
+    def _bulk_get_or_create_esi(
+        model, ids: Set[Optional[int]], queryset=None, **kwargs
+    ) -> dict:
+        """Return eveuniverse objects for given IDs mapped by ID.
+
+        Existing objects are loaded with one query
+        and only missing objects are fetched from ESI.
+        Objects which fail to load are left out.
+        """
+        ids = {int(obj_id) for obj_id in ids if obj_id is not None}
+        if not ids:
+            return {}
+        if queryset is None:
+            queryset = model.objects.all()
+        objs = queryset.in_bulk(ids)
+        for obj_id in ids - set(objs.keys()):
+            try:
+                objs[obj_id], _ = model.objects.get_or_create_esi(id=obj_id, **kwargs)
+            except OSError:
+                logger.warning(
+                    "Failed to load %s with ID %s",
+                    model.__name__,
+                    obj_id,
+                    exc_info=True,
+                )
+        return objs
 
-    def _extract_eve_moon(self, structure):
-        if moon_id := structure.get("moon_id"):
-            return EveMoon.objects.get_or_create_esi(id=moon_id)[0]
-        return None
+    def _structure_values_from_dict(
+        self, structure: dict, owner, eve_objects: dict, updated_at: dt.datetime
+    ) -> dict:
+        """Return field values for a structure from given dict."""
+        from .models import StructureService
 
-    def _extract_eve_planet(self, structure):
-        if planet_id := structure.get("planet_id"):
-            return EvePlanet.objects.get_or_create_esi(id=planet_id)[0]
-        return None
+        position_x, position_y, position_z = self._extract_position(structure)
+        values = {
+            "owner": owner,
+            "eve_type": eve_objects["eve_types"][structure["type_id"]],
+            "name": structure.get("name", ""),
+            "eve_solar_system": eve_objects["eve_solar_systems"][
+                structure["system_id"]
+            ],
+            "eve_planet": eve_objects["eve_planets"].get(structure.get("planet_id")),
+            "eve_moon": eve_objects["eve_moons"].get(structure.get("moon_id")),
+            "position_x": position_x,
+            "position_y": position_y,
+            "position_z": position_z,
+            "fuel_expires_at": structure.get("fuel_expires"),
+            "next_reinforce_hour": structure.get("next_reinforce_hour"),
+            "next_reinforce_apply": structure.get("next_reinforce_apply"),
+            "reinforce_hour": structure.get("reinforce_hour"),
+            "state": self.model.State.from_esi_name(structure.get("state", "")),
+            "state_timer_start": structure.get("state_timer_start"),
+            "state_timer_end": structure.get("state_timer_end"),
+            "unanchors_at": structure.get("unanchors_at"),
+            "last_updated_at": updated_at,
+        }
+        if any(
+            StructureService.State.from_esi_name(service["state"])
+            == StructureService.State.ONLINE
+            for service in structure.get("services") or []
+        ):
+            values["last_online_at"] = updated_at
+        return values
+
+    @staticmethod
+    def _update_fields_from_values(obj: models.Model, values: dict) -> Set[str]:
+        """Update fields of an object from given values.
+
+        Related fields are compared by their IDs to avoid fetching related objects.
+
+        Returns names of changed fields.
+        """
+        changed_fields = set()
+        for field_name, value in values.items():
+            field = obj._meta.get_field(field_name)
+            if field.is_relation:
+                old_value = getattr(obj, field.attname)
+                new_value = value.pk if value else None
+            else:
+                old_value = getattr(obj, field_name)
+                new_value = value
+            if old_value != new_value:
+                changed_fields.add(field_name)
+            setattr(obj, field_name, value)
+        return changed_fields
+
+    def _update_tags_for_structures(self, objs: list, new_objs: list, owner):
+        """Add default tags to new structures
+        and make sure all structures have their generated tags.
+        """
+        from .models import StructureTag
+
+        new_ids = {obj.id for obj in new_objs}
+        default_tag_ids = (
+            set(
+                StructureTag.objects.filter(is_default=True).values_list(
+                    "id", flat=True
+                )
+            )
+            if new_ids
+            else set()
+        )
+        generated_tag_ids = {}
+        sov_tag = None
+        Through = self.model.tags.through
+        tag_relations = []
+        for obj in objs:
+            solar_system = obj.eve_solar_system
+            if solar_system.id not in generated_tag_ids:
+                tag_ids = set()
+                space_type_tag, _ = StructureTag.objects.get_or_create_for_space_type(
+                    solar_system
+                )
+                if space_type_tag:
+                    tag_ids.add(space_type_tag.id)
+                if owner.has_sov(solar_system):
+                    if not sov_tag:
+                        sov_tag, _ = StructureTag.objects.get_or_create_for_sov()
+                    tag_ids.add(sov_tag.id)
+                generated_tag_ids[solar_system.id] = tag_ids
+
+            tag_ids = generated_tag_ids[solar_system.id]
+            if obj.id in new_ids:
+                tag_ids = tag_ids | default_tag_ids
+            tag_relations += [
+                Through(structure_id=obj.id, structuretag_id=tag_id)
+                for tag_id in tag_ids
+            ]
+        Through.objects.bulk_create(
+            tag_relations, batch_size=500, ignore_conflicts=True
+        )
 
     def _extract_position(self, structure):
         if position := structure.get("position"):
@@ -419,23 +733,47 @@ class StructureManagerBase(models.Manager):
         return None, None, None
 
     @staticmethod
-    def _save_related_structure_services(structure, obj):
+    def _update_services_for_structures(structures: Dict[int, dict]):
+        """Update services for given structures from their dicts by structure ID.
+
+        Only services which have changed are written to the database.
+        """
         from .models import StructureService
 
-        StructureService.objects.filter(structure=obj).delete()
-        if "services" in structure and structure["services"]:
-            for service in structure["services"]:
-                service_state = StructureService.State.from_esi_name(service["state"])
-                args = {
-                    "structure": obj,
-                    "name": service["name"],
-                    "state": service_state,
-                }
-                StructureService.objects.create(**args)
+        current_services = {
+            (service.structure_id, service.name): service
+            for service in StructureService.objects.filter(
+                structure_id__in=structures.keys()
+            )
+        }
+        new_services = []
+        changed_services = []
+        for structure_id, structure in structures.items():
+            for service in structure.get("services") or []:
+                state = StructureService.State.from_esi_name(service["state"])
+                key = (structure_id, service["name"])
+                current_service = current_services.pop(key, None)
+                if not current_service:
+                    new_services.append(
+                        StructureService(
+                            structure_id=structure_id, name=service["name"], state=state
+                        )
+                    )
+                elif current_service.state != state:
+                    current_service.state = state
+                    changed_services.append(current_service)
 
-        if obj.services.filter(state=StructureService.State.ONLINE).exists():
-            obj.last_online_at = now()
-            obj.save()
+        with transaction.atomic():
+            if current_services:
+                StructureService.objects.filter(
+                    pk__in=[service.pk for service in current_services.values()]
+                ).delete()
+            if changed_services:
+                StructureService.objects.bulk_update(
+                    changed_services, fields=["state"], batch_size=500
+                )
+            if new_services:
+                StructureService.objects.bulk_create(new_services, batch_size=500)
 
 
 StructureManager = StructureManagerBase.from_queryset(StructureQuerySet)
@@ -508,7 +846,9 @@ class StructureTagManager(models.Manager):
 class WebhookManager(WebhookBaseManager):
     def enabled_notification_types(self) -> Set[str]:
         """Set of all currently enabled notification types."""
-        notif_types_list = list(
-            self.filter(is_active=True).values_list("notification_types", flat=True)
+        notif_types = (
+            self.filter(is_active=True, subscriptions__isnull=False)
+            .values_list("subscriptions__notif_type", flat=True)
+            .distinct()
         )
-        return set(itertools.chain(*notif_types_list))
+        return set(notif_types)
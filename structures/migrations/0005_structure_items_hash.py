@@ -0,0 +1,24 @@
+# Generated by Django 4.0.10 on 2026-10-16 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("structures", "0004_improve_localization"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="structure",
+            name="items_hash",
+            field=models.CharField(
+                default=None,
+                editable=False,
+                help_text="Hash over the current items of this structure",
+                max_length=64,
+                null=True,
+                verbose_name="items hash",
+            ),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 4.0.10 on 2026-10-16 20:32
+
+import datetime as dt
+import math
+
+import yaml
+
+from django.db import migrations, models
+
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
+BATCH_SIZE = 1000
+
+JSON_TAG_INT_KEYS = "__int_keys__"
+JSON_TAG_DATE = "__date__"
+JSON_TAG_DATETIME = "__datetime__"
+
+
+def yaml_data_to_json(data):
+    """Frozen copy of structures.helpers.yaml_data_to_json."""
+    if data is None or isinstance(data, (str, bool, int)):
+        return data
+
+    if isinstance(data, float):
+        if not math.isfinite(data):
+            raise TypeError(f"Can not convert float: {data}")
+        return data
+
+    if isinstance(data, list):
+        return [yaml_data_to_json(obj) for obj in data]
+
+    if isinstance(data, dict):
+        if all(isinstance(key, str) for key in data.keys()):
+            return {key: yaml_data_to_json(value) for key, value in data.items()}
+
+        if all(
+            isinstance(key, int) and not isinstance(key, bool) for key in data.keys()
+        ):
+            return {
+                JSON_TAG_INT_KEYS: {
+                    str(key): yaml_data_to_json(value) for key, value in data.items()
+                }
+            }
+
+        raise TypeError(f"Can not convert dict keys: {list(data.keys())}")
+
+    if isinstance(data, dt.datetime):
+        return {JSON_TAG_DATETIME: data.isoformat()}
+
+    if isinstance(data, dt.date):
+        return {JSON_TAG_DATE: data.isoformat()}
+
+    raise TypeError(f"Can not convert type: {type(data)}")
+
+
+def _parse_text(text):
+    parsed_text = yaml.load(text, Loader=YamlSafeLoader) if text else {}
+    try:
+        return yaml_data_to_json(parsed_text)
+    except TypeError:
+        return None
+
+
+def forwards(apps, schema_editor):
+    Notification = apps.get_model("structures", "Notification")
+    notifications = Notification.objects.filter(text_parsed__isnull=True).only(
+        "id", "text"
+    )
+    batch = []
+    for notification in notifications.iterator(chunk_size=BATCH_SIZE):
+        try:
+            notification.text_parsed = _parse_text(notification.text)
+        except yaml.YAMLError:
+            continue
+        batch.append(notification)
+        if len(batch) >= BATCH_SIZE:
+            Notification.objects.bulk_update(batch, fields=["text_parsed"])
+            batch = []
+    if batch:
+        Notification.objects.bulk_update(batch, fields=["text_parsed"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("structures", "0005_structure_items_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="text_parsed",
+            field=models.JSONField(
+                default=None,
+                editable=False,
+                help_text="Notification details parsed from YAML. Empty when the details can not be stored as JSON",
+                null=True,
+                verbose_name="text parsed",
+            ),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,193 @@
+# Generated by Django 4.0.10 on 2026-10-16 20:42
+
+import yaml
+
+from django.db import migrations, models
+
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
+BATCH_SIZE = 1000
+
+REFERENCE_KEYS = {
+    "ref_moon_id": ("moonID",),
+    "ref_planet_id": ("planetID",),
+    "ref_solar_system_id": ("solarSystemID", "solarsystemID"),
+    "ref_structure_id": ("structureID",),
+    "ref_type_id": ("typeID", "structureTypeID"),
+}
+
+
+def _update_references(obj, data):
+    if not isinstance(data, dict):
+        data = {}
+    for field, keys in REFERENCE_KEYS.items():
+        value = None
+        for key in keys:
+            item = data.get(key)
+            if isinstance(item, int) and not isinstance(item, bool) and item > 0:
+                value = item
+                break
+        setattr(obj, field, value)
+
+
+def _notification_data(notification):
+    if notification.text_parsed is not None:
+        return notification.text_parsed
+    if not notification.text:
+        return {}
+    try:
+        return yaml.load(notification.text, Loader=YamlSafeLoader)
+    except yaml.YAMLError:
+        return {}
+
+
+def _backfill(model, fields, get_data):
+    batch = []
+    for obj in model.objects.only("id", *fields).iterator(chunk_size=BATCH_SIZE):
+        _update_references(obj, get_data(obj))
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_update(batch, fields=list(REFERENCE_KEYS.keys()))
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, fields=list(REFERENCE_KEYS.keys()))
+
+
+def forwards(apps, schema_editor):
+    Notification = apps.get_model("structures", "Notification")
+    _backfill(Notification, ["text", "text_parsed"], _notification_data)
+    GeneratedNotification = apps.get_model("structures", "GeneratedNotification")
+    _backfill(GeneratedNotification, ["details"], lambda obj: obj.details)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("structures", "0006_notification_text_parsed"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="generatednotification",
+            name="ref_moon_id",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the moon referenced in this notification (if any)",
+                null=True,
+                verbose_name="moon ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="generatednotification",
+            name="ref_planet_id",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the planet referenced in this notification (if any)",
+                null=True,
+                verbose_name="planet ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="generatednotification",
+            name="ref_solar_system_id",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the solar system referenced in this notification (if any)",
+                null=True,
+                verbose_name="solar system ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="generatednotification",
+            name="ref_structure_id",
+            field=models.PositiveBigIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the structure referenced in this notification (if any)",
+                null=True,
+                verbose_name="structure ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="generatednotification",
+            name="ref_type_id",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the type referenced in this notification (if any)",
+                null=True,
+                verbose_name="type ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="ref_moon_id",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the moon referenced in this notification (if any)",
+                null=True,
+                verbose_name="moon ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="ref_planet_id",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the planet referenced in this notification (if any)",
+                null=True,
+                verbose_name="planet ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="ref_solar_system_id",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the solar system referenced in this notification (if any)",
+                null=True,
+                verbose_name="solar system ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="ref_structure_id",
+            field=models.PositiveBigIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the structure referenced in this notification (if any)",
+                null=True,
+                verbose_name="structure ID",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="ref_type_id",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=None,
+                editable=False,
+                help_text="ID of the type referenced in this notification (if any)",
+                null=True,
+                verbose_name="type ID",
+            ),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
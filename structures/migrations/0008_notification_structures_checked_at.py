@@ -0,0 +1,23 @@
+# Generated by Django 4.0.10 on 2026-10-16 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("structures", "0007_notification_references"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="structures_checked_at",
+            field=models.DateTimeField(
+                default=None,
+                editable=False,
+                help_text="When this notification was last checked for related structures without finding any",
+                null=True,
+                verbose_name="structures checked at",
+            ),
+        ),
+    ]
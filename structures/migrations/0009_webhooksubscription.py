@@ -0,0 +1,191 @@
+# Generated by Django 4.0.10 on 2026-10-16 21:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    Webhook = apps.get_model("structures", "Webhook")
+    WebhookSubscription = apps.get_model("structures", "WebhookSubscription")
+    objs = [
+        WebhookSubscription(webhook_id=webhook_id, notif_type=notif_type)
+        for webhook_id, notif_types in Webhook.objects.values_list(
+            "pk", "notification_types"
+        )
+        for notif_type in set(notif_types or [])
+    ]
+    WebhookSubscription.objects.bulk_create(objs, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("structures", "0008_notification_structures_checked_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookSubscription",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "notif_type",
+                    models.CharField(
+                        choices=[
+                            ("StructureAnchoring", "Upwell structure anchoring"),
+                            ("StructureOnline", "Upwell structure went online"),
+                            (
+                                "StructureServicesOffline",
+                                "Upwell structure services went offline",
+                            ),
+                            (
+                                "StructureWentHighPower",
+                                "Upwell structure went high power",
+                            ),
+                            (
+                                "StructureWentLowPower",
+                                "Upwell structure went low power",
+                            ),
+                            ("StructureUnanchoring", "Upwell structure unanchoring"),
+                            ("StructureFuelAlert", "Upwell structure fuel alert"),
+                            ("StructureRefueledExtra", "Upwell structure refueled"),
+                            (
+                                "StructureJumpFuelAlert",
+                                "Upwell structure jump fuel alert",
+                            ),
+                            (
+                                "StructureUnderAttack",
+                                "Upwell structure is under attack",
+                            ),
+                            ("StructureLostShields", "Upwell structure lost shields"),
+                            ("StructureLostArmor", "Upwell structure lost armor"),
+                            ("StructureDestroyed", "Upwell structure destroyed"),
+                            (
+                                "StructuresReinforcementChanged",
+                                "Upwell structure reinforcement time changed",
+                            ),
+                            (
+                                "OwnershipTransferred",
+                                "Upwell structure ownership transferred",
+                            ),
+                            ("OrbitalAttacked", "Customs office attacked"),
+                            ("OrbitalReinforced", "Customs office reinforced"),
+                            ("TowerAlertMsg", "Starbase attacked"),
+                            ("TowerResourceAlertMsg", "Starbase fuel alert"),
+                            ("TowerRefueledExtra", "Starbase refueled (BETA)"),
+                            ("TowerReinforcedExtra", "Starbase reinforced (BETA)"),
+                            (
+                                "MoonminingExtractionStarted",
+                                "Moon mining extraction started",
+                            ),
+                            ("MoonminingLaserFired", "Moonmining laser fired"),
+                            (
+                                "MoonminingExtractionCancelled",
+                                "Moon mining extraction cancelled",
+                            ),
+                            (
+                                "MoonminingExtractionFinished",
+                                "Moon mining extraction finished",
+                            ),
+                            (
+                                "MoonminingAutomaticFracture",
+                                "Moon mining automatic fracture triggered",
+                            ),
+                            (
+                                "SovStructureReinforced",
+                                "Sovereignty structure reinforced",
+                            ),
+                            (
+                                "SovStructureDestroyed",
+                                "Sovereignty structure destroyed",
+                            ),
+                            (
+                                "EntosisCaptureStarted",
+                                "Sovereignty entosis capture started",
+                            ),
+                            (
+                                "SovCommandNodeEventStarted",
+                                "Sovereignty command node event started",
+                            ),
+                            (
+                                "SovAllClaimAquiredMsg",
+                                "Sovereignty claim acknowledgment",
+                            ),
+                            ("SovAllClaimLostMsg", "Sovereignty lost"),
+                            (
+                                "AllAnchoringMsg",
+                                "Structure anchoring in alliance space",
+                            ),
+                            ("WarDeclared", "War declared"),
+                            ("AllyJoinedWarAggressorMsg", "War ally joined aggressor"),
+                            ("AllyJoinedWarAllyMsg", "War ally joined ally"),
+                            ("AllyJoinedWarDefenderMsg", "War ally joined defender"),
+                            ("WarAdopted", "War adopted"),
+                            ("WarInherited", "War inherited"),
+                            ("CorpWarSurrenderMsg", "War party surrendered"),
+                            ("WarRetractedByConcord", "War retracted by Concord"),
+                            (
+                                "CorpBecameWarEligible",
+                                "War corporation became eligible",
+                            ),
+                            (
+                                "CorpNoLongerWarEligible",
+                                "War corporation no longer eligible",
+                            ),
+                            ("WarSurrenderOfferMsg", "War surrender offered"),
+                            ("CorpAppNewMsg", "Character submitted application"),
+                            (
+                                "CorpAppInvitedMsg",
+                                "Character invited to join corporation",
+                            ),
+                            ("CorpAppRejectCustomMsg", "Corp application rejected"),
+                            ("CharAppWithdrawMsg", "Character withdrew application"),
+                            ("CharAppAcceptMsg", "Character joins corporation"),
+                            ("CharLeftCorpMsg", "Character leaves corporation"),
+                            ("BillOutOfMoneyMsg", "Bill out of money"),
+                            (
+                                "InfrastructureHubBillAboutToExpire",
+                                "I-HUB bill about to expire",
+                            ),
+                            (
+                                "IHubDestroyedByBillFailure",
+                                "I_HUB destroyed by bill failure",
+                            ),
+                        ],
+                        db_index=True,
+                        help_text="Type of notifications forwarded to this webhook",
+                        max_length=100,
+                        verbose_name="type",
+                    ),
+                ),
+                (
+                    "webhook",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="subscriptions",
+                        to="structures.webhook",
+                        verbose_name="webhook",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "webhook subscription",
+                "verbose_name_plural": "webhook subscriptions",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="webhooksubscription",
+            constraint=models.UniqueConstraint(
+                fields=("webhook", "notif_type"),
+                name="functional_pk_webhooksubscription",
+            ),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.10 on 2026-10-16 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("structures", "0009_webhooksubscription"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="owner",
+            name="moons_last_update_at",
+            field=models.DateTimeField(
+                default=None,
+                editable=False,
+                help_text="When moons of refineries were last updated from notifications",
+                null=True,
+                verbose_name="moons last update at",
+            ),
+        ),
+    ]
@@ -7,6 +7,7 @@ from .notifications import (
     JumpFuelAlertConfig,
     Notification,
     Webhook,
+    WebhookSubscription,
     get_default_notification_types,
 )
 from .owners import Owner, OwnerCharacter
@@ -37,5 +38,6 @@ __all__ = [
     "JumpFuelAlertConfig",
     "Notification",
     "Webhook",
+    "WebhookSubscription",
     "get_default_notification_types",
 ]
@@ -3,7 +3,7 @@
 # pylint: disable = duplicate-code
 
 import math
-from typing import Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import dhooks_lite
 import yaml
@@ -32,8 +32,11 @@ from structures.app_settings import (  # STRUCTURES_NOTIFICATION_DISABLE_ESI_FUE
     STRUCTURES_REPORT_NPC_ATTACKS,
 )
 from structures.constants import EveCategoryId, EveCorporationId, EveTypeId
+from structures.core.discord_roles import discord_role_id
+from structures.core.notification_objects import NotificationObjects
 from structures.core.notification_types import NotificationType
-from structures.helpers import is_absolute_url
+from structures.core.webhook_routes import WebhookRoutes, invalidate_webhook_routes
+from structures.helpers import is_absolute_url, json_to_yaml_data, yaml_data_to_json
 from structures.managers import (
     GeneratedNotificationManager,
     NotificationManager,
@@ -45,6 +48,11 @@ from .structures_1 import Structure
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 # Supported languages
 LANGUAGES = (
     ("en", _("English")),
@@ -55,6 +63,9 @@ LANGUAGES = (
     ("ko", _("Korean")),
 )
 
+# Marks the text of a notification as not loaded from the database
+_DEFERRED_TEXT = object()
+
 
 def get_default_notification_types():
     """DEPRECATED: generates a set of all existing notification types as default.
@@ -111,11 +122,73 @@ class Webhook(WebhookBase):
         verbose_name = _("webhook")
         verbose_name_plural = _("webhooks")
 
+    def save(self, *args, **kwargs) -> None:
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if not update_fields or "notification_types" in update_fields:
+            self.update_subscriptions()
+
     @staticmethod
     def text_bold(text) -> str:
         """Format the given text in bold."""
         return f"**{text}**" if text else ""
 
+    def update_subscriptions(self) -> None:
+        """Update subscriptions to match the selected notification types."""
+        notif_types = set(self.notification_types or [])
+        current_notif_types = set(
+            self.subscriptions.values_list("notif_type", flat=True)
+        )
+        obsolete_notif_types = current_notif_types - notif_types
+        if obsolete_notif_types:
+            self.subscriptions.filter(notif_type__in=obsolete_notif_types).delete()
+        new_notif_types = notif_types - current_notif_types
+        if new_notif_types:
+            WebhookSubscription.objects.bulk_create(
+                [
+                    WebhookSubscription(webhook=self, notif_type=notif_type)
+                    for notif_type in sorted(new_notif_types)
+                ],
+                ignore_conflicts=True,
+            )
+        if obsolete_notif_types or new_notif_types:
+            invalidate_webhook_routes()
+
+
+class WebhookSubscription(models.Model):
+    """A notification type a webhook is subscribed to.
+
+    Subscriptions mirror the selected notification types of their webhook
+    and allow looking up webhooks by notification type with a join.
+    """
+
+    webhook = models.ForeignKey(
+        Webhook,
+        on_delete=models.CASCADE,
+        related_name="subscriptions",
+        verbose_name=_("webhook"),
+    )
+    notif_type = models.CharField(
+        max_length=100,
+        choices=NotificationType.choices,
+        db_index=True,
+        verbose_name=_("type"),
+        help_text=_("Type of notifications forwarded to this webhook"),
+    )
+
+    class Meta:
+        verbose_name = _("webhook subscription")
+        verbose_name_plural = _("webhook subscriptions")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["webhook", "notif_type"],
+                name="functional_pk_webhooksubscription",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.webhook}-{self.notif_type}"
+
 
 # pylint: disable = too-many-public-methods
 class NotificationBase(models.Model):
@@ -150,6 +223,56 @@ class NotificationBase(models.Model):
         verbose_name=_("structures"),
         help_text=_("Structures this notification is about (if any)"),
     )
+    ref_moon_id = models.PositiveIntegerField(
+        null=True,
+        default=None,
+        db_index=True,
+        editable=False,
+        verbose_name=_("moon ID"),
+        help_text=_("ID of the moon referenced in this notification (if any)"),
+    )
+    ref_planet_id = models.PositiveIntegerField(
+        null=True,
+        default=None,
+        db_index=True,
+        editable=False,
+        verbose_name=_("planet ID"),
+        help_text=_("ID of the planet referenced in this notification (if any)"),
+    )
+    ref_solar_system_id = models.PositiveIntegerField(
+        null=True,
+        default=None,
+        db_index=True,
+        editable=False,
+        verbose_name=_("solar system ID"),
+        help_text=_("ID of the solar system referenced in this notification (if any)"),
+    )
+    ref_structure_id = models.PositiveBigIntegerField(
+        null=True,
+        default=None,
+        db_index=True,
+        editable=False,
+        verbose_name=_("structure ID"),
+        help_text=_("ID of the structure referenced in this notification (if any)"),
+    )
+    ref_type_id = models.PositiveIntegerField(
+        null=True,
+        default=None,
+        db_index=True,
+        editable=False,
+        verbose_name=_("type ID"),
+        help_text=_("ID of the type referenced in this notification (if any)"),
+    )
+
+    # Mapping of reference fields to the keys in the notification text
+    # they are extracted from, in order of precedence
+    REFERENCE_KEYS = {
+        "ref_moon_id": ("moonID",),
+        "ref_planet_id": ("planetID",),
+        "ref_solar_system_id": ("solarSystemID", "solarsystemID"),
+        "ref_structure_id": ("structureID",),
+        "ref_type_id": ("typeID", "structureTypeID"),
+    }
 
     class Meta:
         abstract = True
@@ -159,6 +282,13 @@ class NotificationBase(models.Model):
         self._ping_type_override = None
         self._color_override = None
         self._parsed_text = {}
+        self._objects = NotificationObjects()
+        self._group_pings = {}
+
+    def save(self, *args, **kwargs) -> None:
+        if not kwargs.get("update_fields"):
+            self.update_references()
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f"{self.notification_id}:{self.notif_type}"
@@ -220,48 +350,80 @@ class NotificationBase(models.Model):
         """Return parsed text of this notification."""
         return self._parsed_text
 
+    def update_references(self) -> None:
+        """Update the reference fields from the notification text."""
+        parsed_text = self.parsed_text()
+        if not isinstance(parsed_text, dict):
+            parsed_text = {}
+        for field, keys in self.REFERENCE_KEYS.items():
+            value = None
+            for key in keys:
+                obj = parsed_text.get(key)
+                if isinstance(obj, int) and not isinstance(obj, bool) and obj > 0:
+                    value = obj
+                    break
+            setattr(self, field, value)
+
+    def eve_object(self, model: type, obj_id: int):
+        """Return an Eve object of a model by ID.
+
+        Uses the objects prefetched for this notification if available.
+        """
+        return self._objects.get(model, obj_id)
+
     def eve_moon(self, key: str = "moonID") -> EveMoon:
         """Return it's moon extracted from the notification text.
         Will raise KeyError if not found.
         """
-        obj_id = self._parsed_text[key]
-        obj, _ = EveMoon.objects.get_or_create_esi(id=obj_id)
-        return obj
+        return self.eve_object(EveMoon, self.parsed_text()[key])
 
     def eve_planet(self, key: str = "planetID") -> EvePlanet:
         """Return it's moon extracted from the notification text.
         Will raise KeyError if not found.
         """
-        obj_id = self._parsed_text[key]
-        obj, _ = EvePlanet.objects.get_or_create_esi(id=obj_id)
-        return obj
+        return self.eve_object(EvePlanet, self.parsed_text()[key])
 
     def eve_solar_system(self, key: str = "solarSystemID") -> EveSolarSystem:
         """Return solar system extracted from the notification text.
         Will raise KeyError if not found.
         """
-        obj_id = self._parsed_text[key]
-        obj, _ = EveSolarSystem.objects.get_or_create_esi(id=obj_id)
-        return obj
+        return self.eve_object(EveSolarSystem, self.parsed_text()[key])
 
     def eve_structure_type(self, key: str = "structureTypeID") -> EveType:
         """Return structure type extracted from the notification text.
         Will raise KeyError if not found.
         """
-        obj_id = self._parsed_text[key]
-        obj, _ = EveType.objects.get_or_create_esi(id=obj_id)
-        return obj
+        return self.eve_object(EveType, self.parsed_text()[key])
+
+    def referenced_structure(self, structure_id: int) -> Optional[Structure]:
+        """Return a structure referenced in the notification text
+        or None if it does not exist.
+        """
+        return self._objects.structure(structure_id)
 
     def send_to_configured_webhooks(
         self,
         ping_type_override: Optional[Union[Webhook.PingType, str]] = None,
         use_color_override: bool = False,
         color_override: Optional[int] = None,
+        routes: Optional[WebhookRoutes] = None,
+        objects: Optional[NotificationObjects] = None,
+        mark_as_sent: bool = True,
+        group_pings: Optional[Dict[Tuple[int, int], str]] = None,
     ) -> Optional[bool]:
         """Send this notification to all active webhooks which have this
         notification type configured
         and apply filter for NPC attacks and alliance level if needed.
 
+        Routes can be provided to avoid looking them up for each notification.
+        Objects prefetched for a batch of notifications can be provided
+        to avoid fetching them one by one when rendering.
+        When mark_as_sent is False, is_sent is only updated on this object
+        and it is up to the caller to store it.
+        Group pings can be provided to share them between notifications,
+        so they are only computed once for each pair of owner and webhook.
+        The embed is rendered only once for all webhooks with the same language.
+
         Returns True, if notifications has been successfully send to webhooks
         Returns None, if owner has no fitting webhook
         Returns False, if sending to any webhooks failed
@@ -276,8 +438,10 @@ class NotificationBase(models.Model):
             )
             return None
 
-        webhooks_qs = self.relevant_webhooks()
-        if not webhooks_qs.exists():
+        if routes is None:
+            routes = WebhookRoutes.for_owner(self.owner)
+        webhooks = routes.webhooks(self)
+        if not webhooks:
             logger.warning("%s: No relevant webhook found", self)
             return None
 
@@ -285,9 +449,16 @@ class NotificationBase(models.Model):
             self._ping_type_override = Webhook.PingType(ping_type_override)
         if use_color_override:
             self._color_override = color_override
+        if objects is not None:
+            self._objects = objects
+        if group_pings is not None:
+            self._group_pings = group_pings
+        rendered_embeds = {}
         success = True
-        for webhook in webhooks_qs:
-            success &= self.send_to_webhook(webhook)
+        for webhook in webhooks:
+            success &= self.send_to_webhook(
+                webhook, rendered_embeds=rendered_embeds, mark_as_sent=mark_as_sent
+            )
         return success
 
     def filter_for_npc_attacks(self) -> bool:
@@ -304,22 +475,8 @@ class NotificationBase(models.Model):
 
     def relevant_webhooks(self) -> models.QuerySet:
         """Determine relevant webhooks matching this notification type."""
-        if not self.is_structure_related:
-            structures_qs = Structure.objects.none()
-        else:
-            structures_qs = self.calc_related_structures()
-        if (
-            structures_qs.exists()
-            and structures_qs.filter(webhooks__isnull=False).count() == 1
-        ):
-            webhooks_qs = structures_qs.first().webhooks.filter(
-                notification_types__contains=self.notif_type, is_active=True
-            )
-        else:
-            webhooks_qs = self.owner.webhooks.filter(
-                notification_types__contains=self.notif_type, is_active=True
-            )
-        return webhooks_qs
+        webhook_ids = WebhookRoutes.for_owner(self.owner).webhook_ids(self)
+        return Webhook.objects.filter(pk__in=webhook_ids)
 
     def calc_related_structures(self) -> models.QuerySet[Structure]:
         """Identify structures this notification is related to.
@@ -327,71 +484,33 @@ class NotificationBase(models.Model):
         Returns:
         - structures if any found or empty list if there are no related structures
         """
-        if not self._parsed_text:
-            return Structure.objects.none()
-
-        if self.notif_type in {
-            NotificationType.STRUCTURE_ONLINE,
-            NotificationType.STRUCTURE_FUEL_ALERT,
-            NotificationType.STRUCTURE_JUMP_FUEL_ALERT,
-            NotificationType.STRUCTURE_REFUELED_EXTRA,
-            NotificationType.STRUCTURE_SERVICES_OFFLINE,
-            NotificationType.STRUCTURE_WENT_LOW_POWER,
-            NotificationType.STRUCTURE_WENT_HIGH_POWER,
-            NotificationType.STRUCTURE_UNANCHORING,
-            NotificationType.STRUCTURE_UNDER_ATTACK,
-            NotificationType.STRUCTURE_LOST_SHIELD,
-            NotificationType.STRUCTURE_LOST_ARMOR,
-            NotificationType.STRUCTURE_DESTROYED,
-            NotificationType.OWNERSHIP_TRANSFERRED,
-            NotificationType.STRUCTURE_ANCHORING,
-            NotificationType.MOONMINING_EXTRACTION_STARTED,
-            NotificationType.MOONMINING_EXTRACTION_FINISHED,
-            NotificationType.MOONMINING_AUTOMATIC_FRACTURE,
-            NotificationType.MOONMINING_EXTRACTION_CANCELLED,
-            NotificationType.MOONMINING_LASER_FIRED,
-        }:
-            try:
-                structure_id = self._parsed_text["structureID"]
-            except KeyError:
-                qs = Structure.objects.none()
+        if self.notif_type in NotificationType.related_by_structure_id():
+            if self.ref_structure_id:
+                qs = Structure.objects.filter(id=self.ref_structure_id)
             else:
-                qs = Structure.objects.filter(id=structure_id)
+                qs = Structure.objects.none()
 
         elif self.notif_type == NotificationType.STRUCTURE_REINFORCEMENT_CHANGED:
-            try:
-                structure_ids = [
-                    structure_info[0]
-                    for structure_info in self._parsed_text["allStructureInfo"]
-                ]
-            except KeyError:
-                qs = Structure.objects.none()
-            else:
+            structure_ids = self.reinforcement_structure_ids()
+            if structure_ids:
                 qs = Structure.objects.filter(id__in=structure_ids)
+            else:
+                qs = Structure.objects.none()
 
-        elif self.notif_type in {
-            NotificationType.ORBITAL_ATTACKED,
-            NotificationType.ORBITAL_REINFORCED,
-        }:
-            try:
+        elif self.notif_type in NotificationType.related_by_planet():
+            if self.ref_planet_id and self.ref_type_id:
                 qs = Structure.objects.filter(
-                    eve_planet_id=self._parsed_text["planetID"],
-                    eve_type_id=self._parsed_text["typeID"],
+                    eve_planet_id=self.ref_planet_id, eve_type_id=self.ref_type_id
                 )
-            except KeyError:
+            else:
                 qs = Structure.objects.none()
 
-        elif self.notif_type in {
-            NotificationType.TOWER_ALERT_MSG,
-            NotificationType.TOWER_RESOURCE_ALERT_MSG,
-            NotificationType.TOWER_REFUELED_EXTRA,
-        }:
-            try:
+        elif self.notif_type in NotificationType.related_by_moon():
+            if self.ref_moon_id and self.ref_type_id:
                 qs = Structure.objects.filter(
-                    eve_moon_id=self._parsed_text["moonID"],
-                    eve_type_id=self._parsed_text["typeID"],
+                    eve_moon_id=self.ref_moon_id, eve_type_id=self.ref_type_id
                 )
-            except KeyError:
+            else:
                 qs = Structure.objects.none()
 
         else:
@@ -399,29 +518,62 @@ class NotificationBase(models.Model):
 
         return qs
 
-    def send_to_webhook(self, webhook: Webhook) -> bool:
+    def reinforcement_structure_ids(self) -> List[int]:
+        """Return IDs of all structures listed in a reinforcement change."""
+        try:
+            return [
+                structure_info[0]
+                for structure_info in self.parsed_text()["allStructureInfo"]
+            ]
+        except (KeyError, TypeError, IndexError):
+            return []
+
+    def send_to_webhook(
+        self,
+        webhook: Webhook,
+        rendered_embeds: Optional[
+            Dict[Optional[str], Optional[Tuple[dict, Optional[Webhook.PingType]]]]
+        ] = None,
+        mark_as_sent: bool = True,
+    ) -> bool:
         """Send this notification to a webhook.
 
+        Embeds are rendered and serialized once per language
+        and kept in rendered_embeds, so they can be reused for other webhooks.
+
+        When mark_as_sent is False, is_sent is only updated on this object
+        and it is up to the caller to store it.
+
         Return True if successful, else False.
         """
         logger.info("%s: Trying to sent to webhook: %s", self, webhook)
-        try:
-            embed, ping_type = self._generate_embed(webhook.language_code)
-        except (OSError, NotImplementedError) as ex:
-            logger.warning("%s: Failed to generate embed: %s", self, ex, exc_info=True)
+        if rendered_embeds is None:
+            rendered_embeds = {}
+        language_code = webhook.language_code
+        if language_code not in rendered_embeds:
+            rendered_embeds[language_code] = self._render_embed(language_code)
+        rendered_embed = rendered_embeds[language_code]
+        if not rendered_embed:
             return False
 
+        embed, ping_type = rendered_embed
         content = self._create_content_with_pings(webhook, ping_type)
         content += self._add_discord_group_pings(webhook)
 
         username, avatar_url = self._gen_avatar()
         new_queue_size = webhook.send_message(
-            content=content, embeds=[embed], username=username, avatar_url=avatar_url
+            content=content,
+            embeds=[embed],
+            username=username,
+            avatar_url=avatar_url,
+            high_priority=self.notif_type
+            in NotificationType.relevant_for_high_priority(),
         )
         success = new_queue_size > 0
         if success and not self.is_temporary:
             self.is_sent = True
-            self.save()
+            if mark_as_sent:
+                self.save(update_fields=["is_sent"])
         return success
 
     def _create_content_with_pings(self, webhook, ping_type):
@@ -435,26 +587,47 @@ class NotificationBase(models.Model):
         return ""
 
     def _add_discord_group_pings(self, webhook) -> str:
-        if not webhook.ping_groups.exists() and not self.owner.ping_groups.exists():
+        key = (self.owner_id, webhook.pk)
+        if key not in self._group_pings:
+            self._group_pings[key] = self._generate_discord_group_pings(webhook)
+        return self._group_pings[key]
+
+    def _generate_discord_group_pings(self, webhook) -> str:
+        groups = set(self.owner.ping_groups.all()) | set(webhook.ping_groups.all())
+        if not groups:
             return ""
 
         if "discord" not in app_labels():
             return ""
 
         DiscordUser = self._import_discord()
-        groups = set(self.owner.ping_groups.all()) | set(webhook.ping_groups.all())
         content = ""
         for group in groups:
             try:
-                role = DiscordUser.objects.group_to_role(group)
+                role_id = discord_role_id(DiscordUser, group)
             except HTTPError:
                 logger.warning("Failed to get Discord roles", exc_info=True)
             else:
-                if role:
-                    content += f" <@&{role['id']}>"
+                if role_id:
+                    content += f" <@&{role_id}>"
 
         return content
 
+    def _render_embed(
+        self, language_code: Optional[str]
+    ) -> Optional[Tuple[dict, Optional[Webhook.PingType]]]:
+        """Render the Discord embed for this notification in a language.
+
+        Returns the serialized embed and the ping type
+        or None if rendering failed.
+        """
+        try:
+            embed, ping_type = self._generate_embed(language_code)
+        except (OSError, NotImplementedError) as ex:
+            logger.warning("%s: Failed to generate embed: %s", self, ex, exc_info=True)
+            return None
+        return embed.asdict(), ping_type
+
     def _generate_embed(
         self, language_code: Optional[str]
     ) -> Tuple[dhooks_lite.Embed, Optional[Webhook.PingType]]:
@@ -550,6 +723,26 @@ class Notification(NotificationBase):
         verbose_name=_("text"),
         help_text=_("Notification details in YAML"),
     )
+    text_parsed = models.JSONField(
+        null=True,
+        default=None,
+        editable=False,
+        verbose_name=_("text parsed"),
+        help_text=_(
+            "Notification details parsed from YAML. "
+            "Empty when the details can not be stored as JSON"
+        ),
+    )
+    structures_checked_at = models.DateTimeField(
+        null=True,
+        default=None,
+        editable=False,
+        verbose_name=_("structures checked at"),
+        help_text=_(
+            "When this notification was last checked for related structures "
+            "without finding any"
+        ),
+    )
     timestamp = models.DateTimeField(db_index=True, verbose_name=_("timestamp"))
 
     objects = NotificationManager()
@@ -561,11 +754,20 @@ class Notification(NotificationBase):
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self._parsed_text = yaml.safe_load(self.text) if self.text else {}
+        self._parsed_text = None
+        # text from which the parsed text was created, unknown when deferred
+        self._parsed_text_source = self.__dict__.get("text", _DEFERRED_TEXT)
 
     def save(self, *args, **kwargs) -> None:
         if self.is_temporary:
             raise ValueError("Temporary notifications can not be saved")
+        update_fields = kwargs.get("update_fields")
+        if not update_fields or "text" in update_fields:
+            self._reset_parsed_text_if_changed()
+            if self.text_parsed is None:
+                self.text_parsed = self.text_parsed_for_storage()
+            if update_fields:
+                kwargs["update_fields"] = set(update_fields) | {"text_parsed"}
         super().save(*args, **kwargs)
 
     @property
@@ -582,9 +784,42 @@ class Notification(NotificationBase):
     #     return {x[0] for x in NotificationType.choices}
 
     def parsed_text(self) -> dict:
-        """Returns the notifications's text as dict."""
+        """Returns the notifications's text as dict.
+
+        The text is only parsed on first access
+        and not at all when it has already been stored in parsed form.
+        """
+        self._reset_parsed_text_if_changed()
+        if self._parsed_text is None:
+            if self.text_parsed is not None:
+                self._parsed_text = json_to_yaml_data(self.text_parsed)
+            else:
+                self._parsed_text = self.parse_text(self.text)
         return self._parsed_text
 
+    def _reset_parsed_text_if_changed(self) -> None:
+        """Reset the parsed text when the text has changed since it was parsed."""
+        if self._parsed_text_source is _DEFERRED_TEXT:
+            return
+        if self.text != self._parsed_text_source:
+            self._parsed_text = None
+            self.text_parsed = None
+            self._parsed_text_source = self.text
+
+    def text_parsed_for_storage(self) -> Optional[dict]:
+        """Return the parsed text in a form which can be stored as JSON
+        or None if that is not possible.
+        """
+        try:
+            return yaml_data_to_json(self.parsed_text())
+        except TypeError:
+            return None
+
+    @staticmethod
+    def parse_text(text: Optional[str]) -> dict:
+        """Parse a notification text from YAML."""
+        return yaml.load(text, Loader=YamlSafeLoader) if text else {}
+
     def is_npc_attacking(self) -> bool:
         """Whether this notification is about a NPC attacking."""
         if self.notif_type in [
@@ -661,7 +896,9 @@ class Notification(NotificationBase):
         kwargs["notification_id"] = cls.TEMPORARY_NOTIFICATION_ID
         kwargs["owner"] = structure.owner
         kwargs["notif_type"] = notif_type
-        return cls(**kwargs)
+        obj = cls(**kwargs)
+        obj.update_references()
+        return obj
 
 
 class GeneratedNotification(NotificationBase):
@@ -835,10 +1072,10 @@ class FuelAlertConfig(BaseFuelAlertConfig):
             Webhook.objects.filter(is_active=True)
             .filter(Q(owners__isnull=False) | Q(structures__isnull=False))
             .filter(
-                Q(notification_types__contains=NotificationType.STRUCTURE_FUEL_ALERT)
-                | Q(
-                    notification_types__contains=NotificationType.TOWER_RESOURCE_ALERT_MSG
-                )
+                subscriptions__notif_type__in=[
+                    NotificationType.STRUCTURE_FUEL_ALERT,
+                    NotificationType.TOWER_RESOURCE_ALERT_MSG,
+                ]
             )
             .distinct()
         )
@@ -886,7 +1123,7 @@ class JumpFuelAlertConfig(BaseFuelAlertConfig):
         """Webhooks relevant for processing jump fuel notifications based on this config."""
         return Webhook.objects.filter(
             is_active=True,
-            notification_types__contains=NotificationType.STRUCTURE_JUMP_FUEL_ALERT,
+            subscriptions__notif_type=NotificationType.STRUCTURE_JUMP_FUEL_ALERT,
         ).filter(Q(owners__isnull=False) | Q(structures__isnull=False))
 
 
@@ -6,16 +6,19 @@ import datetime as dt
 import json
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from email.utils import format_datetime, parsedate_to_datetime
-from typing import Any, Iterable, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from bravado.exception import HTTPForbidden, HTTPNotFound
+from bravado.exception import HTTPError, HTTPForbidden, HTTPNotFound
 
 from django.contrib.auth.models import Group, User
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models, transaction
-from django.db.models import F
+from django.db.models import F, Q, Sum
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from esi.errors import TokenError
@@ -36,6 +39,7 @@ from structures.app_settings import (
     STRUCTURES_ADMIN_NOTIFICATIONS_ENABLED,
     STRUCTURES_DEVELOPER_MODE,
     STRUCTURES_ESI_DIRECTOR_ERROR_MAX_RETRIES,
+    STRUCTURES_ESI_MAX_WORKERS,
     STRUCTURES_FEATURE_CUSTOMS_OFFICES,
     STRUCTURES_FEATURE_STARBASES,
     STRUCTURES_HOURS_UNTIL_STALE_NOTIFICATION,
@@ -44,6 +48,10 @@ from structures.app_settings import (
     STRUCTURES_STRUCTURE_SYNC_GRACE_MINUTES,
 )
 from structures.constants import EveGroupId, EveTypeId
+from structures.core import starbases
+from structures.core.esi_etags import EsiEtagRequest
+from structures.core.notification_objects import NotificationObjects
+from structures.core.webhook_routes import WebhookRoutes
 from structures.managers import OwnerManager
 from structures.providers import esi
 
@@ -51,7 +59,9 @@ from .eveuniverse import EveSovereigntyMap
 from .notifications import (
     EveEntity,
     GeneratedNotification,
+    JumpFuelAlert,
     Notification,
+    NotificationBase,
     NotificationType,
     Webhook,
 )
@@ -182,6 +192,13 @@ class Owner(models.Model):
         verbose_name=_("is up"),
         help_text=_("Whether all services for this owner are currently up"),
     )
+    moons_last_update_at = models.DateTimeField(
+        null=True,
+        default=None,
+        editable=False,
+        verbose_name=_("moons last update at"),
+        help_text=_("When moons of refineries were last updated from notifications"),
+    )
     notifications_last_update_at = models.DateTimeField(
         null=True,
         default=None,
@@ -539,22 +556,45 @@ class Owner(models.Model):
         logger.info(
             "%s: Fetching locations for %d assets from ESI", self, len(item_ids)
         )
-        locations_data = []
-        for item_ids_chunk in chunks(item_ids, 999):
+        locations_data = self._post_item_ids_in_chunks(
+            esi.client.Assets.post_corporations_corporation_id_assets_locations,
+            item_ids,
+            token,
+        )
+        positions = {x["item_id"]: x["position"] for x in locations_data}
+        return positions
+
+    def _post_item_ids_in_chunks(
+        self, esi_method: Callable[..., Any], item_ids: Iterable[int], token: Token
+    ) -> List[dict]:
+        """Post item IDs in chunks to an ESI endpoint and return the merged results.
+
+        Chunks are posted concurrently.
+        Chunks, which ESI reports as not found are skipped.
+        """
+        item_ids_chunks = list(chunks(list(item_ids), 999))
+        if not item_ids_chunks:
+            return []
+
+        access_token = token.valid_access_token()
+        corporation_id = self.corporation.corporation_id
+
+        def post_chunk(item_ids_chunk: List[int]) -> List[dict]:
             try:
-                locations_data_chunk = (
-                    esi.client.Assets.post_corporations_corporation_id_assets_locations(
-                        corporation_id=self.corporation.corporation_id,
-                        item_ids=item_ids_chunk,
-                        token=token.valid_access_token(),
-                    )
+                return esi_method(
+                    corporation_id=corporation_id,
+                    item_ids=item_ids_chunk,
+                    token=access_token,
                 ).results()
             except HTTPNotFound:
-                pass
-            else:
-                locations_data += locations_data_chunk
-        positions = {x["item_id"]: x["position"] for x in locations_data}
-        return positions
+                return []
+
+        results = []
+        max_workers = min(STRUCTURES_ESI_MAX_WORKERS, len(item_ids_chunks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for data in executor.map(post_chunk, item_ids_chunks):
+                results += data
+        return results
 
     def _fetch_upwell_structures(self, token: Token) -> bool:
         """Fetch Upwell structures from ESI for self.
@@ -563,17 +603,23 @@ class Owner(models.Model):
         """
         is_ok = True
         # fetch main list of structure for this corporation
+        etag_request = EsiEtagRequest("structures", self.corporation.corporation_id)
         try:
-            structures = (
-                esi.client.Corporation.get_corporations_corporation_id_structures(
+            structures = etag_request.fetch(
+                partial(
+                    esi.client.Corporation.get_corporations_corporation_id_structures,
                     corporation_id=self.corporation.corporation_id,
                     token=token.valid_access_token(),
-                ).results()
+                )
             )
         except OSError as ex:
             self._report_esi_issue("fetch corporation structures", ex, token)
             return False
 
+        if structures is None:
+            logger.info("%s: Upwell structures have not changed on ESI", self)
+            return True
+
         # fetch additional information for structures
         if not structures:
             logger.info("%s: No Upwell structures retrieved from ESI", self)
@@ -583,35 +629,17 @@ class Owner(models.Model):
                 self,
                 len(structures),
             )
-            for structure in structures:
-                try:
-                    structure_info = (
-                        esi.client.Universe.get_universe_structures_structure_id(
-                            structure_id=structure["structure_id"],
-                            token=token.valid_access_token(),
-                        )
-                    ).results()
-                except OSError as ex:
-                    self._report_esi_issue(
-                        f"fetch structure #{structure['structure_id']}", ex, token
-                    )
-                    structure["name"] = "(no data)"
-                    is_ok = False
-                else:
-                    structure["name"] = Structure.extract_name_from_esi_response(
-                        structure_info["name"]
-                    )
-                    structure["position"] = structure_info["position"]
+            is_ok &= self._fetch_upwell_structures_infos(structures, token)
 
             logger.info(
                 "%s: Storing updates for %d upwell structures",
                 self,
                 len(structures),
             )
+            results = Structure.objects.update_or_create_from_dicts(structures, self)
+            stored_ids = {structure_obj.id for structure_obj, _created in results}
             for structure in structures:
-                try:
-                    Structure.objects.update_or_create_from_dict(structure, self)
-                except OSError:
+                if structure["structure_id"] not in stored_ids:
                     logger.warning(
                         "%s: Failed to store update for structure with ID %s",
                         self,
@@ -626,6 +654,65 @@ class Owner(models.Model):
             structures_qs=self.structures.filter_upwell_structures(),
             new_structures=structures,
         )
+        if is_ok:
+            etag_request.save_etags()
+        return is_ok
+
+    def _fetch_upwell_structures_infos(
+        self, structures: List[dict], token: Token
+    ) -> bool:
+        """Fetch additional infos for Upwell structures from ESI concurrently
+        and add them to the given structures.
+
+        Stops sending new requests once ESI reports that the error limit is exceeded.
+
+        Return True if successful, else False.
+        """
+        access_token = token.valid_access_token()
+        is_error_limited = threading.Event()
+
+        def fetch_structure_info(structure_id: int) -> Optional[dict]:
+            if is_error_limited.is_set():
+                return None
+            try:
+                return esi.client.Universe.get_universe_structures_structure_id(
+                    structure_id=structure_id, token=access_token
+                ).results()
+            except HTTPError as ex:
+                if ex.status_code == 420:
+                    is_error_limited.set()
+                raise
+
+        is_ok = True
+        with ThreadPoolExecutor(max_workers=STRUCTURES_ESI_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(fetch_structure_info, structure["structure_id"]): (
+                    structure
+                )
+                for structure in structures
+            }
+            for future in as_completed(futures):
+                structure = futures[future]
+                try:
+                    structure_info = future.result()
+                except OSError as ex:
+                    self._report_esi_issue(
+                        f"fetch structure #{structure['structure_id']}", ex, token
+                    )
+                    structure_info = None
+                if not structure_info:
+                    structure["name"] = "(no data)"
+                    is_ok = False
+                    continue
+                structure["name"] = Structure.extract_name_from_esi_response(
+                    structure_info["name"]
+                )
+                structure["position"] = structure_info["position"]
+
+        if is_error_limited.is_set():
+            logger.warning(
+                "%s: ESI error limit exceeded. Aborted fetching structure infos.", self
+            )
         return is_ok
 
     def _fetch_custom_offices(self, token: Token) -> bool:
@@ -634,11 +721,20 @@ class Owner(models.Model):
         Return True when successful, else False.
         """
         structures = {}
+        etag_request = EsiEtagRequest(
+            "customs_offices", self.corporation.corporation_id
+        )
         try:
-            pocos = esi.client.Planetary_Interaction.get_corporations_corporation_id_customs_offices(
-                corporation_id=self.corporation.corporation_id,
-                token=token.valid_access_token(),
-            ).results()
+            pocos = etag_request.fetch(
+                partial(
+                    esi.client.Planetary_Interaction.get_corporations_corporation_id_customs_offices,
+                    corporation_id=self.corporation.corporation_id,
+                    token=token.valid_access_token(),
+                )
+            )
+            if pocos is None:
+                logger.info("%s: Custom offices have not changed on ESI", self)
+                return True
 
             if not pocos:
                 logger.info("%s: No custom offices retrieved from ESI", self)
@@ -677,25 +773,28 @@ class Owner(models.Model):
             structures_qs=self.structures.filter_customs_offices(),
             new_structures=structures.values(),
         )
+        etag_request.save_etags()
         return True
 
     def _store_poco_details(self, structures: dict, pocos_2: dict):
         logger.info("%s: Storing updates for %d customs offices", self, len(structures))
+        structures_with_details = {}
         for office_id, structure in structures.items():
-            try:
-                poco = pocos_2[office_id]
-            except KeyError:
+            if office_id not in pocos_2:
                 logger.warning(
                     "%s: No details found for this POCO: %d", self, office_id
                 )
                 continue
+            structures_with_details[office_id] = structure
 
+        results = Structure.objects.update_or_create_from_dicts(
+            structures_with_details.values(), self
+        )
+        for structure_obj, _created in results:
+            poco = pocos_2[structure_obj.id]
             standing_level = PocoDetails.StandingLevel.from_esi(
                 poco.get("standing_level")
             )
-            structure_obj, _ = Structure.objects.update_or_create_from_dict(
-                structure, self
-            )
             PocoDetails.objects.update_or_create(
                 structure=structure_obj,
                 defaults={
@@ -721,18 +820,18 @@ class Owner(models.Model):
             )
 
     def _compile_pocos_for_structures(self, pocos_2, positions, names) -> dict:
+        planets_by_name = self._planets_by_name(
+            {int(poco["system_id"]) for poco in pocos_2.values()}
+        )
         structures = {}
         for office_id, poco in pocos_2.items():
             planet_name = names.get(office_id, "")
             if planet_name:
                 try:
-                    eve_planet = EvePlanet.objects.get(name=planet_name)
-                except EvePlanet.DoesNotExist:
+                    planet_id, name = planets_by_name[planet_name]
+                except KeyError:
                     name = ""
                     planet_id = None
-                else:
-                    planet_id = eve_planet.id
-                    name = eve_planet.eve_type.name
             else:
                 name = None
                 planet_id = None
@@ -760,26 +859,27 @@ class Owner(models.Model):
 
         return structures
 
+    @staticmethod
+    def _planets_by_name(solar_system_ids: Iterable[int]) -> Dict[str, Tuple[int, str]]:
+        """Return planet ID and type name of all planets in given solar systems
+        mapped by planet name.
+        """
+        planets = EvePlanet.objects.filter(
+            eve_solar_system_id__in=solar_system_ids
+        ).values_list("name", "id", "eve_type__name")
+        return {name: (planet_id, type_name) for name, planet_id, type_name in planets}
+
     def _fetch_names_for_pocos(self, item_ids: list, token: Token) -> dict:
         logger.info(
             "%s: Fetching names for %d custom office names from ESI",
             self,
             len(item_ids),
         )
-        names_data = []
-        for item_ids_chunk in chunks(item_ids, 999):
-            try:
-                names_data_chunk = (
-                    esi.client.Assets.post_corporations_corporation_id_assets_names(
-                        corporation_id=self.corporation.corporation_id,
-                        item_ids=item_ids_chunk,
-                        token=token.valid_access_token(),
-                    )
-                ).results()
-            except HTTPNotFound:
-                pass
-            else:
-                names_data += names_data_chunk
+        names_data = self._post_item_ids_in_chunks(
+            esi.client.Assets.post_corporations_corporation_id_assets_names,
+            item_ids,
+            token,
+        )
         names = {x["item_id"]: self._extract_planet_name(x["name"]) for x in names_data}
         return names
 
@@ -851,10 +951,8 @@ class Owner(models.Model):
 
     def _store_updates_for_starbases(self, token, structures):
         logger.info("%s: Storing updates for %d starbases", self, len(structures))
-        for structure in structures:
-            structure_obj, _ = Structure.objects.update_or_create_from_dict(
-                structure, self
-            )
+        results = Structure.objects.update_or_create_from_dicts(structures, self)
+        for structure_obj, _created in results:
             detail = self._update_starbase_detail(structure=structure_obj, token=token)
             fuel_expires_at = detail.calc_fuel_expires()
             if fuel_expires_at:
@@ -904,20 +1002,11 @@ class Owner(models.Model):
     def _fetch_starbases_names(self, item_ids: Iterable, token: Token) -> dict:
         item_ids = list(item_ids)
         logger.info("%s: Fetching names for %d starbases from ESI", self, len(item_ids))
-        names_data = []
-        for item_ids_chunk in chunks(item_ids, 999):
-            try:
-                names_data_chunk = (
-                    esi.client.Assets.post_corporations_corporation_id_assets_names(
-                        corporation_id=self.corporation.corporation_id,
-                        item_ids=item_ids_chunk,
-                        token=token.valid_access_token(),
-                    )
-                ).results()
-            except HTTPNotFound:
-                pass
-            else:
-                names_data += names_data_chunk
+        names_data = self._post_item_ids_in_chunks(
+            esi.client.Assets.post_corporations_corporation_id_assets_names,
+            item_ids,
+            token,
+        )
         names = {x["item_id"]: x["name"] for x in names_data}
         return names
 
@@ -969,20 +1058,115 @@ class Owner(models.Model):
                 )
         return detail
 
-    def add_or_remove_timers_from_notifications(self):
-        """Add/remove timers from esi and generated notification of this owner."""
-        self.notification_set.add_or_remove_timers()
+    def add_or_remove_timers_from_notifications(
+        self, notifications: Optional[List[Notification]] = None
+    ):
+        """Add/remove timers from esi and generated notification of this owner.
+
+        When notifications are given, only those are used for timers
+        instead of all esi notifications of this owner.
+        """
+        if notifications is None:
+            self.notification_set.add_or_remove_timers()
+        else:
+            cutoff_dt_for_stale = now() - dt.timedelta(
+                hours=STRUCTURES_HOURS_UNTIL_STALE_NOTIFICATION
+            )
+            for notif in notifications:
+                if (
+                    notif.notif_type in NotificationType.relevant_for_timerboard()
+                    and not notif.is_timer_added
+                    and notif.timestamp >= cutoff_dt_for_stale
+                ):
+                    notif.add_or_remove_timer()
         self.generatednotification_set.add_or_remove_timers()
 
-    def fetch_notifications_esi(self, user: Optional[User] = None) -> None:
-        """Fetch notifications for this owner from ESI and process them."""
+    def process_notifications(
+        self, user: Optional[User] = None, process_all_pending: bool = False
+    ) -> bool:
+        """Fetch new notifications from ESI and process them in one pass.
+
+        New notifications are loaded once and then forwarded and used for timers.
+        When process_all_pending is True, all notifications which have not been
+        forwarded or added as timer yet are processed too,
+        e.g. because they had no webhook or the timerboard failed before.
+
+        Returns False when some notifications could not be forwarded, else True.
+        """
+        started_at = now()
+        notification_ids = self.fetch_notifications_esi(user)
+        self.update_notification_structures()
+        if notification_ids:
+            new_notifications = list(
+                self.notification_set.filter(notification_id__in=notification_ids)
+                .select_related("owner", "sender", "owner__corporation")
+                .order_by("timestamp")
+            )
+        else:
+            new_notifications = []
+        if process_all_pending:
+            is_complete = self.send_new_notifications()
+            self.add_or_remove_timers_from_notifications()
+        else:
+            is_complete = self.send_new_notifications(notifications=new_notifications)
+            self.add_or_remove_timers_from_notifications(
+                notifications=new_notifications
+            )
+        if new_notifications:
+            queued_at = now()
+            logger.info(
+                "%s: Queue latency for %d new notifications is %.1f seconds "
+                "from ESI request until queued for Discord "
+                "(oldest notification was %.1f seconds old when queued)",
+                self,
+                len(new_notifications),
+                (queued_at - started_at).total_seconds(),
+                (queued_at - new_notifications[0].timestamp).total_seconds(),
+            )
+        return is_complete
+
+    def update_notification_structures(self) -> int:
+        """Update structure relation for existing notifications if needed.
+
+        Returns number of updated notifications.
+        """
+        updated_count, checked_count = self.notification_set.update_related_structures(
+            recheck_before=self.structures_last_update_at
+        )
+        if checked_count > 0:
+            logger.info(
+                "%s: Updated structure relation for %d of %d relevant notifications",
+                self,
+                updated_count,
+                checked_count,
+            )
+        return updated_count
+
+    def fetch_notifications_esi(self, user: Optional[User] = None) -> List[int]:
+        """Fetch notifications for this owner from ESI and process them.
+
+        Returns IDs of new notifications.
+        """
         notifications_count_all = 0
         token = self.fetch_token(
             rotate_characters=self.RotateCharactersType.NOTIFICATIONS
         )
-        notifications = self._fetch_notifications_from_esi(token)
-        notifications_count_new = self._store_notifications(notifications)
-        self._process_moon_notifications()
+        etag_request = EsiEtagRequest(
+            "notifications",
+            self.corporation.corporation_id,
+            token.character_id,
+            paginated=False,
+        )
+        notifications = self._fetch_notifications_from_esi(token, etag_request)
+        if notifications is None:
+            new_notification_ids = []
+        else:
+            new_notification_ids = self._store_notifications(notifications)
+            self._process_moon_notifications()
+            etag_request.save_etags()
+
+        notifications_count_new = len(new_notification_ids)
+
         if notifications_count_new > 0:
             logger.info(
                 "%s: Received %d new notifications from ESI",
@@ -1001,12 +1185,25 @@ class Owner(models.Model):
                 topic_count=notifications_count_all,
                 user=user,
             )
+        return new_notification_ids
 
-    def _fetch_notifications_from_esi(self, token: Token) -> List[dict]:
-        """fetching all notifications from ESI for current owner"""
-        notifications = esi.client.Character.get_characters_character_id_notifications(
-            character_id=token.character_id, token=token.valid_access_token()
-        ).results()
+    def _fetch_notifications_from_esi(
+        self, token: Token, etag_request: EsiEtagRequest
+    ) -> Optional[List[dict]]:
+        """fetching all notifications from ESI for current owner
+
+        Returns None when the notifications have not changed.
+        """
+        notifications = etag_request.fetch(
+            partial(
+                esi.client.Character.get_characters_character_id_notifications,
+                character_id=token.character_id,
+                token=token.valid_access_token(),
+            )
+        )
+        if notifications is None:
+            logger.debug("%s: Notifications have not changed on ESI", self)
+            return None
         if STRUCTURES_DEVELOPER_MODE:
             self._store_raw_data("notifications", notifications)
         if STRUCTURES_NOTIFICATIONS_ARCHIVING_ENABLED:
@@ -1036,112 +1233,182 @@ class Owner(models.Model):
             )
             file.write("\n")
 
-    def _store_notifications(self, notifications: List[dict]) -> int:
+    def _store_notifications(self, notifications: List[dict]) -> List[int]:
         """Store new notifications in database.
-        Returns number of newly created objects.
+        Returns IDs of newly created notifications.
         """
         # identify new notifications
+        incoming_notification_ids = {obj["notification_id"] for obj in notifications}
         existing_notification_ids = set(
-            self.notification_set.values_list("notification_id", flat=True)
+            self.notification_set.filter(
+                notification_id__in=incoming_notification_ids
+            ).values_list("notification_id", flat=True)
         )
-        new_notifications = [
-            obj
+        new_notifications = {
+            obj["notification_id"]: obj
             for obj in notifications
             if obj["notification_id"] not in existing_notification_ids
-        ]
+        }
+        if not new_notifications:
+            return []
+
+        # resolve all senders at once
+        sender_ids = {
+            obj["sender_id"]
+            for obj in new_notifications.values()
+            if obj["sender_type"] != "other"
+        }
+        if sender_ids:
+            EveEntity.objects.bulk_resolve_ids(sender_ids)
+
         # create new notification objects
-        for notification in new_notifications:
-            if notification["sender_type"] == "other":
-                sender = None
-            else:
-                sender, _ = EveEntity.objects.get_or_create_esi(
-                    id=notification["sender_id"]
-                )
-            text = notification["text"] if "text" in notification else None
-            is_read = notification["is_read"] if "is_read" in notification else None
-            # at least one type has a trailing white space
-            # which we need to remove
-            notif_type = notification["type"].strip()
-            Notification.objects.create(
+        objs = []
+        now_ = now()
+        for notification in new_notifications.values():
+            obj = Notification(
                 notification_id=notification["notification_id"],
                 owner=self,
-                sender=sender,
+                sender_id=(
+                    notification["sender_id"]
+                    if notification["sender_type"] != "other"
+                    else None
+                ),
                 timestamp=notification["timestamp"],
-                notif_type=notif_type,
-                text=text,
-                is_read=is_read,
-                last_updated=now(),
-                created=now(),
+                # at least one type has a trailing white space
+                # which we need to remove
+                notif_type=notification["type"].strip(),
+                text=notification.get("text"),
+                is_read=notification.get("is_read"),
+                last_updated=now_,
+                created=now_,
             )
-        return len(new_notifications)
+            # bulk_create does not call save(), so derived fields are set here
+            obj.text_parsed = obj.text_parsed_for_storage()
+            obj.update_references()
+            objs.append(obj)
+
+        Notification.objects.bulk_create(objs, batch_size=500, ignore_conflicts=True)
+        return list(new_notifications.keys())
 
     def _process_moon_notifications(self):
-        """processes notifications for timers if any"""
+        """Set moons of refineries from moon mining notifications.
+
+        Only notifications received since the last run are checked,
+        except for refineries which have been created since then.
+        """
+        started_at = now()
         empty_refineries = Structure.objects.filter(
             owner=self,
             eve_type__eve_group_id=EveGroupId.REFINERY,
             eve_moon__isnull=True,
         )
-        if empty_refineries.exists():
+        notifications = self.notification_set.filter(
+            notif_type__in=NotificationType.relevant_for_moonmining(),
+            ref_structure_id__in=empty_refineries.values("id"),
+            ref_moon_id__isnull=False,
+        )
+        last_run_at = self.moons_last_update_at
+        if last_run_at:
+            new_refineries = empty_refineries.filter(created_at__gte=last_run_at)
+            notifications = notifications.filter(
+                Q(created__gte=last_run_at)
+                | Q(ref_structure_id__in=new_refineries.values("id"))
+            )
+        structure_id_2_moon_id = dict(
+            notifications.order_by("timestamp").values_list(
+                "ref_structure_id", "ref_moon_id"
+            )
+        )
+        if structure_id_2_moon_id:
             logger.info(
-                "%s: Trying to find moons for up to %d refineries which have no moon.",
+                "%s: Updating moons for %d refineries",
                 self,
-                empty_refineries.count(),
+                len(structure_id_2_moon_id),
             )
-            notifications = (
-                self.notification_set.filter(
-                    notif_type__in=NotificationType.relevant_for_moonmining()
-                )
-                .select_related("owner", "sender")
-                .order_by("timestamp")
+            moon_ids = set(structure_id_2_moon_id.values())
+            eve_moons = EveMoon.objects.in_bulk(moon_ids)
+            for moon_id in moon_ids - set(eve_moons.keys()):
+                eve_moons[moon_id], _ = EveMoon.objects.get_or_create_esi(id=moon_id)
+            refineries = list(
+                Structure.objects.filter(id__in=structure_id_2_moon_id.keys())
             )
-            structure_id_2_moon_id = {}
-            for notification in notifications:
-                parsed_text = notification.parsed_text()
-                moon_id = parsed_text["moonID"]
-                structure_id = parsed_text["structureID"]
-                structure_id_2_moon_id[structure_id] = moon_id
-            for refinery in empty_refineries:
-                if refinery.id in structure_id_2_moon_id:
-                    logger.info("%s: Updating moon for structure %s", self, refinery)
-                    eve_moon, _ = EveMoon.objects.get_or_create_esi(
-                        id=structure_id_2_moon_id[refinery.id]
-                    )
-                    refinery.eve_moon = eve_moon
-                    refinery.save()
+            for refinery in refineries:
+                refinery.eve_moon = eve_moons[structure_id_2_moon_id[refinery.id]]
+            Structure.objects.bulk_update(refineries, fields=["eve_moon"])
+
+        self.moons_last_update_at = started_at
+        self.save(update_fields=["moons_last_update_at"])
+
+    def send_new_notifications(
+        self,
+        user: Optional[User] = None,
+        notifications: Optional[List[Notification]] = None,
+    ) -> bool:
+        """Forward all new notification of this owner to configured webhooks.
 
-    def send_new_notifications(self, user: Optional[User] = None):
-        """Forward all new notification of this owner to configured webhooks."""
+        When notifications are given, only those are forwarded
+        instead of all new esi notifications of this owner.
+
+        Returns False when some notifications could not be forwarded, else True.
+        """
         notifications_count = 0
         cutoff_dt_for_stale = now() - dt.timedelta(
             hours=STRUCTURES_HOURS_UNTIL_STALE_NOTIFICATION
         )
+        notif_types = (
+            Webhook.objects.enabled_notification_types()
+            & NotificationType.relevant_for_forwarding()
+        )
         my_filter = {
-            "notif_type__in": (
-                Webhook.objects.enabled_notification_types()
-                & NotificationType.relevant_for_forwarding()
-            ),
+            "notif_type__in": notif_types,
             "is_sent": False,
             "timestamp__gte": cutoff_dt_for_stale,
         }
-        new_eve_notifications = (
-            self.notification_set.filter(**my_filter)
-            .select_related("owner", "sender", "owner__corporation")
-            .order_by("timestamp")
-        )
-        for notif in new_eve_notifications:
-            notif.send_to_configured_webhooks()
-        new_generated_notifications = (
+        if notifications is None:
+            new_eve_notifications = list(
+                self.notification_set.filter(**my_filter)
+                .select_related("owner", "sender", "owner__corporation")
+                .order_by("timestamp")
+            )
+        else:
+            new_eve_notifications = [
+                notif
+                for notif in notifications
+                if notif.notif_type in notif_types
+                and not notif.is_sent
+                and notif.timestamp >= cutoff_dt_for_stale
+            ]
+        new_generated_notifications = list(
             self.generatednotification_set.filter(**my_filter)
             .select_related("owner", "owner__corporation")
             .order_by("timestamp")
         )
-        for notif in new_generated_notifications:
-            notif.send_to_configured_webhooks()
-        if (
-            not new_eve_notifications.exists()
-            and not new_generated_notifications.exists()
-        ):
+        new_notifications = new_eve_notifications + new_generated_notifications
+        is_complete = True
+        if new_notifications:
+            # Notifications are marked as sent before forwarding them,
+            # so they are never sent twice, even when a worker dies mid-batch.
+            # Notifications which could not be sent are reset afterwards.
+            self._update_notifications_is_sent(new_notifications, True)
+            try:
+                routes = WebhookRoutes.for_owner(self)
+                objects = NotificationObjects.from_notifications(new_notifications)
+                group_pings = {}
+                for notif in new_notifications:
+                    success = notif.send_to_configured_webhooks(
+                        routes=routes,
+                        objects=objects,
+                        mark_as_sent=False,
+                        group_pings=group_pings,
+                    )
+                    if success is False:
+                        is_complete = False
+            finally:
+                self._update_notifications_is_sent(
+                    [notif for notif in new_notifications if not notif.is_sent],
+                    False,
+                )
+        else:
             logger.info("%s: No new notifications found for forwarding", self)
         self.forwarding_last_update_at = now()
         self.save(update_fields=["forwarding_last_update_at"])
@@ -1149,6 +1416,16 @@ class Owner(models.Model):
             self._send_report_to_user(
                 topic="notifications", topic_count=notifications_count, user=user
             )
+        return is_complete
+
+    @staticmethod
+    def _update_notifications_is_sent(
+        notifications: List[NotificationBase], is_sent: bool
+    ):
+        """Update is_sent of notifications with one query per model."""
+        for model in {type(notif) for notif in notifications}:
+            ids = [notif.pk for notif in notifications if isinstance(notif, model)]
+            model.objects.filter(pk__in=ids).update(is_sent=is_sent)
 
     def _send_report_to_user(self, topic: str, topic_count: int, user: User):
         message_details = "%(count)s %(topic)s synced." % {
@@ -1186,97 +1463,182 @@ class Owner(models.Model):
     def update_asset_esi(self, user: Optional[User] = None):
         """Update assets from ESI."""
         token = self.fetch_token()
-        assets_data = self._fetch_structure_assets_from_esi(token)
-        self._store_items_for_upwell_structures(assets_data)
-        self._store_items_for_starbases(assets_data)
+        etag_request = self._assets_etag_request()
+        assets_data = self._fetch_structure_assets_from_esi(token, etag_request)
+        if assets_data is None:
+            logger.info("%s: Assets have not changed on ESI", self)
+            self.assets_last_update_at = now()
+            self.save(update_fields=["assets_last_update_at"])
+        else:
+            self._store_items_for_upwell_structures(assets_data)
+            self._store_items_for_starbases(assets_data)
+            etag_request.save_etags()
+
         if user:
             self._send_report_to_user(
                 topic="assets", topic_count=self.structures.count(), user=user
             )
 
-    def _fetch_structure_assets_from_esi(self, token: Token) -> dict:
-        assets_raw = esi.client.Assets.get_corporations_corporation_id_assets(
-            corporation_id=self.corporation.corporation_id,
-            token=token.valid_access_token(),
-        ).results()
-        assets = {asset["item_id"]: asset for asset in assets_raw}
-        positions = self._fetch_locations_for_assets(assets.keys(), token)
-        for item_id, asset in assets.items():
-            asset["position"] = positions[item_id] if item_id in positions else None
-        return assets
+    def invalidate_assets_etag(self):
+        """Make sure assets are fully processed with the next update,
+        e.g. so that items of new structures are stored.
+        """
+        self._assets_etag_request().clear_etags()
 
-    def _store_items_for_upwell_structures(self, assets_data: dict):
-        structure_ids = set(
+    def _assets_etag_request(self) -> EsiEtagRequest:
+        return EsiEtagRequest("assets", self.corporation.corporation_id)
+
+    def _fetch_structure_assets_from_esi(
+        self, token: Token, etag_request: EsiEtagRequest
+    ) -> Optional[dict]:
+        """Fetch assets in structures from ESI.
+
+        Pages are processed one by one and only assets,
+        which can belong to a structure of this owner are kept.
+
+        Returns None when the assets have not changed.
+        """
+        upwell_structure_ids = set(
             self.structures.filter_upwell_structures().values_list("id", flat=True)
         )
-        assets_in_structures = {id: {} for id in structure_ids}
-        for item_id, item in assets_data.items():
+        assets = {}
+        anchored_ids = []
+        pages = etag_request.iter_pages(
+            partial(
+                esi.client.Assets.get_corporations_corporation_id_assets,
+                corporation_id=self.corporation.corporation_id,
+                token=token.valid_access_token(),
+            )
+        )
+        for assets_page in pages:
+            for asset in assets_page:
+                if asset["location_id"] in upwell_structure_ids:
+                    asset["position"] = None
+                    assets[asset["item_id"]] = asset
+                elif self._is_anchored_asset(asset):
+                    assets[asset["item_id"]] = asset
+                    anchored_ids.append(asset["item_id"])
+
+        if etag_request.is_unchanged:
+            return None
+
+        positions = self._fetch_locations_for_assets(anchored_ids, token)
+        for item_id in anchored_ids:
+            assets[item_id]["position"] = positions.get(item_id)
+        return assets
+
+    @staticmethod
+    def _is_anchored_asset(asset: dict) -> bool:
+        """Return True if the asset is anchored in space, e.g. a starbase module."""
+        return (
+            asset["location_type"] == "solar_system"
+            and asset["location_flag"] == "AutoFit"
+        )
+
+    def _store_items_for_upwell_structures(self, assets_data: dict):
+        structures = {obj.id: obj for obj in self.structures.filter_upwell_structures()}
+        assets_in_structures = {structure_id: [] for structure_id in structures}
+        for item in assets_data.values():
             location_id = item["location_id"]
-            if location_id in structure_ids and item["location_flag"] not in [
+            if location_id in structures and item["location_flag"] not in [
                 StructureItem.LocationFlag.CORP_DELIVERIES,
                 StructureItem.LocationFlag.OFFICE_FOLDER,
                 StructureItem.LocationFlag.SECONDARY_STORAGE,
                 StructureItem.LocationFlag.AUTOFIT,
             ]:
-                assets_in_structures[location_id][item_id] = item
-        for structure in self.structures.all():
-            structure_items = []
-            if structure.id in assets_in_structures.keys():
-                structure_assets = assets_in_structures[structure.id]
-                has_fitting = [
-                    asset
-                    for asset in structure_assets.values()
-                    if asset["location_flag"]
-                    != StructureItem.LocationFlag.QUANTUM_CORE_ROOM
-                ]
-                has_core = [
-                    asset
-                    for asset in structure_assets.values()
-                    if asset["location_flag"]
-                    == StructureItem.LocationFlag.QUANTUM_CORE_ROOM
-                ]
-                structure.has_fitting = bool(has_fitting)
-                structure.has_core = bool(has_core)
-                structure.save()
-
-                for asset in structure_assets.values():
-                    structure_items.append(
-                        StructureItem.from_esi_asset(asset, structure)
-                    )
+                assets_in_structures[location_id].append(item)
+
+        old_jump_fuel_quantities = self._jump_fuel_quantities()
+        structures_to_update = []
+        jump_fuel_alerts_filter = models.Q()
+        for structure_id, structure_assets in assets_in_structures.items():
+            structure = structures[structure_id]
+            has_fitting = any(
+                asset["location_flag"] != StructureItem.LocationFlag.QUANTUM_CORE_ROOM
+                for asset in structure_assets
+            )
+            has_core = any(
+                asset["location_flag"] == StructureItem.LocationFlag.QUANTUM_CORE_ROOM
+                for asset in structure_assets
+            )
+            if structure.has_fitting != has_fitting or structure.has_core != has_core:
+                structure.has_fitting = has_fitting
+                structure.has_core = has_core
+                structures_to_update.append(structure)
+
+            jump_fuel_quantity = sum(
+                asset["quantity"]
+                for asset in structure_assets
+                if asset["location_flag"] == StructureItem.LocationFlag.STRUCTURE_FUEL
+                and asset["type_id"] == EveTypeId.LIQUID_OZONE
+            )
+            if jump_fuel_quantity > old_jump_fuel_quantities.get(structure_id, 0):
+                jump_fuel_alerts_filter |= models.Q(
+                    structure_id=structure_id,
+                    config__threshold__lt=jump_fuel_quantity,
+                )
 
-            structure.update_items(structure_items)
-            structure.reevaluate_jump_fuel_alerts()
+            structure.update_items(structure_assets)
+
+        if structures_to_update:
+            Structure.objects.bulk_update(
+                structures_to_update, fields=["has_fitting", "has_core"]
+            )
+        if jump_fuel_alerts_filter:
+            JumpFuelAlert.objects.filter(jump_fuel_alerts_filter).delete()
 
         self.assets_last_update_at = now()
         self.save(update_fields=["assets_last_update_at"])
 
+    def _jump_fuel_quantities(self) -> Dict[int, int]:
+        """Return current quantity of jump fuel for structures of this owner
+        mapped by structure ID.
+        """
+        quantities = (
+            StructureItem.objects.filter(
+                structure__owner=self,
+                location_flag=StructureItem.LocationFlag.STRUCTURE_FUEL,
+                eve_type_id=EveTypeId.LIQUID_OZONE,
+            )
+            .values("structure_id")
+            .annotate(total=Sum("quantity"))
+        )
+        return {obj["structure_id"]: obj["total"] for obj in quantities}
+
     def _store_items_for_starbases(self, assets_raw: dict):
-        relevant_assets = {
-            item_id: item
-            for item_id, item in assets_raw.items()
-            if item["location_type"] == "solar_system"
-            and item["location_flag"] == "AutoFit"
-            and item["position"]
-        }
-        for structure in self.structures.filter_starbases().filter(
-            position_x__isnull=False, position_y__isnull=False, position_z__isnull=False
-        ):
-            structure_items = []
-            for item_id, item in relevant_assets.items():
+        modules_index = starbases.ModulesIndex()
+        for item in assets_raw.values():
+            if self._is_anchored_asset(item) and item["position"]:
+                modules_index.add(
+                    item,
+                    item["location_id"],
+                    item["position"]["x"],
+                    item["position"]["y"],
+                    item["position"]["z"],
+                )
+        for structure in self.structures.filter_starbases():
+            structure_assets = []
+            if not structure.has_position:
+                structure.update_items(structure_assets)
+                continue
+            candidates = modules_index.candidates(
+                structure.eve_solar_system_id,
+                structure.position_x,
+                structure.position_y,
+                structure.position_z,
+            )
+            for item in candidates:
                 if (
-                    item["location_id"] == structure.eve_solar_system_id
-                    and item_id != structure.id
+                    item["item_id"] != structure.id
                     and structure.distance_to_object(
                         item["position"]["x"],
                         item["position"]["y"],
                         item["position"]["z"],
                     )
-                    < 100_000
+                    < starbases.MODULES_MAX_DISTANCE
                 ):
-                    structure_items.append(
-                        StructureItem.from_esi_asset(item, structure)
-                    )
-            structure.update_items(structure_items)
+                    structure_assets.append(item)
+            structure.update_items(structure_assets)
 
     @staticmethod
     def get_esi_scopes() -> List[str]:
@@ -1,6 +1,8 @@
 """Structure related models for Structures."""
 
 import datetime as dt
+import hashlib
+import json
 import math
 import re
 from typing import List, Optional
@@ -273,6 +275,14 @@ class Structure(models.Model):  # pylint: disable = too-many-public-methods
         verbose_name=_("has core"),
         help_text="Whether the structure has a quantum core",
     )
+    items_hash = models.CharField(
+        max_length=64,
+        null=True,
+        default=None,
+        editable=False,
+        verbose_name=_("items hash"),
+        help_text=_("Hash over the current items of this structure"),
+    )
     last_online_at = models.DateTimeField(
         null=True,
         default=None,
@@ -756,16 +766,47 @@ class Structure(models.Model):  # pylint: disable = too-many-public-methods
             sov_tag, _ = getattr(StructureTag.objects, method_name)()
             self.tags.add(sov_tag)
 
-    def update_items(self, structure_items: List["StructureItem"]):
-        """Update items for this structure."""
+    def update_items(self, assets: List[dict]):
+        """Update items for this structure from given ESI assets.
+
+        Only changed items are written to the database.
+        Nothing is fetched or written when the assets have not changed
+        since the last update.
+        """
+        items_hash = StructureItem.calc_hash(assets)
+        if items_hash == self.items_hash:
+            return
+
+        new_items = {
+            item.id: item for item in StructureItem.from_esi_assets(assets, self)
+        }
+        current_items = StructureItem.objects.filter(
+            models.Q(structure=self) | models.Q(id__in=new_items.keys())
+        ).in_bulk()
+        items_to_create = []
+        items_to_update = []
+        updated_at = now()
+        for item_id, item in new_items.items():
+            current_item = current_items.pop(item_id, None)
+            if not current_item:
+                items_to_create.append(item)
+            elif current_item.has_changed(item):
+                item.last_updated_at = updated_at
+                items_to_update.append(item)
+
         with transaction.atomic():
-            self.items.all().delete()
-            if structure_items:
-                # remove items that have been transferred between structures
-                item_ids = {item.id for item in structure_items}
-                StructureItem.objects.filter(id__in=item_ids).delete()
-                # create new items
-                self.items.bulk_create(structure_items)
+            if current_items:
+                StructureItem.objects.filter(id__in=current_items.keys()).delete()
+            if items_to_update:
+                StructureItem.objects.bulk_update(
+                    items_to_update,
+                    fields=StructureItem.CONTENT_FIELDS + ["last_updated_at"],
+                    batch_size=500,
+                )
+            if items_to_create:
+                StructureItem.objects.bulk_create(items_to_create, batch_size=500)
+            Structure.objects.filter(pk=self.pk).update(items_hash=items_hash)
+        self.items_hash = items_hash
 
     @classmethod
     def extract_name_from_esi_response(cls, esi_name):
@@ -816,6 +857,15 @@ class StructureItem(models.Model):
     location_flag = models.CharField(max_length=255, verbose_name=_("location flag"))
     quantity = models.IntegerField(verbose_name=_("quantity"))
 
+    CONTENT_FIELDS = [
+        "structure",
+        "eve_type",
+        "is_singleton",
+        "location_flag",
+        "quantity",
+    ]
+    """Fields which define the content of an item."""
+
     class Meta:
         verbose_name = _("structure item")
         verbose_name_plural = _("structure items")
@@ -830,15 +880,50 @@ class StructureItem(models.Model):
             ")"
         )
 
+    def has_changed(self, other: "StructureItem") -> bool:
+        """Return True if the content of the other item is different, else False."""
+        return any(
+            getattr(self, self._meta.get_field(field).attname)
+            != getattr(other, self._meta.get_field(field).attname)
+            for field in self.CONTENT_FIELDS
+        )
+
     @classmethod
-    def from_esi_asset(cls, item: dict, structure: "Structure") -> "StructureItem":
-        """Create new object from ESI asset item."""
-        eve_type, _ = EveType.objects.get_or_create_esi(id=item["type_id"])
-        return StructureItem(
-            id=item["item_id"],
-            structure=structure,
-            eve_type=eve_type,
-            is_singleton=item["is_singleton"],
-            location_flag=item["location_flag"],
-            quantity=item["quantity"],
+    def calc_hash(cls, assets: List[dict]) -> str:
+        """Calculate hash over the content of given ESI assets."""
+        content = sorted(
+            (
+                asset["item_id"],
+                asset["type_id"],
+                asset["is_singleton"],
+                asset["location_flag"],
+                asset["quantity"],
+            )
+            for asset in assets
         )
+        return hashlib.sha256(json.dumps(content).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_esi_assets(
+        cls, assets: List[dict], structure: "Structure"
+    ) -> List["StructureItem"]:
+        """Create new objects from ESI assets.
+
+        Existing types are loaded with one query
+        and only missing types are fetched from ESI.
+        """
+        type_ids = {asset["type_id"] for asset in assets}
+        eve_types = EveType.objects.in_bulk(type_ids)
+        for type_id in type_ids - set(eve_types.keys()):
+            eve_types[type_id], _ = EveType.objects.get_or_create_esi(id=type_id)
+        return [
+            StructureItem(
+                id=asset["item_id"],
+                structure=structure,
+                eve_type=eve_types[asset["type_id"]],
+                is_singleton=asset["is_singleton"],
+                location_flag=asset["location_flag"],
+                quantity=asset["quantity"],
+            )
+            for asset in assets
+        ]
@@ -0,0 +1,47 @@
+"""Signals for Structures."""
+
+# pylint: disable = unused-argument
+
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .core.discord_roles import invalidate_discord_roles
+from .core.webhook_routes import invalidate_webhook_routes
+from .models import Owner, Structure, Webhook
+
+
+@receiver(post_save, sender=Webhook)
+@receiver(post_delete, sender=Webhook)
+@receiver(post_delete, sender=Owner)
+def invalidate_webhook_routes_on_change(sender, **kwargs):
+    """Invalidate webhook routes when webhooks or owners change."""
+    invalidate_webhook_routes()
+
+
+@receiver(post_delete, sender=Structure)
+def invalidate_webhook_routes_on_structure_delete(sender, instance, **kwargs):
+    """Invalidate webhook routes of the owner when a structure is deleted."""
+    invalidate_webhook_routes(owner_id=instance.owner_id)
+
+
+@receiver(post_save, sender=Owner)
+def invalidate_webhook_routes_on_new_owner(sender, instance, created, **kwargs):
+    """Invalidate webhook routes when a new owner is created."""
+    if created:
+        invalidate_webhook_routes()
+
+
+@receiver(m2m_changed, sender=Owner.webhooks.through)
+@receiver(m2m_changed, sender=Structure.webhooks.through)
+def invalidate_webhook_routes_on_new_relation(sender, action, **kwargs):
+    """Invalidate webhook routes when webhooks are added or removed."""
+    if action in {"post_add", "post_remove", "post_clear"}:
+        invalidate_webhook_routes()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_discord_roles_on_change(sender, **kwargs):
+    """Invalidate cached Discord roles when groups change."""
+    invalidate_discord_roles()
@@ -5,6 +5,7 @@ from typing import Iterable, Optional
 from celery import chain, shared_task
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from allianceauth.notifications import notify
 from allianceauth.services.hooks import get_extension_logger
@@ -13,8 +14,10 @@ from app_utils.esi import fetch_esi_status
 from app_utils.logging import LoggerAddTag
 
 from . import __title__
-from .app_settings import STRUCTURES_TASKS_TIME_LIMIT
-from .core.notification_types import NotificationType
+from .app_settings import (
+    STRUCTURES_NOTIFICATION_PIPELINE_ENABLED,
+    STRUCTURES_TASKS_TIME_LIMIT,
+)
 from .models import (
     EveSovereigntyMap,
     FuelAlertConfig,
@@ -25,8 +28,12 @@ from .models import (
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
+TASK_PRIORITY_HIGHEST = 1
 TASK_PRIORITY_HIGH = 2
 
+# min time in seconds between processing all pending notifications in pipeline mode
+PENDING_NOTIFICATIONS_RETRY_INTERVAL = 600
+
 
 @shared_task(time_limit=STRUCTURES_TASKS_TIME_LIMIT)
 def update_all_structures():
@@ -120,10 +127,40 @@ def fetch_all_notifications():
 
 @shared_task(time_limit=STRUCTURES_TASKS_TIME_LIMIT)
 def process_notifications_for_owner(owner_pk: int, user_pk: Optional[int] = None):
-    """Fetch all notification for owner from ESI and processes them."""
+    """Fetch all notification for owner from ESI and processes them.
+
+    New notifications are either processed in this task
+    or with a chain of tasks, which also retries all pending notifications.
+    When processed in this task, all pending notifications are retried
+    once in a while, e.g. to forward notifications which had no webhook before
+    or to add timers which failed before.
+    """
     if not fetch_esi_status().is_ok:
         logger.warning("ESI currently not available. Aborting.")
         return
+    if not STRUCTURES_NOTIFICATION_PIPELINE_ENABLED:
+        _process_notifications_for_owner_chained(owner_pk, user_pk)
+        return
+    owner = Owner.objects.get(pk=owner_pk)
+    process_all_pending = cache.add(
+        f"structures:pending-notifications-retried:{owner_pk}",
+        True,
+        timeout=PENDING_NOTIFICATIONS_RETRY_INTERVAL,
+    )
+    is_complete = owner.process_notifications(
+        _get_user(user_pk), process_all_pending=process_all_pending
+    )
+    send_queued_messages_for_webhooks(owner.webhooks.filter(is_active=True))
+    if not is_complete:
+        logger.info("%s: Retrying to forward notifications", owner)
+        send_new_notifications_for_owner.apply_async(
+            kwargs={"owner_pk": owner_pk}, priority=TASK_PRIORITY_HIGH
+        )
+
+
+def _process_notifications_for_owner_chained(
+    owner_pk: int, user_pk: Optional[int] = None
+):
     chain(
         fetch_notification_for_owner.si(owner_pk=owner_pk, user_pk=user_pk).set(
             priority=TASK_PRIORITY_HIGH
@@ -154,22 +191,7 @@ def update_existing_notifications(owner_pk: int) -> int:
     Returns number of updated notifications.
     """
     owner = Owner.objects.get(pk=owner_pk)
-    notif_need_update_qs = owner.notification_set.filter(
-        notif_type__in=NotificationType.structure_related(), structures__isnull=True
-    )
-    notif_need_update_count = notif_need_update_qs.count()
-    updated_count = 0
-    if notif_need_update_count > 0:
-        for notif in notif_need_update_qs:
-            if notif.update_related_structures():
-                updated_count += 1
-        logger.info(
-            "%s: Updated structure relation for %d of %d relevant notifications",
-            owner,
-            updated_count,
-            notif_need_update_count,
-        )
-    return updated_count
+    return owner.update_notification_structures()
 
 
 @shared_task(time_limit=STRUCTURES_TASKS_TIME_LIMIT)
@@ -202,17 +224,29 @@ def send_jump_fuel_notifications_for_config(config_pk: int):
 
 
 def send_queued_messages_for_webhooks(webhooks: Iterable[Webhook]):
-    """Send queued message for given webhooks."""
+    """Send queued message for given webhooks.
+
+    Webhooks with queued high priority messages are sent with the highest priority.
+    """
     for webhook in webhooks:
-        if webhook.queue_size() > 0:
-            send_messages_for_webhook.apply_async(
-                kwargs={"webhook_pk": webhook.pk}, priority=TASK_PRIORITY_HIGH
-            )
+        if webhook.queue_size(high_priority_only=True) > 0:
+            priority = TASK_PRIORITY_HIGHEST
+        elif webhook.queue_size() > 0:
+            priority = TASK_PRIORITY_HIGH
+        else:
+            continue
+        send_messages_for_webhook.apply_async(
+            kwargs={"webhook_pk": webhook.pk}, priority=priority
+        )
 
 
-@shared_task(base=QueueOnce)
+@shared_task(base=QueueOnce, once={"keys": ["webhook_pk"]})
 def send_messages_for_webhook(webhook_pk: int) -> None:
-    """Send all currently queued messages for given webhook to Discord."""
+    """Send all currently queued messages for given webhook to Discord.
+
+    Only one task is sending messages to a webhook at a time,
+    which sends high priority messages before all other messages.
+    """
     Webhook.objects.send_queued_messages_for_webhook(webhook_pk)
 
 
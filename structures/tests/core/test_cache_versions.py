@@ -0,0 +1,29 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from structures.core.cache_versions import get_version, increment_version
+
+CACHE_KEY = "structures:test:version"
+
+
+class TestCacheVersions(TestCase):
+    def setUp(self) -> None:
+        cache.delete(CACHE_KEY)
+        self.addCleanup(cache.delete, CACHE_KEY)
+
+    def test_should_return_first_version_when_not_set(self):
+        self.assertEqual(get_version(CACHE_KEY), 1)
+
+    def test_should_increment_version(self):
+        # given
+        get_version(CACHE_KEY)
+        # when
+        increment_version(CACHE_KEY)
+        # then
+        self.assertEqual(get_version(CACHE_KEY), 2)
+
+    def test_should_increment_version_when_not_set(self):
+        # when
+        increment_version(CACHE_KEY)
+        # then
+        self.assertEqual(get_version(CACHE_KEY), 2)
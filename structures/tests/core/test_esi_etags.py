@@ -0,0 +1,217 @@
+from unittest.mock import Mock, patch
+
+from bravado.exception import HTTPNotModified
+
+from django.core.cache import cache
+
+from app_utils.esi_testing import BravadoResponseStub
+from app_utils.testing import NoSocketsTestCase
+
+from structures.core.esi_etags import EsiEtagRequest
+
+MODULE_PATH = "structures.core.esi_etags"
+
+
+class FakeEsiEndpoint:
+    """Simulates a paginated ESI endpoint supporting ETags."""
+
+    class Operation:
+        class RequestConfig:
+            also_return_response = False
+
+        def __init__(self, endpoint, kwargs) -> None:
+            self.endpoint = endpoint
+            self.kwargs = kwargs
+            self.request_config = self.RequestConfig()
+
+        def result(self):
+            page = self.kwargs.get("page", 1)
+            data = self.endpoint.pages[page - 1]
+            etag = f'"{page}-{data}"'
+            headers = {"ETag": etag, "X-Pages": len(self.endpoint.pages)}
+            request_headers = self.kwargs.get("_request_options", {}).get("headers", {})
+            if request_headers.get("If-None-Match") == etag:
+                raise HTTPNotModified(
+                    response=BravadoResponseStub(304, headers=headers)
+                )
+            return data, BravadoResponseStub(200, headers=headers)
+
+    def __init__(self, pages) -> None:
+        self.pages = pages
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.Operation(self, kwargs)
+
+
+class TestEsiEtagRequest(NoSocketsTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_should_return_data_from_all_pages(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3]])
+        request = EsiEtagRequest("dummy", 42)
+        # when
+        result = request.fetch(endpoint)
+        # then
+        self.assertListEqual(result, [1, 2, 3])
+        self.assertListEqual([obj["page"] for obj in endpoint.calls], [1, 2])
+
+    def test_should_return_none_when_data_not_changed(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3]])
+        request = EsiEtagRequest("dummy", 42)
+        request.fetch(endpoint)
+        request.save_etags()
+        # when
+        result = EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # then
+        self.assertIsNone(result)
+
+    def test_should_yield_pages_one_by_one(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3]])
+        request = EsiEtagRequest("dummy", 42)
+        # when
+        pages = request.iter_pages(endpoint)
+        # then
+        self.assertListEqual(next(pages), [1, 2])
+        self.assertEqual(len(endpoint.calls), 1)
+        self.assertListEqual(list(pages), [[3]])
+        self.assertFalse(request.is_unchanged)
+
+    def test_should_yield_nothing_when_data_not_changed(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3]])
+        request = EsiEtagRequest("dummy", 42)
+        request.fetch(endpoint)
+        request.save_etags()
+        request = EsiEtagRequest("dummy", 42)
+        # when
+        pages = list(request.iter_pages(endpoint))
+        # then
+        self.assertListEqual(pages, [])
+        self.assertTrue(request.is_unchanged)
+
+    def test_should_return_data_when_etags_were_not_saved(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3]])
+        EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # when
+        result = EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # then
+        self.assertListEqual(result, [1, 2, 3])
+
+    def test_should_return_all_pages_when_one_page_changed(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3]])
+        request = EsiEtagRequest("dummy", 42)
+        request.fetch(endpoint)
+        request.save_etags()
+        endpoint.pages[1] = [4]
+        # when
+        result = EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # then
+        self.assertCountEqual(result, [1, 2, 4])
+
+    def test_should_fetch_unchanged_pages_again_when_first_page_changed(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3], [4]])
+        request = EsiEtagRequest("dummy", 42)
+        request.fetch(endpoint)
+        request.save_etags()
+        endpoint.pages[0] = [5]
+        endpoint.calls = []
+        # when
+        result = EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # then
+        self.assertCountEqual(result, [5, 3, 4])
+        self.assertListEqual(
+            [(obj["page"], "_request_options" in obj) for obj in endpoint.calls],
+            [(1, True), (2, True), (3, True), (2, False), (3, False)],
+        )
+
+    def test_should_fetch_new_pages_when_first_page_unchanged(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3]])
+        request = EsiEtagRequest("dummy", 42)
+        request.fetch(endpoint)
+        request.save_etags()
+        endpoint.pages.append([4])
+        # when
+        result = EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # then
+        self.assertCountEqual(result, [1, 2, 3, 4])
+
+    def test_should_return_data_when_pages_count_changed(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3]])
+        request = EsiEtagRequest("dummy", 42)
+        request.fetch(endpoint)
+        request.save_etags()
+        endpoint.pages = [[1, 2]]
+        # when
+        result = EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # then
+        self.assertListEqual(result, [1, 2])
+
+    def test_should_not_use_pages_for_unpaginated_endpoints(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2]])
+        request = EsiEtagRequest("dummy", 42, paginated=False)
+        # when
+        result = request.fetch(endpoint)
+        # then
+        self.assertListEqual(result, [1, 2])
+        self.assertNotIn("page", endpoint.calls[0])
+
+    def test_should_keep_etags_separate_for_key_parts(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2]])
+        request = EsiEtagRequest("dummy", 42)
+        request.fetch(endpoint)
+        request.save_etags()
+        # when
+        result = EsiEtagRequest("dummy", 43).fetch(endpoint)
+        # then
+        self.assertListEqual(result, [1, 2])
+
+    def test_should_return_data_when_etags_were_cleared(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2], [3]])
+        request = EsiEtagRequest("dummy", 42)
+        request.fetch(endpoint)
+        request.save_etags()
+        # when
+        EsiEtagRequest("dummy", 42).clear_etags()
+        result = EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # then
+        self.assertListEqual(result, [1, 2, 3])
+        self.assertNotIn("_request_options", endpoint.calls[-1])
+
+    def test_should_handle_clients_not_returning_response(self):
+        # given
+        def endpoint(**kwargs):
+            operation = Mock()
+            operation.result.return_value = [1, 2]
+            return operation
+
+        # when
+        result = EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # then
+        self.assertListEqual(result, [1, 2])
+
+    @patch(MODULE_PATH + ".STRUCTURES_ESI_ETAG_TIMEOUT", 0)
+    def test_should_always_return_data_when_disabled(self):
+        # given
+        endpoint = FakeEsiEndpoint([[1, 2]])
+        request = EsiEtagRequest("dummy", 42)
+        request.fetch(endpoint)
+        request.save_etags()
+        # when
+        result = EsiEtagRequest("dummy", 42).fetch(endpoint)
+        # then
+        self.assertListEqual(result, [1, 2])
+        self.assertNotIn("_request_options", endpoint.calls[-1])
@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+from eveuniverse.models import EveEntity, EveMoon, EveSolarSystem, EveType
+
+from app_utils.testing import NoSocketsTestCase
+
+from structures.core.notification_objects import NotificationObjects
+from structures.core.notification_types import NotificationType
+from structures.tests.testdata.factories_2 import (
+    EveEntityCharacterFactory,
+    EveEntityCorporationFactory,
+    NotificationFactory,
+    StarbaseFactory,
+    StructureFactory,
+)
+from structures.tests.testdata.load_eveuniverse import load_eveuniverse
+
+MODULE_PATH = "structures.core.notification_objects"
+
+
+class TestNotificationObjects(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        load_eveuniverse()
+
+    def test_should_load_referenced_objects_for_all_notifications(self):
+        # given
+        structure = StructureFactory()
+        starbase = StarbaseFactory()
+        character = EveEntityCharacterFactory()
+        corporation = EveEntityCorporationFactory()
+        notif_1 = NotificationFactory(
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            text_from_dict={
+                "charID": character.id,
+                "corpID": corporation.id,
+                "solarsystemID": structure.eve_solar_system_id,
+                "structureID": structure.id,
+                "structureTypeID": structure.eve_type_id,
+            },
+        )
+        notif_2 = NotificationFactory(
+            notif_type=NotificationType.TOWER_ALERT_MSG,
+            text_from_dict={
+                "moonID": starbase.eve_moon_id,
+                "solarSystemID": starbase.eve_solar_system_id,
+                "typeID": starbase.eve_type_id,
+            },
+        )
+        # when
+        objects = NotificationObjects.from_notifications([notif_1, notif_2])
+        # then
+        with self.assertNumQueries(0):
+            self.assertEqual(objects.get(EveEntity, character.id), character)
+            self.assertEqual(objects.get(EveEntity, corporation.id), corporation)
+            self.assertEqual(
+                objects.get(EveSolarSystem, structure.eve_solar_system_id),
+                structure.eve_solar_system,
+            )
+            self.assertEqual(
+                objects.get(EveType, structure.eve_type_id).name, "Astrahus"
+            )
+            self.assertEqual(
+                objects.get(EveMoon, starbase.eve_moon_id), starbase.eve_moon
+            )
+            self.assertEqual(objects.structure(structure.id), structure)
+
+    def test_should_return_none_for_unknown_structure(self):
+        # given
+        notif = NotificationFactory(
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            text_from_dict={"structureID": 1_000_000_000_001},
+        )
+        objects = NotificationObjects.from_notifications([notif])
+        # when/then
+        with self.assertNumQueries(0):
+            self.assertIsNone(objects.structure(1_000_000_000_001))
+
+    def test_should_fetch_objects_which_were_not_loaded(self):
+        # given
+        objects = NotificationObjects.from_notifications([])
+        structure = StructureFactory()
+        # when
+        eve_type = objects.get(EveType, structure.eve_type_id)
+        # then
+        self.assertEqual(eve_type.name, "Astrahus")
+        self.assertEqual(objects.structure(structure.id), structure)
+
+    @patch(MODULE_PATH + ".EveEntity.objects.update_from_esi_by_id", spec=True)
+    def test_should_resolve_missing_entities_at_once(self, mock_update_from_esi):
+        # given
+        character = EveEntityCharacterFactory()
+        notif_1 = NotificationFactory(
+            text_from_dict={"charID": character.id, "corpID": 2001}
+        )
+        notif_2 = NotificationFactory(text_from_dict={"allianceID": 3001})
+        # when
+        NotificationObjects.from_notifications([notif_1, notif_2])
+        # then
+        self.assertEqual(mock_update_from_esi.call_count, 1)
+        self.assertSetEqual(mock_update_from_esi.call_args[0][0], {2001, 3001})
+
+    @patch(MODULE_PATH + ".EveEntity.objects.update_from_esi_by_id", spec=True)
+    def test_should_ignore_esi_errors_when_resolving_entities(
+        self, mock_update_from_esi
+    ):
+        # given
+        mock_update_from_esi.side_effect = OSError
+        notif = NotificationFactory(text_from_dict={"corpID": 2001})
+        # when
+        objects = NotificationObjects.from_notifications([notif])
+        # then
+        self.assertTrue(mock_update_from_esi.called)
+        self.assertIsInstance(objects, NotificationObjects)
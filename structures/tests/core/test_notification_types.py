@@ -42,6 +42,24 @@ class TestNotificationType(TestCase):
         self.assertIn(NotificationType.STRUCTURE_REFUELED_EXTRA, types)
         self.assertIn(NotificationType.TOWER_REFUELED_EXTRA, types)
 
+    def test_should_return_default_high_priority_types(self):
+        # when
+        with patch(MODULE_PATH + ".STRUCTURES_NOTIFICATION_HIGH_PRIORITY_TYPES", None):
+            values = NotificationType.relevant_for_high_priority()
+        # then
+        self.assertIn(NotificationType.STRUCTURE_UNDER_ATTACK, values)
+        self.assertNotIn(NotificationType.STRUCTURE_FUEL_ALERT, values)
+
+    def test_should_return_configured_high_priority_types(self):
+        # when
+        with patch(
+            MODULE_PATH + ".STRUCTURES_NOTIFICATION_HIGH_PRIORITY_TYPES",
+            ["StructureFuelAlert", "UnknownType"],
+        ):
+            values = NotificationType.relevant_for_high_priority()
+        # then
+        self.assertSetEqual(values, {NotificationType.STRUCTURE_FUEL_ALERT})
+
     def test_has_correct_esi_values(self):
         # given
         esi_valid_notification_types = {
@@ -89,3 +89,43 @@ class TestStarbasesFuelDuration(NoSocketsTestCase):
         # when
         with self.assertRaises(ValueError):
             starbases.fuel_duration(starbase_type=astrahus_type, fuel_quantity=80)
+
+
+class TestModulesIndex(NoSocketsTestCase):
+    def test_should_return_modules_in_neighboring_cells(self):
+        # given
+        index = starbases.ModulesIndex(cell_size=100)
+        index.add("a", 1, 50, 50, 50)
+        index.add("b", 1, 150, 50, 50)
+        index.add("c", 1, -50, -50, -50)
+        index.add("d", 1, 350, 50, 50)
+        # when
+        result = index.candidates(1, 60, 60, 60)
+        # then
+        self.assertListEqual(result, ["a", "b", "c"])
+
+    def test_should_only_return_modules_from_same_solar_system(self):
+        # given
+        index = starbases.ModulesIndex(cell_size=100)
+        index.add("a", 1, 50, 50, 50)
+        index.add("b", 2, 50, 50, 50)
+        # when
+        result = index.candidates(2, 50, 50, 50)
+        # then
+        self.assertListEqual(result, ["b"])
+
+    def test_should_return_modules_in_order_they_were_added(self):
+        # given
+        index = starbases.ModulesIndex(cell_size=100)
+        index.add("a", 1, 150, 50, 50)
+        index.add("b", 1, 50, 50, 50)
+        index.add("c", 1, 120, 50, 50)
+        # when
+        result = index.candidates(1, 100, 50, 50)
+        # then
+        self.assertListEqual(result, ["a", "b", "c"])
+        self.assertEqual(len(index), 3)
+
+    def test_should_return_empty_list_when_nothing_found(self):
+        index = starbases.ModulesIndex()
+        self.assertListEqual(index.candidates(1, 0, 0, 0), [])
@@ -0,0 +1,201 @@
+from unittest.mock import patch
+
+from app_utils.testing import NoSocketsTestCase
+
+from structures.core.notification_types import NotificationType
+from structures.core.webhook_routes import WebhookRoutes, invalidate_webhook_routes
+from structures.tests.testdata.factories_2 import (
+    NotificationFactory,
+    OwnerFactory,
+    PocoFactory,
+    StarbaseFactory,
+    StructureFactory,
+    WebhookFactory,
+)
+from structures.tests.testdata.load_eveuniverse import load_eveuniverse
+
+MODULE_PATH = "structures.core.webhook_routes"
+
+
+class TestWebhookRoutes(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        load_eveuniverse()
+
+    def setUp(self) -> None:
+        # routes cached by a test must not be used by other tests
+        self.addCleanup(invalidate_webhook_routes)
+
+    def test_should_return_owner_webhooks_for_notif_type(self):
+        # given
+        webhook_1 = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK]
+        )
+        webhook_2 = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_DESTROYED]
+        )
+        webhook_3 = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK],
+            is_active=False,
+        )
+        owner = OwnerFactory(webhooks=[webhook_1, webhook_2, webhook_3])
+        notif = NotificationFactory(
+            owner=owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+        )
+        # when
+        routes = WebhookRoutes.for_owner(owner)
+        # then
+        self.assertListEqual(routes.webhook_ids(notif), [webhook_1.pk])
+        self.assertListEqual(routes.webhooks(notif), [webhook_1])
+
+    def test_should_return_structure_webhooks_for_structure_notif(self):
+        # given
+        webhook_owner = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK]
+        )
+        owner = OwnerFactory(webhooks=[webhook_owner])
+        webhook_structure = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK]
+        )
+        structure = StructureFactory(owner=owner, webhooks=[webhook_structure])
+        notif = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            text_from_dict={"structureID": structure.id},
+        )
+        # when
+        routes = WebhookRoutes.for_owner(owner)
+        # then
+        self.assertListEqual(routes.webhook_ids(notif), [webhook_structure.pk])
+
+    def test_should_return_structure_webhooks_for_poco_and_starbase_notifs(self):
+        # given
+        owner = OwnerFactory(webhooks=[WebhookFactory()])
+        webhook_poco = WebhookFactory(
+            notification_types=[NotificationType.ORBITAL_ATTACKED]
+        )
+        poco = PocoFactory(owner=owner, webhooks=[webhook_poco])
+        webhook_starbase = WebhookFactory(
+            notification_types=[NotificationType.TOWER_ALERT_MSG]
+        )
+        starbase = StarbaseFactory(owner=owner, webhooks=[webhook_starbase])
+        notif_poco = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.ORBITAL_ATTACKED,
+            text_from_dict={"planetID": poco.eve_planet_id, "typeID": poco.eve_type_id},
+        )
+        notif_starbase = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.TOWER_ALERT_MSG,
+            text_from_dict={
+                "moonID": starbase.eve_moon_id,
+                "typeID": starbase.eve_type_id,
+            },
+        )
+        # when
+        routes = WebhookRoutes.for_owner(owner)
+        # then
+        self.assertListEqual(routes.webhook_ids(notif_poco), [webhook_poco.pk])
+        self.assertListEqual(routes.webhook_ids(notif_starbase), [webhook_starbase.pk])
+
+    def test_should_return_owner_webhooks_when_notif_has_multiple_structures(self):
+        # given
+        notif_type = NotificationType.STRUCTURE_REINFORCEMENT_CHANGED
+        webhook_owner = WebhookFactory(notification_types=[notif_type])
+        owner = OwnerFactory(webhooks=[webhook_owner])
+        structure_1 = StructureFactory(
+            owner=owner, webhooks=[WebhookFactory(notification_types=[notif_type])]
+        )
+        structure_2 = StructureFactory(
+            owner=owner, webhooks=[WebhookFactory(notification_types=[notif_type])]
+        )
+        notif = NotificationFactory(
+            owner=owner,
+            notif_type=notif_type,
+            text_from_dict={
+                "allStructureInfo": [
+                    [structure_1.id, "Alpha", 35832],
+                    [structure_2.id, "Bravo", 35832],
+                ]
+            },
+        )
+        # when
+        routes = WebhookRoutes.for_owner(owner)
+        # then
+        self.assertListEqual(routes.webhook_ids(notif), [webhook_owner.pk])
+
+    @patch(MODULE_PATH + "._is_in_transaction", lambda: False)
+    def test_should_use_cached_routes(self):
+        # given
+        webhook = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK]
+        )
+        owner = OwnerFactory(webhooks=[webhook])
+        notif = NotificationFactory(
+            owner=owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+        )
+        WebhookRoutes.for_owner(owner)
+        # when
+        with self.assertNumQueries(0):
+            routes = WebhookRoutes.for_owner(owner)
+        # then
+        self.assertListEqual(routes.webhook_ids(notif), [webhook.pk])
+
+    @patch(MODULE_PATH + "._is_in_transaction", lambda: False)
+    def test_should_rebuild_routes_when_webhooks_changed(self):
+        # given
+        webhook_1 = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK]
+        )
+        owner = OwnerFactory(webhooks=[webhook_1])
+        notif = NotificationFactory(
+            owner=owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+        )
+        WebhookRoutes.for_owner(owner)
+        webhook_2 = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK]
+        )
+        owner.webhooks.add(webhook_2)
+        webhook_1.is_active = False
+        webhook_1.save()
+        # when
+        routes = WebhookRoutes.for_owner(owner)
+        # then
+        self.assertListEqual(routes.webhook_ids(notif), [webhook_2.pk])
+
+    @patch(MODULE_PATH + "._is_in_transaction", lambda: False)
+    def test_should_rebuild_routes_of_owner_when_structure_deleted(self):
+        # given
+        webhook_owner = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK]
+        )
+        owner = OwnerFactory(webhooks=[webhook_owner])
+        webhook_structure = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK]
+        )
+        structure = StructureFactory(owner=owner, webhooks=[webhook_structure])
+        notif = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            text_from_dict={"structureID": structure.id},
+        )
+        WebhookRoutes.for_owner(owner)
+        # when
+        structure.delete()
+        routes = WebhookRoutes.for_owner(owner)
+        # then
+        self.assertListEqual(routes.webhook_ids(notif), [webhook_owner.pk])
+
+    @patch(MODULE_PATH + "._is_in_transaction", lambda: False)
+    def test_should_keep_routes_of_other_owners_when_structure_deleted(self):
+        # given
+        owner_1 = OwnerFactory(webhooks=[WebhookFactory()])
+        owner_2 = OwnerFactory(webhooks=[WebhookFactory()])
+        structure = StructureFactory(owner=owner_1)
+        WebhookRoutes.for_owner(owner_2)
+        # when
+        structure.delete()
+        # then
+        with self.assertNumQueries(0):
+            WebhookRoutes.for_owner(owner_2)
@@ -1,6 +1,9 @@
 import datetime as dt
 from unittest.mock import patch
 
+import dhooks_lite
+import yaml
+
 from django.utils.timezone import now
 from eveuniverse.models import EveEntity
 
@@ -55,6 +58,114 @@ class TestNotification(NoSocketsTestCase):
         self.assertEqual(parsed_text["structureName"], "Dummy")
         self.assertEqual(parsed_text["solarSystemID"], 30002537)
 
+    def test_should_store_parsed_text_when_saved(self):
+        # when
+        obj = Notification.objects.get(notification_id=1000000404)
+        # then
+        self.assertEqual(obj.text_parsed["structureName"], "Dummy")
+
+    def test_should_not_parse_yaml_when_loaded(self):
+        # when
+        with patch(MODULE_PATH + ".yaml", wraps=yaml) as mock_yaml:
+            obj = Notification.objects.get(notification_id=1000000404)
+            parsed_text = obj.parsed_text()
+        # then
+        self.assertEqual(parsed_text["structureName"], "Dummy")
+        self.assertFalse(mock_yaml.load.called)
+
+    def test_should_parse_yaml_lazily_when_not_stored(self):
+        # given
+        obj = Notification.objects.get(notification_id=1000000404)
+        Notification.objects.filter(pk=obj.pk).update(text_parsed=None)
+        # when
+        with patch(MODULE_PATH + ".yaml", wraps=yaml) as mock_yaml:
+            obj = Notification.objects.get(pk=obj.pk)
+            self.assertFalse(mock_yaml.load.called)
+            parsed_text = obj.parsed_text()
+        # then
+        self.assertEqual(parsed_text["structureName"], "Dummy")
+        self.assertTrue(mock_yaml.load.called)
+
+    def test_should_parse_text_again_when_changed(self):
+        # given
+        obj = Notification.objects.get(notification_id=1000000404)
+        obj.parsed_text()
+        # when
+        obj.text = "structureName: Changed\n"
+        parsed_text = obj.parsed_text()
+        # then
+        self.assertEqual(parsed_text, {"structureName": "Changed"})
+
+    def test_should_store_parsed_text_again_when_text_changed(self):
+        # given
+        obj = Notification.objects.get(notification_id=1000000404)
+        # when
+        obj.text = "structureName: Changed\n"
+        obj.save()
+        # then
+        obj.refresh_from_db()
+        self.assertEqual(obj.text_parsed, {"structureName": "Changed"})
+
+    def test_should_store_parsed_text_again_when_only_text_is_saved(self):
+        # given
+        obj = Notification.objects.get(notification_id=1000000404)
+        # when
+        obj.text = "structureName: Changed\n"
+        obj.save(update_fields=["text"])
+        # then
+        obj = Notification.objects.get(pk=obj.pk)
+        self.assertEqual(obj.text_parsed, {"structureName": "Changed"})
+
+    def test_should_restore_stored_parsed_text_without_loss(self):
+        # given
+        obj = Notification(text="dueDate: 2023-11-01\nvolumes:\n  46300: 1.5\n")
+        # when
+        obj.text_parsed = obj.text_parsed_for_storage()
+        obj._parsed_text = None
+        # then
+        self.assertEqual(
+            obj.parsed_text(),
+            {"dueDate": dt.date(2023, 11, 1), "volumes": {46300: 1.5}},
+        )
+
+    def test_should_not_store_parsed_text_which_can_not_be_stored_as_json(self):
+        # given
+        obj = Notification(text="true: 1\n")
+        # when
+        result = obj.text_parsed_for_storage()
+        # then
+        self.assertIsNone(result)
+        self.assertEqual(obj.parsed_text(), {True: 1})
+
+    def test_should_store_references_when_saved(self):
+        # when
+        obj = Notification.objects.get(notification_id=1000000404)
+        # then
+        self.assertEqual(obj.ref_structure_id, 1000000000002)
+        self.assertEqual(obj.ref_moon_id, 40161465)
+        self.assertEqual(obj.ref_solar_system_id, 30002537)
+        self.assertEqual(obj.ref_type_id, 35835)
+        self.assertIsNone(obj.ref_planet_id)
+
+    def test_should_extract_references_from_alternative_keys(self):
+        # given
+        obj = Notification(text="solarsystemID: 30002537\nstructureTypeID: 35832\n")
+        # when
+        obj.update_references()
+        # then
+        self.assertEqual(obj.ref_solar_system_id, 30002537)
+        self.assertEqual(obj.ref_type_id, 35832)
+
+    def test_should_ignore_references_which_are_not_ids(self):
+        # given
+        obj = Notification(text="structureID: abc\nmoonID: true\nplanetID: -1\n")
+        # when
+        obj.update_references()
+        # then
+        self.assertIsNone(obj.ref_structure_id)
+        self.assertIsNone(obj.ref_moon_id)
+        self.assertIsNone(obj.ref_planet_id)
+
     def test_is_npc_attacking(self):
         x1 = Notification.objects.get(notification_id=1000000509)
         self.assertFalse(x1.is_npc_attacking())
@@ -486,6 +597,49 @@ class TestNotificationSendToConfiguredWebhooks(NoSocketsTestCase):
         self.assertTrue(result)
         self.assertTrue(mock_send_to_webhook.called)
 
+    @patch(MODULE_PATH + ".Webhook.send_message")
+    def test_should_render_embed_once_per_language(self, mock_send_message):
+        # given
+        mock_send_message.return_value = 1
+        notif_types = [NotificationType.STRUCTURE_REFUELED_EXTRA]
+        webhook_1 = create_webhook(notification_types=notif_types, language_code="en")
+        webhook_2 = create_webhook(notification_types=notif_types, language_code="en")
+        webhook_3 = create_webhook(notification_types=notif_types, language_code="de")
+        self.owner.webhooks.add(webhook_1, webhook_2, webhook_3)
+        notif = create_notification(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_REFUELED_EXTRA
+        )
+        # when
+        with patch(
+            MODULE_PATH + ".Notification._generate_embed",
+            return_value=(dhooks_lite.Embed(description="dummy"), None),
+        ) as mock_generate_embed:
+            result = notif.send_to_configured_webhooks()
+        # then
+        self.assertTrue(result)
+        self.assertEqual(mock_send_message.call_count, 3)
+        languages = sorted(call[0][0] for call in mock_generate_embed.call_args_list)
+        self.assertListEqual(languages, ["de", "en"])
+        embeds = [call[1]["embeds"][0] for call in mock_send_message.call_args_list]
+        self.assertIs(embeds[0], embeds[1])
+
+    @patch(MODULE_PATH + ".Webhook.send_message")
+    def test_should_return_false_when_rendering_embed_failed(self, mock_send_message):
+        # given
+        webhook = create_webhook(
+            notification_types=[NotificationType.STRUCTURE_REFUELED_EXTRA]
+        )
+        self.owner.webhooks.add(webhook)
+        notif = create_notification(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_REFUELED_EXTRA
+        )
+        # when
+        with patch(MODULE_PATH + ".Notification._generate_embed", side_effect=OSError):
+            result = notif.send_to_configured_webhooks()
+        # then
+        self.assertFalse(result)
+        self.assertFalse(mock_send_message.called)
+
 
 @patch(MODULE_PATH + ".Webhook.send_message")
 class TestNotificationSendToWebhook(NoSocketsTestCase):
@@ -532,7 +686,35 @@ class TestNotificationSendToWebhook(NoSocketsTestCase):
         # then
         self.assertTrue(mock_send_message.called)
         _, kwargs = mock_send_message.call_args
-        self.assertEqual(kwargs["embeds"][0].color, Webhook.Color.DANGER)
+        self.assertEqual(kwargs["embeds"][0]["color"], Webhook.Color.DANGER)
+
+    def test_should_send_high_priority_types_with_high_priority(
+        self, mock_send_message
+    ):
+        # given
+        mock_send_message.return_value = 1
+        webhook = create_webhook(
+            notification_types=[NotificationType.STRUCTURE_REFUELED_EXTRA]
+        )
+        self.owner.webhooks.add(webhook)
+        notif = Notification.create_from_structure(
+            self.structure, notif_type=NotificationType.STRUCTURE_REFUELED_EXTRA
+        )
+        for high_priority_types, expected in [
+            (["StructureRefueledExtra"], True),
+            (["StructureUnderAttack"], False),
+        ]:
+            with self.subTest(high_priority_types=high_priority_types):
+                # when
+                with patch(
+                    "structures.core.notification_types."
+                    "STRUCTURES_NOTIFICATION_HIGH_PRIORITY_TYPES",
+                    high_priority_types,
+                ):
+                    notif.send_to_webhook(webhook)
+                # then
+                _, kwargs = mock_send_message.call_args
+                self.assertIs(kwargs["high_priority"], expected)
 
 
 @patch(MODULE_PATH + ".Webhook.send_message", spec=True)
@@ -583,6 +765,17 @@ class TestNotificationSendMessage(NoSocketsTestCase):
         obj.refresh_from_db()
         self.assertTrue(obj.is_sent)
 
+    def test_should_not_store_is_sent_when_requested(self, mock_send_message):
+        # given
+        mock_send_message.return_value = 1
+        obj = Notification.objects.get(notification_id=1000020601)
+        # when
+        obj.send_to_webhook(self.webhook, mark_as_sent=False)
+        # then
+        self.assertTrue(obj.is_sent)
+        obj.refresh_from_db()
+        self.assertFalse(obj.is_sent)
+
     def test_dont_mark_notification_as_sent_when_error(self, mock_send_message):
         # given
         mock_send_message.return_value = 0
@@ -643,7 +836,7 @@ class TestNotificationSendMessage(NoSocketsTestCase):
         # then
         embed = mock_send_message.call_args[1]["embeds"][0]
         self.assertEqual(
-            embed.description[:39], "The Astrahus **(unknown)** in [Amamake]"
+            embed["description"][:39], "The Astrahus **(unknown)** in [Amamake]"
         )
 
     @patch(MODULE_PATH + ".STRUCTURES_DEFAULT_LANGUAGE", "en")
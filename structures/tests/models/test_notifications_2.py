@@ -183,7 +183,7 @@ class TestStructureFuelAlerts(NoSocketsTestCase):
         self.assertTrue(mock_send_message.called)
         _, kwargs = mock_send_message.call_args
         embed = kwargs["embeds"][0]
-        self.assertEqual(embed.color, Webhook.Color.SUCCESS)
+        self.assertEqual(embed["color"], Webhook.Color.SUCCESS)
 
     def test_should_send_fuel_notification_at_start(self, mock_send_message):
         # given
@@ -560,7 +560,7 @@ class TestJumpFuelAlerts(NoSocketsTestCase):
         self.assertTrue(mock_send_message.called)
         _, kwargs = mock_send_message.call_args
         embed = kwargs["embeds"][0]
-        self.assertEqual(embed.color, Webhook.Color.SUCCESS)
+        self.assertEqual(embed["color"], Webhook.Color.SUCCESS)
 
     @patch(MODULE_PATH + ".Notification.send_to_webhook")
     def test_should_send_fuel_notification_to_configured_webhook_only(
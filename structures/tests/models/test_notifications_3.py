@@ -6,13 +6,14 @@ from django.utils.timezone import now
 from app_utils.testing import NoSocketsTestCase
 
 from structures.core.notification_types import NotificationType
-from structures.models import GeneratedNotification, Structure
+from structures.models import GeneratedNotification, Structure, Webhook
 from structures.tests.testdata.factories_2 import (
     GeneratedNotificationFactory,
     NotificationFactory,
     OwnerFactory,
     StarbaseFactory,
     StructureFactory,
+    WebhookFactory,
 )
 from structures.tests.testdata.load_eveuniverse import load_eveuniverse
 
@@ -165,3 +166,71 @@ class TestProcessTimers(NoSocketsTestCase):
             result = notif.add_or_remove_timer()
         # then
         self.assertFalse(result)
+
+
+class TestWebhookSubscriptions(NoSocketsTestCase):
+    def _subscribed_types(self, webhook: Webhook) -> set:
+        return set(webhook.subscriptions.values_list("notif_type", flat=True))
+
+    def test_should_create_subscriptions_for_new_webhook(self):
+        # when
+        webhook = WebhookFactory(
+            notification_types=[
+                NotificationType.STRUCTURE_UNDER_ATTACK,
+                NotificationType.STRUCTURE_DESTROYED,
+            ]
+        )
+        # then
+        self.assertSetEqual(
+            self._subscribed_types(webhook),
+            {
+                NotificationType.STRUCTURE_UNDER_ATTACK,
+                NotificationType.STRUCTURE_DESTROYED,
+            },
+        )
+
+    def test_should_update_subscriptions_when_notification_types_changed(self):
+        # given
+        webhook = WebhookFactory(
+            notification_types=[
+                NotificationType.STRUCTURE_UNDER_ATTACK,
+                NotificationType.STRUCTURE_DESTROYED,
+            ]
+        )
+        # when
+        webhook.notification_types = [
+            NotificationType.STRUCTURE_DESTROYED,
+            NotificationType.TOWER_ALERT_MSG,
+        ]
+        webhook.save()
+        # then
+        self.assertSetEqual(
+            self._subscribed_types(webhook),
+            {NotificationType.STRUCTURE_DESTROYED, NotificationType.TOWER_ALERT_MSG},
+        )
+
+    def test_should_not_update_subscriptions_when_other_fields_saved(self):
+        # given
+        webhook = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_UNDER_ATTACK]
+        )
+        webhook.notification_types = [NotificationType.TOWER_ALERT_MSG]
+        # when
+        with self.assertNumQueries(1):
+            webhook.save(update_fields=["name"])
+        # then
+        self.assertSetEqual(
+            self._subscribed_types(webhook), {NotificationType.STRUCTURE_UNDER_ATTACK}
+        )
+
+    def test_should_not_match_notification_types_by_prefix(self):
+        # given
+        webhook = WebhookFactory(
+            notification_types=[NotificationType.STRUCTURE_JUMP_FUEL_ALERT]
+        )
+        # when
+        result = Webhook.objects.filter(
+            subscriptions__notif_type=NotificationType.STRUCTURE_FUEL_ALERT
+        )
+        # then
+        self.assertNotIn(webhook, result)
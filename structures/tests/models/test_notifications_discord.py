@@ -10,6 +10,7 @@ if "discord" in app_labels():
 
     from app_utils.testing import NoSocketsTestCase
 
+    from structures.core.discord_roles import invalidate_discord_roles
     from structures.models import Notification
     from structures.tests.testdata.factories import create_webhook
     from structures.tests.testdata.helpers import (
@@ -37,6 +38,9 @@ if "discord" in app_labels():
         def setUp(self):
             _, self.owner = set_owner_character(character_id=1001)
             load_notification_entities(self.owner)
+            # roles cached by a test must not be used by other tests
+            invalidate_discord_roles()
+            self.addCleanup(invalidate_discord_roles)
 
         @staticmethod
         def _my_group_to_role(group: Group) -> dict:
@@ -129,3 +133,107 @@ if "discord" in app_labels():
             self.assertTrue(mock_import_discord.called)
             _, kwargs = mock_send_message.call_args
             self.assertFalse(re.search(r"(<@&\d+>)", kwargs["content"]))
+
+        def test_should_fetch_roles_only_once(
+            self, mock_send_message, mock_import_discord
+        ):
+            # given
+            mock_send_message.return_value = 1
+            mock_group_to_role = mock_import_discord.return_value.objects.group_to_role
+            mock_group_to_role.side_effect = self._my_group_to_role
+            webhook_1 = create_webhook()
+            webhook_1.ping_groups.add(self.group_1)
+            webhook_2 = create_webhook()
+            webhook_2.ping_groups.add(self.group_1)
+            obj = Notification.objects.get(notification_id=1000000509)
+            # when
+            obj.send_to_webhook(webhook_1)
+            obj.send_to_webhook(webhook_2)
+            # then
+            self.assertEqual(mock_group_to_role.call_count, 1)
+            for _, kwargs in mock_send_message.call_args_list:
+                self.assertIn(f"<@&{self.group_1.pk}>", kwargs["content"])
+
+        def test_should_fetch_roles_again_after_group_changed(
+            self, mock_send_message, mock_import_discord
+        ):
+            # given
+            mock_send_message.return_value = 1
+            mock_group_to_role = mock_import_discord.return_value.objects.group_to_role
+            mock_group_to_role.side_effect = self._my_group_to_role
+            webhook_1 = create_webhook()
+            webhook_1.ping_groups.add(self.group_1)
+            webhook_2 = create_webhook()
+            webhook_2.ping_groups.add(self.group_1)
+            obj = Notification.objects.get(notification_id=1000000509)
+            obj.send_to_webhook(webhook_1)
+            # when
+            self.group_1.save()
+            obj.send_to_webhook(webhook_2)
+            # then
+            self.assertEqual(mock_group_to_role.call_count, 2)
+
+        def test_should_not_cache_roles_when_http_error(
+            self, mock_send_message, mock_import_discord
+        ):
+            # given
+            mock_send_message.return_value = 1
+            mock_group_to_role = mock_import_discord.return_value.objects.group_to_role
+            mock_group_to_role.side_effect = HTTPError
+            webhook_1 = create_webhook()
+            webhook_1.ping_groups.add(self.group_1)
+            webhook_2 = create_webhook()
+            webhook_2.ping_groups.add(self.group_1)
+            obj = Notification.objects.get(notification_id=1000000509)
+            obj.send_to_webhook(webhook_1)
+            mock_group_to_role.side_effect = self._my_group_to_role
+            # when
+            obj.send_to_webhook(webhook_2)
+            # then
+            _, kwargs = mock_send_message.call_args
+            self.assertIn(f"<@&{self.group_1.pk}>", kwargs["content"])
+
+        @patch("structures.core.discord_roles.MISSING_ROLE_CACHE_TIMEOUT", 0)
+        def test_should_fetch_missing_roles_again_after_short_time(
+            self, mock_send_message, mock_import_discord
+        ):
+            # given
+            mock_send_message.return_value = 1
+            mock_group_to_role = mock_import_discord.return_value.objects.group_to_role
+            mock_group_to_role.return_value = None
+            webhook_1 = create_webhook()
+            webhook_1.ping_groups.add(self.group_1)
+            webhook_2 = create_webhook()
+            webhook_2.ping_groups.add(self.group_1)
+            obj = Notification.objects.get(notification_id=1000000509)
+            obj.send_to_webhook(webhook_1)
+            mock_group_to_role.side_effect = self._my_group_to_role
+            # when
+            obj.send_to_webhook(webhook_2)
+            # then
+            _, kwargs = mock_send_message.call_args
+            self.assertIn(f"<@&{self.group_1.pk}>", kwargs["content"])
+
+        def test_should_compute_pings_once_per_owner_and_webhook(
+            self, mock_send_message, mock_import_discord
+        ):
+            # given
+            mock_send_message.return_value = 1
+            obj_1 = Notification.objects.get(notification_id=1000000509)
+            obj_2 = Notification.objects.get(notification_id=1000000509)
+            webhook = create_webhook(notification_types=[obj_1.notif_type])
+            self.owner.webhooks.clear()
+            self.owner.webhooks.add(webhook)
+            group_pings = {}
+            # when
+            with patch(
+                MODULE_PATH + ".Notification._generate_discord_group_pings"
+            ) as mock_generate:
+                mock_generate.return_value = " <@&99>"
+                obj_1.send_to_configured_webhooks(group_pings=group_pings)
+                obj_2.send_to_configured_webhooks(group_pings=group_pings)
+            # then
+            self.assertEqual(mock_generate.call_count, 1)
+            self.assertEqual(mock_send_message.call_count, 2)
+            for _, kwargs in mock_send_message.call_args_list:
+                self.assertIn("<@&99>", kwargs["content"])
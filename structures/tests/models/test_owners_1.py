@@ -5,7 +5,7 @@ from unittest.mock import patch
 from django.utils.timezone import now, utc
 from esi.errors import TokenError
 from esi.models import Token
-from eveuniverse.models import EveSolarSystem
+from eveuniverse.models import EvePlanet, EveSolarSystem
 
 from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
 from app_utils.testing import NoSocketsTestCase, create_user_from_evecharacter
@@ -245,6 +245,26 @@ class TestOwnerHasSov(NoSocketsTestCase):
         self.assertFalse(self.owner.has_sov(system))
 
 
+class TestOwnerPlanetsByName(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        load_eveuniverse()
+
+    def test_should_return_planets_of_solar_systems_by_name(self):
+        # given
+        planet = EvePlanet.objects.get(name="Amamake V")
+        # when
+        with self.assertNumQueries(1):
+            result = Owner._planets_by_name([planet.eve_solar_system_id])
+        # then
+        self.assertEqual(result["Amamake V"], (planet.id, planet.eve_type.name))
+        self.assertTrue(all(name.startswith("Amamake ") for name in result.keys()))
+
+    def test_should_return_empty_dict_when_no_solar_systems(self):
+        self.assertDictEqual(Owner._planets_by_name([]), {})
+
+
 @patch(MODULE_PATH + ".notify")
 @patch(MODULE_PATH + ".notify_admins")
 class TestOwnerFetchToken(NoSocketsTestCase):
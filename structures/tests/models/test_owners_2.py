@@ -1,10 +1,17 @@
 import datetime as dt
 from unittest.mock import patch
 
+from bravado.exception import HTTPClientError, HTTPNotFound
+
 from django.utils.timezone import now, utc
 from eveuniverse.models import EvePlanet
 
-from app_utils.esi_testing import EsiClientStub, EsiEndpoint
+from app_utils.esi_testing import (
+    BravadoOperationStub,
+    BravadoResponseStub,
+    EsiClientStub,
+    EsiEndpoint,
+)
 from app_utils.testing import NoSocketsTestCase, create_user_from_evecharacter
 
 from structures.core.notification_types import NotificationType
@@ -956,13 +963,40 @@ class TestUpdateStructuresEsi(NoSocketsTestCase):
         structure = Structure.objects.get(id=1000000000002)
         self.assertEqual(structure.name, "(no data)")
 
+    @patch(MODULE_PATH + ".STRUCTURES_ESI_MAX_WORKERS", 1)
+    @patch(MODULE_PATH + ".STRUCTURES_FEATURE_STARBASES", False)
+    @patch(MODULE_PATH + ".STRUCTURES_FEATURE_CUSTOMS_OFFICES", False)
+    def test_should_stop_fetching_structure_infos_when_error_limited(self, mock_esi):
+        # given
+        calls = []
+
+        def my_side_effect(**kwargs):
+            calls.append(kwargs["structure_id"])
+            raise HTTPClientError(response=BravadoResponseStub(420, "Error limited"))
+
+        new_endpoint = EsiEndpoint(
+            "Universe",
+            "get_universe_structures_structure_id",
+            side_effect=my_side_effect,
+        )
+        mock_esi.client = self.esi_client_stub.replace_endpoints([new_endpoint])
+        owner = create_owner_from_user(self.user)
+        # when
+        owner.update_structures_esi()
+        # then
+        self.assertFalse(owner.is_structure_sync_fresh)
+        self.assertEqual(len(calls), 1)
+        self.assertSetEqual(
+            set(owner.structures.values_list("name", flat=True)), {"(no data)"}
+        )
+
     @patch(MODULE_PATH + ".STRUCTURES_FEATURE_STARBASES", False)
     @patch(MODULE_PATH + ".STRUCTURES_FEATURE_CUSTOMS_OFFICES", False)
-    @patch(MODULE_PATH + ".Structure.objects.update_or_create_from_dict")
+    @patch(MODULE_PATH + ".Structure.objects.update_or_create_from_dicts")
     def test_update_will_not_break_on_http_error_when_creating_structures(
         self, mock_create_structure, mock_esi
     ):
-        mock_create_structure.side_effect = OSError
+        mock_create_structure.return_value = []
         mock_esi.client = self.esi_client_stub
         owner = create_owner_from_user(self.user)
         # when
@@ -1304,3 +1338,67 @@ class TestUpdateStructuresEsi(NoSocketsTestCase):
     #     # then
     #     owner.refresh_from_db()
     #     self.assertTrue(owner.is_structure_sync_fresh)
+
+
+class TestOwnerPostItemIdsInChunks(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        load_eveuniverse()
+        load_entities()
+        user, _ = create_user_from_evecharacter(
+            1001,
+            permissions=["structures.add_structure_owner"],
+            scopes=Owner.get_esi_scopes(),
+        )
+        cls.owner = create_owner_from_user(user)
+        cls.token = cls.owner.fetch_token()
+
+    def test_should_post_chunks_and_merge_results_in_order(self):
+        # given
+        def my_esi_method(corporation_id, item_ids, token):
+            return BravadoOperationStub([{"item_id": obj} for obj in item_ids])
+
+        item_ids = list(range(2500))
+        # when
+        result = self.owner._post_item_ids_in_chunks(
+            my_esi_method, item_ids, self.token
+        )
+        # then
+        self.assertListEqual([obj["item_id"] for obj in result], item_ids)
+
+    def test_should_skip_chunks_not_found(self):
+        # given
+        def my_esi_method(corporation_id, item_ids, token):
+            if 0 in item_ids:
+                raise HTTPNotFound(response=BravadoResponseStub(404, "Not found"))
+            return BravadoOperationStub([{"item_id": obj} for obj in item_ids])
+
+        item_ids = list(range(1500))
+        # when
+        result = self.owner._post_item_ids_in_chunks(
+            my_esi_method, item_ids, self.token
+        )
+        # then
+        self.assertListEqual([obj["item_id"] for obj in result], item_ids[999:])
+
+    def test_should_post_all_chunks_for_owner_corporation(self):
+        # given
+        corporation_ids = []
+
+        def my_esi_method(corporation_id, item_ids, token):
+            corporation_ids.append(corporation_id)
+            return BravadoOperationStub([])
+
+        # when
+        self.owner._post_item_ids_in_chunks(
+            my_esi_method, list(range(2500)), self.token
+        )
+        # then
+        self.assertListEqual(corporation_ids, [2001, 2001, 2001])
+
+    def test_should_return_empty_list_when_no_item_ids(self):
+        # when
+        result = self.owner._post_item_ids_in_chunks(None, [], self.token)
+        # then
+        self.assertListEqual(result, [])
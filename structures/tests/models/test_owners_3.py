@@ -18,6 +18,7 @@ from app_utils.testing import (
     queryset_pks,
 )
 
+from structures.core.esi_etags import EsiEtagRequest
 from structures.core.notification_types import NotificationType
 from structures.models import (
     JumpFuelAlertConfig,
@@ -35,7 +36,9 @@ from structures.tests.testdata.factories import (
 )
 from structures.tests.testdata.factories_2 import (
     EveEntityCorporationFactory,
+    NotificationFactory,
     OwnerFactory,
+    StructureFactory,
     datetime_to_esi,
 )
 from structures.tests.testdata.helpers import (
@@ -118,6 +121,22 @@ class TestFetchNotificationsEsi(NoSocketsTestCase):
         )
         self.assertSetEqual(notif_ids_current, {1000000505})
 
+    @patch(OWNERS_PATH + ".EsiEtagRequest.fetch", spec=True)
+    def test_should_skip_storing_when_notifications_not_changed(
+        self, mock_fetch, mock_esi
+    ):
+        # given
+        mock_fetch.return_value = None
+        mock_esi.client = self.esi_client_stub
+        owner = create_owner_from_user(self.user)
+        create_upwell_structure(owner=owner, id=1000000000001)
+        # when
+        owner.fetch_notifications_esi()
+        # then
+        owner.refresh_from_db()
+        self.assertTrue(owner.is_notification_sync_fresh)
+        self.assertFalse(Notification.objects.exists())
+
     @patch(OWNERS_PATH + ".now")
     def test_should_set_moon_for_structure_if_missing(self, mock_now, mock_esi_client):
         # given
@@ -261,6 +280,72 @@ class TestFetchNotificationsEsi2(NoSocketsTestCase):
         obj = owner.notification_set.get(notification_id=42)
         self.assertIsNone(obj.sender)
 
+    def test_should_only_create_new_notifications(self, mock_esi):
+        # given
+        owner = OwnerFactory()
+        sender = EveEntityCorporationFactory()
+        NotificationFactory(owner=owner, notification_id=41)
+        NotificationFactory(owner=owner, notification_id=42)
+        notifications = [
+            {
+                "notification_id": notification_id,
+                "is_read": False,
+                "sender_id": sender.id,
+                "sender_type": "corporation",
+                "text": "warEligible: true\n",
+                "timestamp": datetime_to_esi(now()),
+                "type": "CorpBecameWarEligible",
+            }
+            for notification_id in [42, 43]
+        ]
+        # when
+        result = owner._store_notifications(notifications)
+        # then
+        self.assertListEqual(result, [43])
+        self.assertSetEqual(
+            set(owner.notification_set.values_list("notification_id", flat=True)),
+            {41, 42, 43},
+        )
+        obj = owner.notification_set.get(notification_id=43)
+        self.assertEqual(obj.sender, sender)
+        self.assertEqual(obj.text_parsed, {"warEligible": True})
+
+    @patch(OWNERS_PATH + ".EveEntity.objects.bulk_resolve_ids", spec=True)
+    def test_should_resolve_unknown_senders_at_once(
+        self, mock_bulk_resolve_ids, mock_esi
+    ):
+        # given
+        def bulk_resolve_ids(ids):
+            for id in ids:
+                EveEntityCorporationFactory(id=id)
+            return len(ids)
+
+        mock_bulk_resolve_ids.side_effect = bulk_resolve_ids
+        owner = OwnerFactory()
+        notifications = [
+            {
+                "notification_id": notification_id,
+                "is_read": False,
+                "sender_id": sender_id,
+                "sender_type": "corporation",
+                "text": "{}\n",
+                "timestamp": datetime_to_esi(now()),
+                "type": "CorpBecameWarEligible",
+            }
+            for notification_id, sender_id in [(1, 98000001), (2, 98000002)]
+        ]
+        # when
+        owner._store_notifications(notifications)
+        # then
+        self.assertEqual(mock_bulk_resolve_ids.call_count, 1)
+        self.assertSetEqual(
+            set(mock_bulk_resolve_ids.call_args[0][0]), {98000001, 98000002}
+        )
+        self.assertSetEqual(
+            set(owner.notification_set.values_list("sender_id", flat=True)),
+            {98000001, 98000002},
+        )
+
 
 @override_settings(DEBUG=True)
 @patch(NOTIFICATIONS_PATH + ".STRUCTURES_REPORT_NPC_ATTACKS", True)
@@ -294,7 +379,7 @@ class TestSendNewNotifications1(NoSocketsTestCase):
         self.owner.refresh_from_db()
         self.assertTrue(self.owner.is_forwarding_sync_fresh)
         notifications_processed = {
-            int(args[1]["embeds"][0].footer.text[-10:])
+            int(args[1]["embeds"][0]["footer"]["text"][-10:])
             for args in mock_send_message.call_args_list
         }
         notifications_expected = set(
@@ -320,7 +405,7 @@ class TestSendNewNotifications1(NoSocketsTestCase):
     #     self.owner.refresh_from_db()
     #     self.assertTrue(self.owner.is_forwarding_sync_fresh)
     #     notifications_processed = {
-    #         int(args[1]["embeds"][0].footer.text[-10:])
+    #         int(args[1]["embeds"][0]["footer"]["text"][-10:])
     #         for args in mock_send_message.call_args_list
     #     }
     #     notif_types = set(NotificationType.values)
@@ -349,7 +434,7 @@ class TestSendNewNotifications1(NoSocketsTestCase):
         owner.refresh_from_db()
         self.assertTrue(owner.is_forwarding_sync_fresh)
         notifications_processed = {
-            int(args[1]["embeds"][0].footer.text[-10:])
+            int(args[1]["embeds"][0]["footer"]["text"][-10:])
             for args in mock_send_message.call_args_list
         }
         notifications_expected = set(
@@ -378,7 +463,7 @@ class TestSendNewNotifications1(NoSocketsTestCase):
         self.owner.refresh_from_db()
         self.assertTrue(self.owner.is_forwarding_sync_fresh)
         notifications_processed = {
-            int(args[1]["embeds"][0].footer.text[-10:])
+            int(args[1]["embeds"][0]["footer"]["text"][-10:])
             for args in mock_send_message.call_args_list
         }
         notifications_expected = set(
@@ -440,6 +525,52 @@ class TestSendNewNotifications2(NoSocketsTestCase):
             },
         )
 
+    @patch(NOTIFICATIONS_PATH + ".Webhook.send_message", spec=True)
+    def test_should_mark_only_sent_notifications_as_sent(self, mock_send_message):
+        # given
+        webhook = create_webhook(
+            notification_types=[
+                NotificationType.ORBITAL_ATTACKED,
+                NotificationType.STRUCTURE_DESTROYED,
+            ],
+        )
+        self.owner.webhooks.add(webhook)
+
+        def my_send_message(content, embeds, **kwargs):
+            # notifications are marked as sent before they are forwarded
+            self.assertFalse(
+                self.owner.notification_set.filter(
+                    notif_type__in=[
+                        NotificationType.ORBITAL_ATTACKED,
+                        NotificationType.STRUCTURE_DESTROYED,
+                    ],
+                    is_sent=False,
+                ).exists()
+            )
+            return 0 if "destroyed" in embeds[0]["title"].lower() else 1
+
+        mock_send_message.side_effect = my_send_message
+        # when
+        with patch(
+            NOTIFICATIONS_PATH + ".Notification.save", autospec=True
+        ) as mock_save:
+            self.owner.send_new_notifications()
+        # then
+        self.assertFalse(mock_save.called)
+        notifs = self.owner.notification_set.filter(
+            notif_type__in=[
+                NotificationType.ORBITAL_ATTACKED,
+                NotificationType.STRUCTURE_DESTROYED,
+            ]
+        )
+        self.assertTrue(notifs.exists())
+        for notif in notifs:
+            with self.subTest(notif_type=notif.notif_type):
+                self.assertEqual(
+                    notif.is_sent,
+                    notif.notif_type == NotificationType.ORBITAL_ATTACKED,
+                )
+
     # @patch(OWNERS_PATH + ".Token", spec=True)
     # @patch("structures.helpers.esi_fetch._esi_client")
     # @patch(
@@ -506,6 +637,197 @@ class TestSendNewNotifications2(NoSocketsTestCase):
     #     self.assertSetEqual(results[wh_mining.pk], {1000000402})
 
 
+@patch(OWNERS_PATH + ".Notification.add_or_remove_timer", autospec=True)
+@patch(OWNERS_PATH + ".Notification.send_to_configured_webhooks", autospec=True)
+@patch(OWNERS_PATH + ".Owner.fetch_notifications_esi", spec=True)
+class TestProcessNotifications(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        load_eveuniverse()
+
+    def setUp(self) -> None:
+        Webhook.objects.all().delete()
+        self.owner = OwnerFactory()
+        webhook = create_webhook(
+            notification_types=[
+                NotificationType.STRUCTURE_LOST_SHIELD,
+                NotificationType.STRUCTURE_UNDER_ATTACK,
+            ]
+        )
+        self.owner.webhooks.add(webhook)
+
+    def test_should_forward_only_new_notifications(
+        self, mock_fetch, mock_send_to_configured_webhooks, mock_add_or_remove_timer
+    ):
+        # given
+        NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+        )
+        new_notif = NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+        )
+        mock_fetch.return_value = [new_notif.notification_id]
+        mock_send_to_configured_webhooks.return_value = True
+        # when
+        result = self.owner.process_notifications()
+        # then
+        self.assertTrue(result)
+        notifs_sent = [
+            obj[0][0] for obj in mock_send_to_configured_webhooks.call_args_list
+        ]
+        self.assertListEqual(notifs_sent, [new_notif])
+
+    def test_should_forward_all_pending_notifications_when_requested(
+        self, mock_fetch, mock_send_to_configured_webhooks, mock_add_or_remove_timer
+    ):
+        # given
+        old_notif = NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+        )
+        new_notif = NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+        )
+        mock_fetch.return_value = [new_notif.notification_id]
+        mock_send_to_configured_webhooks.return_value = None
+        # when
+        self.owner.process_notifications(process_all_pending=True)
+        # then
+        notifs_sent = {
+            obj[0][0] for obj in mock_send_to_configured_webhooks.call_args_list
+        }
+        self.assertSetEqual(notifs_sent, {old_notif, new_notif})
+
+    def test_should_add_all_pending_timers_when_requested(
+        self, mock_fetch, mock_send_to_configured_webhooks, mock_add_or_remove_timer
+    ):
+        # given
+        old_notif = NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_LOST_SHIELD
+        )
+        new_notif = NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_LOST_SHIELD
+        )
+        mock_fetch.return_value = [new_notif.notification_id]
+        mock_send_to_configured_webhooks.return_value = True
+        # when
+        self.owner.process_notifications(process_all_pending=True)
+        # then
+        notifs_timers = {obj[0][0] for obj in mock_add_or_remove_timer.call_args_list}
+        self.assertSetEqual(notifs_timers, {old_notif, new_notif})
+
+    def test_should_add_timers_for_new_notifications_only(
+        self, mock_fetch, mock_send_to_configured_webhooks, mock_add_or_remove_timer
+    ):
+        # given
+        NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_LOST_SHIELD
+        )
+        new_notif = NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_LOST_SHIELD
+        )
+        mock_fetch.return_value = [new_notif.notification_id]
+        mock_send_to_configured_webhooks.return_value = True
+        # when
+        self.owner.process_notifications()
+        # then
+        notifs_timers = [obj[0][0] for obj in mock_add_or_remove_timer.call_args_list]
+        self.assertListEqual(notifs_timers, [new_notif])
+
+    def test_should_report_when_forwarding_failed(
+        self, mock_fetch, mock_send_to_configured_webhooks, mock_add_or_remove_timer
+    ):
+        # given
+        new_notif = NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+        )
+        mock_fetch.return_value = [new_notif.notification_id]
+        mock_send_to_configured_webhooks.return_value = False
+        # when
+        result = self.owner.process_notifications()
+        # then
+        self.assertFalse(result)
+
+    def test_should_do_nothing_when_no_new_notifications(
+        self, mock_fetch, mock_send_to_configured_webhooks, mock_add_or_remove_timer
+    ):
+        # given
+        NotificationFactory(
+            owner=self.owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+        )
+        mock_fetch.return_value = []
+        # when
+        result = self.owner.process_notifications()
+        # then
+        self.assertTrue(result)
+        self.assertFalse(mock_send_to_configured_webhooks.called)
+        self.assertFalse(mock_add_or_remove_timer.called)
+
+
+class TestProcessMoonNotifications(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        load_eveuniverse()
+
+    def setUp(self) -> None:
+        self.owner = OwnerFactory()
+
+    def _create_notification(self, structure_id, moon_id, **kwargs):
+        return NotificationFactory(
+            owner=self.owner,
+            notif_type=NotificationType.MOONMINING_EXTRACTION_STARTED,
+            text_from_dict={"moonID": moon_id, "structureID": structure_id},
+            **kwargs,
+        )
+
+    def test_should_set_moons_of_refineries(self):
+        # given
+        refinery_1 = StructureFactory(owner=self.owner, eve_type_id=35835)
+        refinery_2 = StructureFactory(owner=self.owner, eve_type_id=35835)
+        self._create_notification(refinery_1.id, 40161465)
+        self._create_notification(refinery_2.id, 40161466)
+        # when
+        self.owner._process_moon_notifications()
+        # then
+        refinery_1.refresh_from_db()
+        self.assertEqual(refinery_1.eve_moon_id, 40161465)
+        refinery_2.refresh_from_db()
+        self.assertEqual(refinery_2.eve_moon_id, 40161466)
+        self.owner.refresh_from_db()
+        self.assertIsNotNone(self.owner.moons_last_update_at)
+
+    def test_should_ignore_notifications_older_then_last_run(self):
+        # given
+        refinery = StructureFactory(
+            owner=self.owner,
+            eve_type_id=35835,
+            created_at=now() - dt.timedelta(days=2),
+        )
+        self._create_notification(
+            refinery.id, 40161465, created=now() - dt.timedelta(days=1)
+        )
+        self.owner.moons_last_update_at = now() - dt.timedelta(hours=1)
+        # when
+        self.owner._process_moon_notifications()
+        # then
+        refinery.refresh_from_db()
+        self.assertIsNone(refinery.eve_moon_id)
+
+    def test_should_check_older_notifications_for_new_refineries(self):
+        # given
+        refinery = StructureFactory(owner=self.owner, eve_type_id=35835)
+        self._create_notification(
+            refinery.id, 40161465, created=now() - dt.timedelta(days=1)
+        )
+        self.owner.moons_last_update_at = now() - dt.timedelta(hours=1)
+        # when
+        self.owner._process_moon_notifications()
+        # then
+        refinery.refresh_from_db()
+        self.assertEqual(refinery.eve_moon_id, 40161465)
+
+
 @patch(OWNERS_PATH + ".esi")
 class TestOwnerUpdateAssetEsi(NoSocketsTestCase):
     @classmethod
@@ -629,6 +951,49 @@ class TestOwnerUpdateAssetEsi(NoSocketsTestCase):
         self.assertTrue(structure.has_fitting)
         self.assertFalse(structure.has_core)
 
+    @patch(OWNERS_PATH + ".Owner._fetch_locations_for_assets", autospec=True)
+    def test_should_fetch_locations_only_for_anchored_assets(
+        self, mock_fetch_locations, mock_esi
+    ):
+        # given
+        mock_fetch_locations.return_value = {}
+        mock_esi.client = self.esi_client_stub
+        owner = create_owner_from_user(self.user)
+        create_upwell_structure(owner=owner, id=1000000000001)
+        token = owner.fetch_token()
+        # when
+        assets = owner._fetch_structure_assets_from_esi(
+            token, EsiEtagRequest("assets", owner.corporation.corporation_id)
+        )
+        # then
+        self.assertSetEqual(
+            set(assets.keys()),
+            {1300000001001, 1300000001002, 1500000000001, 1500000000002},
+        )
+        _, item_ids, _ = mock_fetch_locations.call_args[0]
+        self.assertListEqual(item_ids, [1500000000001, 1500000000002])
+
+    @patch(OWNERS_PATH + ".EsiEtagRequest.iter_pages", autospec=True)
+    def test_should_skip_storing_when_assets_not_changed(
+        self, mock_iter_pages, mock_esi
+    ):
+        def fake_iter_pages(etag_request, *args, **kwargs):
+            etag_request.is_unchanged = True
+            return iter([])
+
+        # given
+        mock_iter_pages.side_effect = fake_iter_pages
+        mock_esi.client = self.esi_client_stub
+        owner = create_owner_from_user(self.user)
+        structure = create_upwell_structure(owner=owner, id=1000000000001)
+        item = create_structure_item(structure=structure)
+        # when
+        owner.update_asset_esi()
+        # then
+        owner.refresh_from_db()
+        self.assertTrue(owner.is_assets_sync_fresh)
+        self.assertTrue(structure.items.filter(pk=item.pk).exists())
+
     @patch(OWNERS_PATH + ".notify", spec=True)
     def test_should_inform_user_about_successful_update(self, mock_notify, mock_esi):
         # given
@@ -780,6 +1145,67 @@ class TestOwnerUpdateAssetEsi(NoSocketsTestCase):
         # then
         self.assertEqual(structure.jump_fuel_alerts.count(), 0)
 
+    def test_should_keep_jump_fuel_alerts_below_threshold(self, mock_esi):
+        # given
+        endpoints = [
+            EsiEndpoint(
+                "Assets",
+                "get_corporations_corporation_id_assets",
+                "corporation_id",
+                needs_token=True,
+                data={
+                    "2102": [
+                        {
+                            "is_singleton": False,
+                            "item_id": 1300000003001,
+                            "location_flag": "StructureFuel",
+                            "location_id": 1000000000004,
+                            "location_type": "item",
+                            "quantity": 5000,
+                            "type_id": 16273,
+                        }
+                    ]
+                },
+            ),
+            EsiEndpoint(
+                "Assets",
+                "post_corporations_corporation_id_assets_locations",
+                "corporation_id",
+                needs_token=True,
+                data={"2102": []},
+            ),
+        ]
+        mock_esi.client = EsiClientStub.create_from_endpoints(endpoints)
+        user, _ = create_user_from_evecharacter(
+            1102,
+            permissions=["structures.basic_access", "structures.add_structure_owner"],
+            scopes=Owner.get_esi_scopes(),
+        )
+        owner = create_owner_from_user(user)
+        structure = create_upwell_structure(owner=owner, id=1000000000004)
+        config = JumpFuelAlertConfig.objects.create(threshold=10000)
+        structure.jump_fuel_alerts.create(structure=structure, config=config)
+        # when
+        owner.update_asset_esi()
+        # then
+        self.assertEqual(structure.jump_fuel_alerts.count(), 1)
+
+    def test_should_update_fitting_flags_without_saving_structures(self, mock_esi):
+        # given
+        mock_esi.client = self.esi_client_stub
+        owner = create_owner_from_user(self.user)
+        structure = create_upwell_structure(
+            owner=owner, id=1000000000001, has_fitting=False, has_core=False
+        )
+        # when
+        with patch(OWNERS_PATH + ".Structure.save", autospec=True) as mock_save:
+            owner.update_asset_esi()
+        # then
+        structure.refresh_from_db()
+        self.assertTrue(structure.has_fitting)
+        self.assertTrue(structure.has_core)
+        self.assertFalse(mock_save.called)
+
     # TODO: Add tests for error cases
 
     def test_should_update_starbase_items_for_owner(self, mock_esi):
@@ -895,6 +895,110 @@ class TestStructureSave(NoSocketsTestCase):
         self.assertNotIn(default_tag, obj.tags.all())
 
 
+class TestStructureUpdateItems(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        load_eveuniverse()
+        load_entities([EveCharacter])
+        cls.owner = OwnerFactory(
+            corporation=EveCorporationInfo.objects.get(corporation_id=2001)
+        )
+
+    def _make_item(self, structure, item_id, **kwargs):
+        params = {
+            "item_id": item_id,
+            "type_id": EVE_ID_HELIUM_FUEL_BLOCK,
+            "is_singleton": False,
+            "location_flag": StructureItem.LocationFlag.STRUCTURE_FUEL,
+            "quantity": 100,
+        }
+        params.update(kwargs)
+        return params
+
+    def test_should_create_update_and_delete_items(self):
+        # given
+        structure = StructureFactory(owner=self.owner)
+        structure.update_items(
+            [self._make_item(structure, 1), self._make_item(structure, 2)]
+        )
+        item_1 = StructureItem.objects.get(id=1)
+        # when
+        structure.update_items(
+            [
+                self._make_item(structure, 1),
+                self._make_item(structure, 3, quantity=50),
+            ]
+        )
+        # then
+        self.assertSetEqual(set(structure.items.values_list("id", flat=True)), {1, 3})
+        self.assertEqual(StructureItem.objects.get(id=3).quantity, 50)
+        self.assertEqual(
+            StructureItem.objects.get(id=1).last_updated_at, item_1.last_updated_at
+        )
+
+    def test_should_update_changed_items(self):
+        # given
+        structure = StructureFactory(owner=self.owner)
+        structure.update_items([self._make_item(structure, 1)])
+        # when
+        structure.update_items(
+            [
+                self._make_item(
+                    structure,
+                    1,
+                    quantity=42,
+                    location_flag=StructureItem.LocationFlag.CARGO,
+                )
+            ]
+        )
+        # then
+        item = StructureItem.objects.get(id=1)
+        self.assertEqual(item.quantity, 42)
+        self.assertEqual(item.location_flag, StructureItem.LocationFlag.CARGO)
+
+    def test_should_move_items_from_other_structures(self):
+        # given
+        structure_1 = StructureFactory(owner=self.owner)
+        structure_2 = StructureFactory(owner=self.owner)
+        structure_1.update_items([self._make_item(structure_1, 1)])
+        # when
+        structure_2.update_items([self._make_item(structure_2, 1)])
+        # then
+        self.assertEqual(StructureItem.objects.get(id=1).structure, structure_2)
+        self.assertFalse(structure_1.items.exists())
+
+    def test_should_not_write_anything_when_items_unchanged(self):
+        # given
+        structure = StructureFactory(owner=self.owner)
+        structure.update_items([self._make_item(structure, 1)])
+        structure = Structure.objects.get(id=structure.id)
+        # when
+        with self.assertNumQueries(0):
+            structure.update_items([self._make_item(structure, 1)])
+
+    def test_should_not_write_anything_for_structures_without_items(self):
+        # given
+        structure = StructureFactory(owner=self.owner)
+        structure.update_items([])
+        structure = Structure.objects.get(id=structure.id)
+        # when
+        with self.assertNumQueries(0):
+            structure.update_items([])
+
+    def test_should_not_fetch_types_when_items_unchanged(self):
+        # given
+        structure = StructureFactory(owner=self.owner)
+        structure.update_items([self._make_item(structure, 1)])
+        # when
+        with patch(
+            "structures.models.structures_1.StructureItem.from_esi_assets"
+        ) as mock_from_esi_assets:
+            structure.update_items([self._make_item(structure, 1)])
+        # then
+        self.assertFalse(mock_from_esi_assets.called)
+
+
 class TestStructureNoSetup(NoSocketsTestCase):
     def test_structure_get_matching_state(self):
         self.assertEqual(
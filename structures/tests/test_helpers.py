@@ -1,4 +1,5 @@
 import datetime as dt
+import json
 
 from django.test import TestCase
 from django.utils.timezone import now
@@ -10,6 +11,8 @@ from structures.helpers import (
     get_or_create_esi_obj,
     hours_until_deadline,
     is_absolute_url,
+    json_to_yaml_data,
+    yaml_data_to_json,
 )
 
 
@@ -74,6 +77,41 @@ class TestIsAbsoluteUrl(TestCase):
                 self.assertIs(is_absolute_url(url), expected_result)
 
 
+class TestYamlDataToJson(TestCase):
+    def test_should_convert_and_restore_data(self):
+        cases = [
+            ("none", None),
+            ("str", "alpha"),
+            ("int", 42),
+            ("float", 1.5),
+            ("bool", True),
+            ("list", [1, "a", None]),
+            ("dict with str keys", {"a": 1, "b": [2, 3]}),
+            ("dict with int keys", {46300: 1.5, 46301: 2.0}),
+            ("nested dict with int keys", {"volumes": {46300: {1: "a"}}}),
+            ("date", dt.date(2023, 11, 1)),
+            ("datetime", dt.datetime(2023, 11, 1, 12, 30)),
+        ]
+        for name, data in cases:
+            with self.subTest(name=name):
+                result = json_to_yaml_data(
+                    json.loads(json.dumps(yaml_data_to_json(data)))
+                )
+                self.assertEqual(result, data)
+
+    def test_should_raise_error_when_data_can_not_be_converted(self):
+        cases = [
+            ("dict with bool keys", {True: 1}),
+            ("dict with mixed keys", {1: "a", "b": 2}),
+            ("infinite float", float("inf")),
+            ("set", {1, 2}),
+        ]
+        for name, data in cases:
+            with self.subTest(name=name):
+                with self.assertRaises(TypeError):
+                    yaml_data_to_json(data)
+
+
 class TestGetOrCreateEsiObj(TestCase):
     def test_should_return_existing_obj(self):
         # given
@@ -2,7 +2,7 @@ import datetime as dt
 from unittest.mock import patch
 
 from django.utils.timezone import now
-from eveuniverse.models import EveSolarSystem
+from eveuniverse.models import EveSolarSystem, EveType
 
 from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
 from app_utils.esi_testing import EsiClientStub, EsiEndpoint
@@ -532,6 +532,241 @@ class TestStructureManagerCreateFromDict(NoSocketsTestCase):
         self.assertEqual(structure.state, Structure.State.UNKNOWN)
 
 
+class TestStructureManagerCreateFromDicts(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        load_eveuniverse()
+
+    def setUp(self) -> None:
+        create_structures()
+        self.owner = Owner.objects.get(corporation__corporation_id=2001)
+        self.structure = Structure.objects.get(id=1000000000001)
+
+    def _make_structure_dict(self, **kwargs) -> dict:
+        structure = {
+            "fuel_expires": self.structure.fuel_expires_at,
+            "name": self.structure.name,
+            "position": {
+                "x": self.structure.position_x,
+                "y": self.structure.position_y,
+                "z": self.structure.position_z,
+            },
+            "reinforce_hour": self.structure.reinforce_hour,
+            "services": [{"name": "Clone Bay", "state": "online"}],
+            "state": "shield_vulnerable",
+            "structure_id": self.structure.id,
+            "system_id": self.structure.eve_solar_system_id,
+            "type_id": self.structure.eve_type_id,
+        }
+        structure.update(kwargs)
+        return structure
+
+    def test_should_create_and_update_in_given_order(self):
+        # given
+        structures = [
+            self._make_structure_dict(structure_id=1000000000099, name="New"),
+            self._make_structure_dict(name="Updated"),
+        ]
+        # when
+        results = Structure.objects.update_or_create_from_dicts(structures, self.owner)
+        # then
+        self.assertEqual(
+            [(obj.id, created) for obj, created in results],
+            [(1000000000099, True), (1000000000001, False)],
+        )
+        self.assertEqual(Structure.objects.get(id=1000000000099).name, "New")
+        self.assertEqual(Structure.objects.get(id=1000000000001).name, "Updated")
+        new_structure = Structure.objects.get(id=1000000000099)
+        self.assertTrue(new_structure.tags.filter(name="lowsec").exists())
+
+    @patch("structures.models.structures_1.Structure.handle_fuel_notifications")
+    def test_should_handle_fuel_notifications_when_fuel_changed(
+        self, mock_handle_fuel_notifications
+    ):
+        # given
+        fuel_expires = self.structure.fuel_expires_at + dt.timedelta(days=1)
+        structure = self._make_structure_dict(fuel_expires=fuel_expires)
+        # when
+        Structure.objects.update_or_create_from_dicts([structure], self.owner)
+        # then
+        self.assertTrue(mock_handle_fuel_notifications.called)
+
+    @patch("structures.models.structures_1.Structure.handle_fuel_notifications")
+    def test_should_not_handle_fuel_notifications_when_fuel_unchanged(
+        self, mock_handle_fuel_notifications
+    ):
+        # given
+        structure = self._make_structure_dict()
+        # when
+        Structure.objects.update_or_create_from_dicts([structure], self.owner)
+        # then
+        self.assertFalse(mock_handle_fuel_notifications.called)
+
+    def test_should_update_services_when_changed(self):
+        # given
+        self.structure.services.all().delete()
+        unchanged = StructureService.objects.create(
+            structure=self.structure,
+            name="Clone Bay",
+            state=StructureService.State.ONLINE,
+        )
+        changed = StructureService.objects.create(
+            structure=self.structure,
+            name="Market Hub",
+            state=StructureService.State.OFFLINE,
+        )
+        StructureService.objects.create(
+            structure=self.structure,
+            name="Reprocessing",
+            state=StructureService.State.ONLINE,
+        )
+        structure = self._make_structure_dict(
+            services=[
+                {"name": "Clone Bay", "state": "online"},
+                {"name": "Market Hub", "state": "online"},
+                {"name": "Manufacturing", "state": "offline"},
+            ]
+        )
+        # when
+        Structure.objects.update_or_create_from_dicts([structure], self.owner)
+        # then
+        services = {
+            obj.name: (obj.pk, obj.state) for obj in self.structure.services.all()
+        }
+        self.assertSetEqual(
+            set(services.keys()), {"Clone Bay", "Market Hub", "Manufacturing"}
+        )
+        self.assertEqual(
+            services["Clone Bay"], (unchanged.pk, StructureService.State.ONLINE)
+        )
+        self.assertEqual(
+            services["Market Hub"], (changed.pk, StructureService.State.ONLINE)
+        )
+        self.assertEqual(services["Manufacturing"][1], StructureService.State.OFFLINE)
+
+    def test_should_keep_moon_of_upwell_structures(self):
+        # given
+        self.structure.eve_moon_id = 40161465
+        self.structure.save()
+        structure = self._make_structure_dict()
+        # when
+        Structure.objects.update_or_create_from_dicts([structure], self.owner)
+        # then
+        self.structure.refresh_from_db()
+        self.assertEqual(self.structure.eve_moon_id, 40161465)
+
+    @patch("structures.models.owners.Owner.invalidate_assets_etag")
+    def test_should_invalidate_assets_etag_when_structure_created(
+        self, mock_invalidate_assets_etag
+    ):
+        # given
+        structure = self._make_structure_dict(structure_id=1000000000099)
+        # when
+        Structure.objects.update_or_create_from_dicts([structure], self.owner)
+        # then
+        self.assertTrue(mock_invalidate_assets_etag.called)
+
+    @patch("structures.models.owners.Owner.invalidate_assets_etag")
+    def test_should_not_invalidate_assets_etag_when_structure_updated(
+        self, mock_invalidate_assets_etag
+    ):
+        # given
+        structure = self._make_structure_dict(name="Updated")
+        # when
+        Structure.objects.update_or_create_from_dicts([structure], self.owner)
+        # then
+        self.assertFalse(mock_invalidate_assets_etag.called)
+
+    @patch("structures.managers.invalidate_webhook_routes")
+    def test_should_invalidate_webhook_routes_when_routing_fields_changed(
+        self, mock_invalidate_webhook_routes
+    ):
+        # given
+        structure = self._make_structure_dict(moon_id=40161465)
+        # when
+        Structure.objects.update_or_create_from_dicts([structure], self.owner)
+        # then
+        mock_invalidate_webhook_routes.assert_called_once_with(owner_id=self.owner.pk)
+
+    @patch("structures.managers.invalidate_webhook_routes")
+    def test_should_not_invalidate_webhook_routes_when_other_fields_changed(
+        self, mock_invalidate_webhook_routes
+    ):
+        # given
+        structure = self._make_structure_dict(name="Updated")
+        # when
+        Structure.objects.update_or_create_from_dicts([structure], self.owner)
+        # then
+        self.assertFalse(mock_invalidate_webhook_routes.called)
+
+    def test_should_return_empty_list_when_no_structures(self):
+        # when
+        results = Structure.objects.update_or_create_from_dicts([], self.owner)
+        # then
+        self.assertListEqual(results, [])
+
+    def test_should_not_fetch_existing_eve_objects_from_esi(self):
+        # given
+        structures = [
+            self._make_structure_dict(structure_id=1000000000099 + num)
+            for num in range(3)
+        ]
+        # when
+        with patch.object(
+            EveType.objects, "get_or_create_esi"
+        ) as mock_type_get_or_create, patch.object(
+            EveSolarSystem.objects, "get_or_create_esi"
+        ) as mock_system_get_or_create:
+            Structure.objects.update_or_create_from_dicts(structures, self.owner)
+        # then
+        self.assertFalse(mock_type_get_or_create.called)
+        self.assertFalse(mock_system_get_or_create.called)
+
+    def test_should_fetch_missing_eve_objects_from_esi(self):
+        # given
+        eve_type = EveType.objects.get(id=35832)
+        # when
+        with patch.object(
+            EveType.objects, "get_or_create_esi", return_value=(eve_type, True)
+        ) as mock_get_or_create:
+            result = Structure.objects._bulk_get_or_create_esi(
+                EveType, {35832, None}, EveType.objects.none()
+            )
+        # then
+        self.assertEqual(result, {35832: eve_type})
+        self.assertEqual(mock_get_or_create.call_count, 1)
+
+    def test_should_skip_structures_with_eve_objects_failing_to_load(self):
+        # given
+        structures = [
+            self._make_structure_dict(structure_id=1000000000099, type_id=99999),
+            self._make_structure_dict(name="Updated"),
+        ]
+        # when
+        with patch.object(
+            EveType.objects, "get_or_create_esi", side_effect=OSError
+        ) as mock_get_or_create:
+            results = Structure.objects.update_or_create_from_dicts(
+                structures, self.owner
+            )
+        # then
+        self.assertEqual(mock_get_or_create.call_count, 1)
+        self.assertEqual(
+            [(obj.id, created) for obj, created in results], [(1000000000001, False)]
+        )
+        self.assertFalse(Structure.objects.filter(id=1000000000099).exists())
+        self.assertEqual(Structure.objects.get(id=1000000000001).name, "Updated")
+
+    def test_should_raise_error_when_eve_objects_of_single_structure_fail(self):
+        # given
+        structure = self._make_structure_dict(type_id=99999)
+        # when/then
+        with patch.object(EveType.objects, "get_or_create_esi", side_effect=OSError):
+            with self.assertRaises(OSError):
+                Structure.objects.update_or_create_from_dict(structure, self.owner)
+
+
 class TestStructureTagManager(NoSocketsTestCase):
     @classmethod
     def setUpClass(cls):
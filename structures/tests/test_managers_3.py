@@ -1,5 +1,8 @@
+import datetime as dt
 from unittest.mock import patch
 
+from django.utils.timezone import now
+
 from app_utils.testing import NoSocketsTestCase
 
 from structures.core.notification_types import NotificationType
@@ -9,6 +12,9 @@ from .testdata.factories_2 import (
     GeneratedNotificationFactory,
     NotificationFactory,
     OwnerFactory,
+    PocoFactory,
+    StarbaseFactory,
+    StructureFactory,
 )
 from .testdata.load_eveuniverse import load_eveuniverse
 
@@ -50,3 +56,119 @@ class TestNotificationBaseAddOrRemoveTimers(NoSocketsTestCase):
         GeneratedNotification.objects.add_or_remove_timers()
         # then
         self.assertEqual(mock_add_or_remove_timer_from_notification.call_count, 1)
+
+
+class TestNotificationUpdateRelatedStructures(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        load_eveuniverse()
+
+    def test_should_add_related_structures(self):
+        # given
+        owner = OwnerFactory()
+        structure = StructureFactory(owner=owner)
+        poco = PocoFactory(owner=owner)
+        starbase = StarbaseFactory(owner=owner)
+        notif_1 = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            text_from_dict={"structureID": structure.id},
+        )
+        notif_2 = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.ORBITAL_ATTACKED,
+            text_from_dict={
+                "planetID": poco.eve_planet_id,
+                "typeID": poco.eve_type_id,
+            },
+        )
+        notif_3 = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.TOWER_ALERT_MSG,
+            text_from_dict={
+                "moonID": starbase.eve_moon_id,
+                "typeID": starbase.eve_type_id,
+            },
+        )
+        notif_4 = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_REINFORCEMENT_CHANGED,
+            text_from_dict={"allStructureInfo": [[structure.id, "Alpha", 35832]]},
+        )
+        # when
+        result = owner.notification_set.update_related_structures()
+        # then
+        self.assertEqual(result, (4, 4))
+        self.assertQuerysetEqual(notif_1.structures.all(), [structure])
+        self.assertQuerysetEqual(notif_2.structures.all(), [poco])
+        self.assertQuerysetEqual(notif_3.structures.all(), [starbase])
+        self.assertQuerysetEqual(notif_4.structures.all(), [structure])
+
+    def test_should_mark_unmatched_notifications_as_checked(self):
+        # given
+        owner = OwnerFactory()
+        notif = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            text_from_dict={"structureID": 1_999_999_999_999},
+        )
+        # when
+        result = owner.notification_set.update_related_structures()
+        # then
+        self.assertEqual(result, (0, 1))
+        notif.refresh_from_db()
+        self.assertIsNotNone(notif.structures_checked_at)
+        self.assertFalse(notif.structures.exists())
+
+    def test_should_not_check_marked_notifications_again(self):
+        # given
+        owner = OwnerFactory()
+        structure = StructureFactory(owner=owner)
+        checked_at = now()
+        NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            text_from_dict={"structureID": structure.id},
+            structures_checked_at=checked_at,
+        )
+        # when
+        result = owner.notification_set.update_related_structures(
+            recheck_before=checked_at - dt.timedelta(minutes=1)
+        )
+        # then
+        self.assertEqual(result, (0, 0))
+
+    def test_should_check_marked_notifications_again_when_requested(self):
+        # given
+        owner = OwnerFactory()
+        structure = StructureFactory(owner=owner)
+        checked_at = now()
+        notif = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            text_from_dict={"structureID": structure.id},
+            structures_checked_at=checked_at,
+        )
+        # when
+        result = owner.notification_set.update_related_structures(
+            recheck_before=checked_at + dt.timedelta(minutes=1)
+        )
+        # then
+        self.assertEqual(result, (1, 1))
+        self.assertQuerysetEqual(notif.structures.all(), [structure])
+
+    def test_should_ignore_notifications_with_structures(self):
+        # given
+        owner = OwnerFactory()
+        structure = StructureFactory(owner=owner)
+        notif = NotificationFactory(
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            text_from_dict={"structureID": structure.id},
+        )
+        notif.structures.add(structure)
+        # when
+        result = owner.notification_set.update_related_structures()
+        # then
+        self.assertEqual(result, (0, 0))
@@ -1,9 +1,12 @@
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase, override_settings
+from django.utils.timezone import now
 
 from allianceauth.eveonline.models import EveCorporationInfo
+from app_utils.esi import EsiStatus
 from app_utils.testdata_factories import UserFactory
 from app_utils.testing import (
     NoSocketsTestCase,
@@ -15,7 +18,11 @@ from structures import tasks
 from structures.core.notification_types import NotificationType
 from structures.models import FuelAlertConfig, Owner, Webhook
 
-from .testdata.factories import create_notification, create_owner_from_user
+from .testdata.factories import (
+    create_notification,
+    create_owner_from_user,
+    create_upwell_structure,
+)
 from .testdata.factories_2 import (
     FuelAlertConfigFactory,
     JumpFuelAlertConfigFactory,
@@ -56,6 +63,54 @@ class TestSendMessagesForWebhook(TestCase):
         tasks.send_messages_for_webhook(self.webhook.pk)
         self.assertEqual(mock_send_queued_messages.call_count, 0)
 
+    def test_should_have_one_lock_per_webhook(self, mock_send_queued_messages):
+        self.assertListEqual(
+            tasks.send_messages_for_webhook.once["keys"], ["webhook_pk"]
+        )
+
+
+@patch(MODULE_PATH + ".send_messages_for_webhook", spec=True)
+class TestSendQueuedMessagesForWebhooks(TestCase):
+    def setUp(self) -> None:
+        self.webhook = Webhook.objects.create(
+            name="Dummy", url="https://www.example.com/webhook"
+        )
+        self.webhook.clear_queue()
+
+    def tearDown(self) -> None:
+        self.webhook.clear_queue()
+
+    def test_should_start_task_with_highest_priority_for_high_priority_messages(
+        self, mock_send_messages
+    ):
+        # given
+        self.webhook.send_message("dummy")
+        self.webhook.send_message("dummy", high_priority=True)
+        # when
+        tasks.send_queued_messages_for_webhooks([self.webhook])
+        # then
+        self.assertEqual(mock_send_messages.apply_async.call_count, 1)
+        _, kwargs = mock_send_messages.apply_async.call_args
+        self.assertEqual(kwargs["priority"], tasks.TASK_PRIORITY_HIGHEST)
+
+    def test_should_start_task_with_high_priority_for_other_messages(
+        self, mock_send_messages
+    ):
+        # given
+        self.webhook.send_message("dummy")
+        # when
+        tasks.send_queued_messages_for_webhooks([self.webhook])
+        # then
+        self.assertEqual(mock_send_messages.apply_async.call_count, 1)
+        _, kwargs = mock_send_messages.apply_async.call_args
+        self.assertEqual(kwargs["priority"], tasks.TASK_PRIORITY_HIGH)
+
+    def test_should_start_no_task_when_queue_is_empty(self, mock_send_messages):
+        # when
+        tasks.send_queued_messages_for_webhooks([self.webhook])
+        # then
+        self.assertFalse(mock_send_messages.apply_async.called)
+
 
 @override_settings(CELERY_ALWAYS_EAGER=True, CELERY_EAGER_PROPAGATES_EXCEPTIONS=True)
 class TestUpdateStructures(NoSocketsTestCase):
@@ -214,6 +269,73 @@ class TestFetchAllNotifications(NoSocketsTestCase):
         self.assertEqual(args[0], config.pk)
 
 
+@patch(MODULE_PATH + ".fetch_esi_status", lambda: EsiStatus(True, 100, 60))
+@patch(MODULE_PATH + ".send_queued_messages_for_webhooks", spec=True)
+@patch(MODULE_PATH + "._process_notifications_for_owner_chained", spec=True)
+@patch(MODULE_PATH + ".Owner.process_notifications", spec=True)
+class TestProcessNotificationsForOwner2(NoSocketsTestCase):
+    def setUp(self) -> None:
+        self.owner = OwnerFactory()
+        cache.clear()
+
+    @patch(MODULE_PATH + ".STRUCTURES_NOTIFICATION_PIPELINE_ENABLED", False)
+    def test_should_process_with_chain_by_default(
+        self, mock_process_notifications, mock_chained, mock_send_queued_messages
+    ):
+        # when
+        tasks.process_notifications_for_owner(self.owner.pk)
+        # then
+        self.assertTrue(mock_chained.called)
+        self.assertFalse(mock_process_notifications.called)
+
+    @patch(MODULE_PATH + ".STRUCTURES_NOTIFICATION_PIPELINE_ENABLED", True)
+    def test_should_process_in_one_task_when_enabled(
+        self, mock_process_notifications, mock_chained, mock_send_queued_messages
+    ):
+        # given
+        mock_process_notifications.return_value = True
+        # when
+        tasks.process_notifications_for_owner(self.owner.pk)
+        # then
+        self.assertTrue(mock_process_notifications.called)
+        self.assertTrue(mock_send_queued_messages.called)
+        self.assertFalse(mock_chained.called)
+
+    @patch(MODULE_PATH + ".STRUCTURES_NOTIFICATION_PIPELINE_ENABLED", True)
+    @patch(MODULE_PATH + ".send_new_notifications_for_owner", spec=True)
+    def test_should_retry_forwarding_only_when_forwarding_failed(
+        self,
+        mock_send_new_notifications_for_owner,
+        mock_process_notifications,
+        mock_chained,
+        mock_send_queued_messages,
+    ):
+        # given
+        mock_process_notifications.return_value = False
+        # when
+        tasks.process_notifications_for_owner(self.owner.pk)
+        # then
+        self.assertTrue(mock_process_notifications.called)
+        self.assertTrue(mock_send_new_notifications_for_owner.apply_async.called)
+        self.assertFalse(mock_chained.called)
+
+    @patch(MODULE_PATH + ".STRUCTURES_NOTIFICATION_PIPELINE_ENABLED", True)
+    def test_should_process_all_pending_notifications_once_in_a_while(
+        self, mock_process_notifications, mock_chained, mock_send_queued_messages
+    ):
+        # given
+        mock_process_notifications.return_value = True
+        # when
+        tasks.process_notifications_for_owner(self.owner.pk)
+        tasks.process_notifications_for_owner(self.owner.pk)
+        # then
+        process_all_pending = [
+            kwargs["process_all_pending"]
+            for _, kwargs in mock_process_notifications.call_args_list
+        ]
+        self.assertListEqual(process_all_pending, [True, False])
+
+
 # TODO: Fix tests. Does not work with tox.
 # @override_settings(CELERY_ALWAYS_EAGER=True, CELERY_EAGER_PROPAGATES_EXCEPTIONS=True)
 # @patch(MODULE_PATH + ".fetch_esi_status", lambda: EsiStatus(True, 100, 60))
@@ -306,7 +428,6 @@ class TestSendTestNotification(NoSocketsTestCase):
         self.assertEqual(args["level"], "danger")
 
 
-@patch("structures.models.notifications.Notification.update_related_structures")
 class TestUpdateExistingNotifications(NoSocketsTestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -319,12 +440,14 @@ class TestUpdateExistingNotifications(NoSocketsTestCase):
             scopes=Owner.get_esi_scopes(),
         )
 
-    def test_should_run_updates(self, mock_update_related_structures):
+    def test_should_run_updates(self):
         # given
-        mock_update_related_structures.return_value = True
         owner = create_owner_from_user(self.user)
+        structure = create_upwell_structure(owner=owner)
         create_notification(
-            owner=owner, notif_type=NotificationType.STRUCTURE_UNDER_ATTACK
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            data={"structureID": structure.id},
         )
         create_notification(owner=owner, notif_type=NotificationType.CORP_APP_NEW_MSG)
         # when
@@ -332,9 +455,8 @@ class TestUpdateExistingNotifications(NoSocketsTestCase):
         # then
         self.assertEqual(result, 1)
 
-    def test_should_run_no_updates(self, mock_update_related_structures):
+    def test_should_run_no_updates(self):
         # given
-        mock_update_related_structures.return_value = True
         owner = create_owner_from_user(self.user)
         create_notification(owner=owner, notif_type=NotificationType.CORP_APP_NEW_MSG)
         # when
@@ -342,6 +464,24 @@ class TestUpdateExistingNotifications(NoSocketsTestCase):
         # then
         self.assertEqual(result, 0)
 
+    def test_should_recheck_unmatched_notifications_after_structures_sync(self):
+        # given
+        owner = create_owner_from_user(self.user)
+        notif = create_notification(
+            owner=owner,
+            notif_type=NotificationType.STRUCTURE_UNDER_ATTACK,
+            data={"structureID": 1000000000001},
+        )
+        tasks.update_existing_notifications(owner.pk)
+        structure = create_upwell_structure(owner=owner, id=1000000000001)
+        owner.structures_last_update_at = now()
+        owner.save()
+        # when
+        result = tasks.update_existing_notifications(owner.pk)
+        # then
+        self.assertEqual(result, 1)
+        self.assertQuerysetEqual(notif.structures.all(), [structure])
+
 
 class TestOtherTasks(NoSocketsTestCase):
     @patch(
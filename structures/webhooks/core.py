@@ -1,8 +1,8 @@
 """Core logic for webhooks."""
 
 import json
-from time import sleep
-from typing import List, Optional, Tuple
+from time import sleep, time
+from typing import List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import dhooks_lite
@@ -16,6 +16,7 @@ from app_utils.json import JSONDateTimeDecoder, JSONDateTimeEncoder
 from app_utils.logging import LoggerAddTag
 
 from structures import __title__
+from structures.app_settings import STRUCTURES_NOTIFICATION_MAX_RETRIES
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
@@ -28,17 +29,28 @@ class DiscordWebhookMixin:
     - url: url of the webhook (string)
     """
 
-    # delay in seconds between every message sent to Discord
-    # this needs to be >= 1 to prevent 429 Too Many Request errors
-    SEND_DELAY = 2
+    # max time in seconds to wait for a rate limit before sending is stopped
+    # remaining messages are then sent with the next run
+    MAX_RATE_LIMIT_WAIT = 60
+
+    # time in seconds to wait after a rate limit when Discord did not tell
+    DEFAULT_RETRY_AFTER = 2
+
+    _GLOBAL_RATE_LIMIT_KEY = f"{__title__}_webhooks_global_resume_at"
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         redis_client = get_redis_client()
+        self._redis = redis_client
+        self._rate_limit_key = f"{__title__}_webhook_{self.pk}_resume_at"
+        self._high_queue = SimpleMQ(redis_client, f"{__title__}_webhook_{self.pk}_high")
         self._main_queue = SimpleMQ(redis_client, f"{__title__}_webhook_{self.pk}_main")
         self._error_queue = SimpleMQ(
             redis_client, f"{__title__}_webhook_{self.pk}_errors"
         )
+        self._high_error_queue = SimpleMQ(
+            redis_client, f"{__title__}_webhook_{self.pk}_high_errors"
+        )
 
     def __str__(self) -> str:
         return self.name
@@ -46,18 +58,21 @@ class DiscordWebhookMixin:
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(pk={self.pk}, name='{self.name}')"
 
-    def queue_size(self) -> int:
+    def queue_size(self, high_priority_only: bool = False) -> int:
         """returns current size of the queue"""
-        return self._main_queue.size()
+        if high_priority_only:
+            return self._high_queue.size()
+        return self._high_queue.size() + self._main_queue.size()
 
     def clear_queue(self) -> int:
         """deletes all messages from the queue. Returns number of cleared messages."""
         counter = 0
-        while True:
-            message = self._main_queue.dequeue()
-            if message is None:
-                break
-            counter += 1
+        for queue in [self._high_queue, self._main_queue]:
+            while True:
+                message = queue.dequeue()
+                if message is None:
+                    break
+                counter += 1
 
         return counter
 
@@ -65,13 +80,17 @@ class DiscordWebhookMixin:
     def send_message(
         self,
         content: Optional[str] = None,
-        embeds: Optional[List[dhooks_lite.Embed]] = None,
+        embeds: Optional[List[Union[dhooks_lite.Embed, dict]]] = None,
         tts: Optional[bool] = None,
         username: Optional[str] = None,
         avatar_url: Optional[str] = None,
+        high_priority: bool = False,
     ) -> int:
         """Adds Discord message to queue for later sending
 
+        High priority messages are sent before all other messages.
+        Embeds can also be given already serialized as dicts.
+
         Returns updated size of queue
         Raises ValueError if message is incomplete
         """
@@ -79,7 +98,9 @@ class DiscordWebhookMixin:
             raise ValueError("Message must have content or embeds to be valid")
 
         if embeds:
-            embeds_list = [obj.asdict() for obj in embeds]
+            embeds_list = [
+                obj if isinstance(obj, dict) else obj.asdict() for obj in embeds
+            ]
         else:
             embeds_list = None
 
@@ -95,7 +116,8 @@ class DiscordWebhookMixin:
         if avatar_url and self._url_has_scheme(avatar_url):
             message["avatar_url"] = avatar_url
 
-        return self._main_queue.enqueue(json.dumps(message, cls=JSONDateTimeEncoder))
+        queue = self._high_queue if high_priority else self._main_queue
+        return queue.enqueue(json.dumps(message, cls=JSONDateTimeEncoder))
 
     @staticmethod
     def _url_has_scheme(avatar_url) -> bool:
@@ -109,38 +131,73 @@ class DiscordWebhookMixin:
     def send_queued_messages(self) -> int:
         """sends all messages in the queue to this webhook
 
+        High priority messages are always sent first,
+        also when they are queued while other messages are being sent.
+        Messages are sent as fast as the rate limits reported by Discord allow.
+
         returns number of successfully sent messages
 
         Messages that could not be sent are put back into the queue for later retry
         """
-        message_count = 0
-        while True:
-            message_json = self._main_queue.dequeue()
-            if message_json:
-                message = json.loads(message_json, cls=JSONDateTimeDecoder)
-                logger.debug("Sending message to webhook %s", self)
-                if self._send_message_to_webhook(message):
-                    message_count += 1
-                else:
-                    self._error_queue.enqueue(message_json)
+        lanes = [
+            (self._high_queue, self._high_error_queue),
+            (self._main_queue, self._error_queue),
+        ]
 
-                sleep(self.SEND_DELAY)
-
-            else:
+        started_at = time()
+        message_count = 0
+        while self._wait_for_rate_limit():
+            message_json, error_queue = self._dequeue_next_message(lanes)
+            if not message_json:
                 break
 
-        while True:
-            message_json = self._error_queue.dequeue()
-            if message_json:
-                self._main_queue.enqueue(message_json)
+            message = json.loads(message_json, cls=JSONDateTimeDecoder)
+            logger.debug("Sending message to webhook %s", self)
+            if self._send_message_to_webhook(message):
+                message_count += 1
             else:
-                break
+                error_queue.enqueue(message_json)
+
+        if message_count:
+            duration = time() - started_at
+            logger.info(
+                "Webhook %s: Sent %d messages in %.1f seconds (%.1f per minute)",
+                self,
+                message_count,
+                duration,
+                message_count / duration * 60 if duration else message_count * 60,
+            )
+
+        for queue, error_queue in lanes:
+            while True:
+                message_json = error_queue.dequeue()
+                if message_json:
+                    queue.enqueue(message_json)
+                else:
+                    break
 
         return message_count
 
+    @staticmethod
+    def _dequeue_next_message(
+        lanes: List[Tuple[SimpleMQ, SimpleMQ]]
+    ) -> Tuple[Optional[str], Optional[SimpleMQ]]:
+        """Dequeue next message from the first lane which has one.
+
+        Returns the message and the error queue of its lane.
+        """
+        for queue, error_queue in lanes:
+            message_json = queue.dequeue()
+            if message_json:
+                return message_json, error_queue
+        return None, None
+
     def _send_message_to_webhook(self, message: dict) -> bool:
         """sends message directly to webhook
 
+        Messages rejected because of a rate limit are sent again
+        after the delay advised by Discord.
+
         returns True if successful, else False
         """
         hook = dhooks_lite.Webhook(url=self.url)
@@ -152,18 +209,37 @@ class DiscordWebhookMixin:
         else:
             embeds = None
 
-        response = hook.execute(
-            content=message.get("content"),
-            embeds=embeds,
-            username=message.get("username"),
-            avatar_url=message.get("avatar_url"),
-            wait_for_response=True,
-        )
-        logger.debug("headers: %s", response.headers)
-        logger.debug("status_code: %s", response.status_code)
-        logger.debug("content: %s", response.content)
-        if response.status_ok:
-            return True
+        retry_count = 0
+        while True:
+            response = hook.execute(
+                content=message.get("content"),
+                embeds=embeds,
+                username=message.get("username"),
+                avatar_url=message.get("avatar_url"),
+                wait_for_response=True,
+            )
+            logger.debug("headers: %s", response.headers)
+            logger.debug("status_code: %s", response.status_code)
+            logger.debug("content: %s", response.content)
+            self._update_rate_limit(response)
+            if response.status_ok:
+                return True
+
+            if (
+                response.status_code != 429
+                or retry_count >= STRUCTURES_NOTIFICATION_MAX_RETRIES
+            ):
+                break
+
+            retry_count += 1
+            logger.info(
+                "Webhook %s: Rate limited by Discord. Retry %d / %d",
+                self,
+                retry_count,
+                STRUCTURES_NOTIFICATION_MAX_RETRIES,
+            )
+            if not self._wait_for_rate_limit():
+                break
 
         msg = (
             f"Webhook {self} failed to send message to Discord. "
@@ -173,6 +249,67 @@ class DiscordWebhookMixin:
         logger.warning(msg)
         return False
 
+    def _update_rate_limit(self, response: dhooks_lite.WebhookResponse) -> None:
+        """Remember until when sending must pause according to Discord."""
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        content = response.content or {}
+        if response.status_code == 429:
+            retry_after = _to_float(headers.get("retry-after"))
+            if retry_after is None:
+                retry_after = _to_float(content.get("retry_after"))
+            if retry_after is None:
+                retry_after = self.DEFAULT_RETRY_AFTER
+            is_global = (
+                headers.get("x-ratelimit-global", "").lower() == "true"
+                or content.get("global") is True
+            )
+            key = self._GLOBAL_RATE_LIMIT_KEY if is_global else self._rate_limit_key
+            self._set_resume_at(key, retry_after)
+            return
+
+        remaining = _to_float(headers.get("x-ratelimit-remaining"))
+        reset_after = _to_float(headers.get("x-ratelimit-reset-after"))
+        if remaining is not None and remaining < 1 and reset_after:
+            self._set_resume_at(self._rate_limit_key, reset_after)
+
+    def _set_resume_at(self, key: str, delay: float) -> None:
+        if delay <= 0:
+            return
+        self._redis.set(key, time() + delay, px=int(delay * 1000) + 1)
+
+    def _wait_for_rate_limit(self) -> bool:
+        """Wait until sending is allowed again by the rate limits of Discord.
+
+        Rate limits are shared between all processes sending to this webhook.
+
+        Returns False when the wait would be too long, else True.
+        """
+        resume_ats = [
+            float(value)
+            for value in self._redis.mget(
+                [self._rate_limit_key, self._GLOBAL_RATE_LIMIT_KEY]
+            )
+            if value is not None
+        ]
+        if not resume_ats:
+            return True
+
+        delay = max(resume_ats) - time()
+        if delay > self.MAX_RATE_LIMIT_WAIT:
+            logger.warning(
+                "Webhook %s: Rate limited by Discord for %.1f seconds. "
+                "Remaining messages will be sent later",
+                self,
+                delay,
+            )
+            return False
+
+        if delay > 0:
+            logger.debug("Webhook %s: Waiting %.1f seconds for rate limit", self, delay)
+            sleep(delay)
+
+        return True
+
     @classmethod
     def create_link(cls, name: str, url: str) -> str:
         """creates a link for messages of this webhook"""
@@ -203,3 +340,11 @@ class DiscordWebhookMixin:
     def default_username() -> str:
         """sets the apps title as username for all messages"""
         return __title__
+
+
+def _to_float(value) -> Optional[float]:
+    """Convert a header value to float. Return None if not possible."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -50,6 +50,11 @@ class TestDiscordWebhookMixin(TestCase):
         self.webhook.send_message("dummy")
         self.assertEqual(self.webhook.queue_size(), 3)
 
+        # 4 after high priority message added
+        self.webhook.send_message("dummy", high_priority=True)
+        self.assertEqual(self.webhook.queue_size(), 4)
+        self.assertEqual(self.webhook.queue_size(high_priority_only=True), 1)
+
         # 0 after clearing queue
         self.webhook.clear_queue()
         self.assertEqual(self.webhook.queue_size(), 0)
@@ -130,11 +135,194 @@ class TestDiscordWebhookMixin(TestCase):
         self.assertEqual(self.webhook.queue_size(), 2)
         self.assertEqual(self.webhook._error_queue.size(), 0)
 
+    @patch(MODULE_PATH + ".dhooks_lite.Webhook.execute")
+    def test_should_send_high_priority_messages_first(self, mock_execute):
+        # given
+        mock_execute.return_value = dhooks_lite.WebhookResponse(
+            {}, status_code=200, content={"dummy": True}
+        )
+        self.webhook.send_message("normal 1")
+        self.webhook.send_message("high", high_priority=True)
+        self.webhook.send_message("normal 2")
+        # when
+        result = self.webhook.send_queued_messages()
+        # then
+        self.assertEqual(result, 3)
+        contents = [obj.kwargs["content"] for obj in mock_execute.call_args_list]
+        self.assertListEqual(contents, ["high", "normal 1", "normal 2"])
+
+    @patch(MODULE_PATH + ".dhooks_lite.Webhook.execute")
+    def test_should_send_high_priority_messages_queued_while_sending(
+        self, mock_execute
+    ):
+        # given
+        def my_execute(content, **kwargs):
+            if content == "normal 1":
+                self.webhook.send_message("high", high_priority=True)
+            return dhooks_lite.WebhookResponse(
+                {}, status_code=200, content={"dummy": True}
+            )
+
+        mock_execute.side_effect = my_execute
+        self.webhook.send_message("normal 1")
+        self.webhook.send_message("normal 2")
+        # when
+        self.webhook.send_queued_messages()
+        # then
+        contents = [obj.kwargs["content"] for obj in mock_execute.call_args_list]
+        self.assertListEqual(contents, ["normal 1", "high", "normal 2"])
+
+    @patch(MODULE_PATH + ".dhooks_lite.Webhook.execute")
+    def test_should_requeue_failed_high_priority_messages_as_high_priority(
+        self, mock_execute
+    ):
+        # given
+        mock_execute.return_value = dhooks_lite.WebhookResponse(
+            {}, status_code=404, content={"dummy": True}
+        )
+        self.webhook.send_message("normal")
+        self.webhook.send_message("high", high_priority=True)
+        # when
+        result = self.webhook.send_queued_messages()
+        # then
+        self.assertEqual(result, 0)
+        self.assertEqual(self.webhook.queue_size(), 2)
+        self.assertEqual(self.webhook.queue_size(high_priority_only=True), 1)
+
     def test_can_create_discord_link(self):
         result = self.webhook.create_link("test-name", "test-url")
         self.assertEqual(result, "[test-name](test-url)")
 
 
+def _response(status_code=200, headers=None, content=None):
+    return dhooks_lite.WebhookResponse(
+        headers or {}, status_code=status_code, content=content or {"dummy": True}
+    )
+
+
+@patch(MODULE_PATH + ".sleep")
+@patch(MODULE_PATH + ".dhooks_lite.Webhook.execute")
+class TestDiscordWebhookMixinRateLimits(TestCase):
+    def setUp(self) -> None:
+        self.webhook = Webhook("Dummy 1", "dummy-1-url")
+        self.webhook.clear_queue()
+        self._clear_rate_limits()
+
+    def tearDown(self) -> None:
+        self.webhook.clear_queue()
+        self._clear_rate_limits()
+
+    def _clear_rate_limits(self):
+        self.webhook._redis.delete(
+            self.webhook._rate_limit_key, self.webhook._GLOBAL_RATE_LIMIT_KEY
+        )
+
+    def test_should_not_wait_when_rate_limit_not_exhausted(
+        self, mock_execute, mock_sleep
+    ):
+        # given
+        mock_execute.return_value = _response(
+            headers={"X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "1.5"}
+        )
+        self.webhook.send_message("dummy")
+        self.webhook.send_message("dummy")
+        # when
+        result = self.webhook.send_queued_messages()
+        # then
+        self.assertEqual(result, 2)
+        self.assertFalse(mock_sleep.called)
+
+    def test_should_wait_when_rate_limit_exhausted(self, mock_execute, mock_sleep):
+        # given
+        mock_execute.return_value = _response(
+            headers={"x-ratelimit-remaining": "0", "x-ratelimit-reset-after": "1.5"}
+        )
+        self.webhook.send_message("dummy")
+        self.webhook.send_message("dummy")
+        # when
+        result = self.webhook.send_queued_messages()
+        # then
+        self.assertEqual(result, 2)
+        self.assertTrue(mock_sleep.called)
+        delay = mock_sleep.call_args[0][0]
+        self.assertGreater(delay, 1)
+        self.assertLessEqual(delay, 1.5)
+
+    def test_should_retry_after_rate_limit_error(self, mock_execute, mock_sleep):
+        # given
+        mock_execute.side_effect = [
+            _response(
+                status_code=429, headers={"Retry-After": "3"}, content={"global": False}
+            ),
+            _response(),
+        ]
+        self.webhook.send_message("dummy")
+        # when
+        result = self.webhook.send_queued_messages()
+        # then
+        self.assertEqual(result, 1)
+        self.assertEqual(mock_execute.call_count, 2)
+        self.assertEqual(self.webhook.queue_size(), 0)
+        delay = mock_sleep.call_args[0][0]
+        self.assertGreater(delay, 2)
+        self.assertLessEqual(delay, 3)
+
+    def test_should_requeue_message_when_retries_exhausted(
+        self, mock_execute, mock_sleep
+    ):
+        # given
+        mock_execute.return_value = _response(
+            status_code=429, headers={"Retry-After": "0.1"}
+        )
+        self.webhook.send_message("dummy")
+        # when
+        with patch(MODULE_PATH + ".STRUCTURES_NOTIFICATION_MAX_RETRIES", 2):
+            result = self.webhook.send_queued_messages()
+        # then
+        self.assertEqual(result, 0)
+        self.assertEqual(mock_execute.call_count, 3)
+        self.assertEqual(self.webhook.queue_size(), 1)
+
+    def test_should_share_global_rate_limit_with_other_webhooks(
+        self, mock_execute, mock_sleep
+    ):
+        # given
+        mock_execute.side_effect = [
+            _response(
+                status_code=429,
+                headers={"Retry-After": "5", "X-RateLimit-Global": "true"},
+            ),
+            _response(),
+        ]
+        self.webhook.send_message("dummy")
+        self.webhook.send_queued_messages()
+        other_webhook = Webhook("Dummy 2", "dummy-2-url")
+        mock_sleep.reset_mock()
+        # when
+        other_webhook._wait_for_rate_limit()
+        # then
+        delay = mock_sleep.call_args[0][0]
+        self.assertGreater(delay, 4)
+        self.assertLessEqual(delay, 5)
+
+    def test_should_stop_sending_when_rate_limit_is_too_long(
+        self, mock_execute, mock_sleep
+    ):
+        # given
+        mock_execute.return_value = _response(
+            status_code=429, headers={"Retry-After": "3600"}
+        )
+        self.webhook.send_message("dummy")
+        self.webhook.send_message("dummy")
+        # when
+        result = self.webhook.send_queued_messages()
+        # then
+        self.assertEqual(result, 0)
+        self.assertEqual(mock_execute.call_count, 1)
+        self.assertFalse(mock_sleep.called)
+        self.assertEqual(self.webhook.queue_size(), 2)
+
+
 @patch(MODULE_PATH + ".dhooks_lite.Webhook.execute")
 class TestSendTestMessage(TestCase):
     def setUp(self) -> None: